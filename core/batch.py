@@ -0,0 +1,580 @@
+# core/batch.py
+
+"""
+Headless batch runner: streams case files through the vectorized cooling methods.
+
+Cases are read from CSV or JSON Lines in bounded chunks, computed with compute.compute_batch
+and written out as CSV or JSON Lines chunk by chunk, so memory stays constant whatever the
+number of cases.
+
+Input columns (all optional, empty when absent):
+    id, tympanic_temperature, rectal_temperature, ambient_temperature, body_mass,
+    body_condition, environment, supporting_base, user_corrective_factor
+
+Numbers accept comma decimals ("36,5"), and enumerations accept member names ("NAKED")
+or labels ("Naked"), case-insensitively.
+
+With --workers, chunks are processed in parallel by a pool of processes. Each chunk travels
+to its worker as one block of input text and comes back as one block of output text, so that
+parsing and formatting scale with the computation and no per-case object is pickled.
+The output keeps the input order.
+
+Usage:
+    python -m core.batch cases.csv results.jsonl
+    python -m core.batch cases.csv results.csv --workers 32 --progress
+    python -m core.batch - - --input-format jsonl --output-format csv < cases.jsonl > results.csv
+"""
+
+import argparse
+import collections
+import csv
+import functools
+import io
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+import numpy as np
+
+from core import compute
+from core.constants import BodyCondition, EnvironmentType, SupportingBase, ErrorCode
+from core.output_batch import ResultBatch
+from core.tools import convert_decimal_separator
+
+# Constants
+NUMERIC_COLUMNS = ("tympanic_temperature", "rectal_temperature", "ambient_temperature", "body_mass", "user_corrective_factor")
+"""Numeric input columns"""
+
+ENUM_COLUMNS = {
+    "body_condition": BodyCondition,
+    "environment": EnvironmentType,
+    "supporting_base": SupportingBase,
+}
+"""Enumerated input columns and their enumeration"""
+
+ID_COLUMN = "id"
+"""Case identifier, copied as is to the output"""
+
+OUTPUT_COLUMNS = (
+    ID_COLUMN,
+    "input_error",
+    "henssge_rectal_pmi",
+    "henssge_rectal_ci",
+    "henssge_rectal_thermal_quotient",
+    "henssge_rectal_corrective_factor",
+    "henssge_rectal_error",
+    "henssge_brain_pmi",
+    "henssge_brain_ci",
+    "henssge_brain_error",
+    "baccino_interval_pmi",
+    "baccino_interval_ci",
+    "baccino_global_pmi",
+    "baccino_global_ci",
+    "baccino_error",
+)
+"""Output columns (PMI and confidence intervals in hours)"""
+
+DEFAULT_CHUNK_SIZE = 10000
+"""Number of cases read, computed and written at once"""
+
+FORMATS = ("csv", "jsonl")
+"""Supported file formats"""
+
+
+class CaseChunk:
+
+    # Constructor
+    def __init__(self, ids: list, columns: dict, input_errors: list):
+        """
+        Chunk of parsed cases, stored by column
+
+        Parameters
+        ----------
+        ids : list
+            Case identifiers (None when absent)
+        columns : dict
+            Arrays of the numeric (float, NaN if absent) and enumerated (int codes, 0 if absent) columns
+        input_errors : list
+            Parsing error message of each case (None when the case was read without error)
+        """
+        self.ids = ids
+        self.columns = columns
+        self.input_errors = input_errors
+
+    def __len__(self):
+        return len(self.ids)
+
+
+# --- Reading
+
+def _csv_lines(stream) -> Iterator[str]:
+    # Text of each CSV record, a quoted cell possibly spanning several lines
+    record = ""
+    for line in stream:
+        record += line
+        if record.count('"') % 2 == 0:
+            yield record
+            record = ""
+    if record:
+        yield record
+
+
+def read_blocks(stream, input_format: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    Reads a CSV or JSON Lines stream as blocks of text of chunk_size records
+
+    Parameters
+    ----------
+    stream : text stream
+    input_format : str
+        'csv' or 'jsonl'
+    chunk_size : int
+
+    Returns
+    -------
+    Iterator of tuples
+        - Text of the records
+        - Column names (CSV header, None for JSON Lines)
+    """
+    if input_format == "csv":
+        lines = _csv_lines(stream)
+        header = next(lines, None)
+        fieldnames = next(csv.reader([header])) if header else None
+    elif input_format == "jsonl":
+        lines = (line for line in stream if line.strip())
+        fieldnames = None
+    else:
+        raise ValueError(f"Unknown format: {input_format}")
+
+    block = []
+    for line in lines:
+        block.append(line)
+        if len(block) == chunk_size:
+            yield "".join(block), fieldnames
+            block = []
+    if block:
+        yield "".join(block), fieldnames
+
+
+def read_records(block: str, fieldnames: Optional[list], input_format: str) -> list:
+    """
+    Reads the records (dict per case) of a block of text
+
+    Parameters
+    ----------
+    block : str
+        Text of the records, see read_blocks
+    fieldnames : list
+        Column names of CSV records
+    input_format : str
+        'csv' or 'jsonl'
+
+    Returns
+    -------
+    list
+        dict per case, or the decoding error of an invalid JSON line (see parse_records)
+    """
+    if input_format == "csv":
+        return list(csv.DictReader(io.StringIO(block, newline=""), fieldnames=fieldnames))
+    return [_decode_json(line) for line in block.splitlines() if line.strip()]
+
+
+def _decode_json(line: str):
+    # Decoded line, or its decoding error so that a single invalid line does not stop the run
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        return e
+
+
+def parse_number(value) -> float:
+    """
+    Parses a numeric cell: numbers are used as is, strings may use a comma decimal separator
+
+    Parameters
+    ----------
+    value : str, float, int or None
+
+    Returns
+    -------
+    float
+        NaN for absent values (None or empty string)
+
+    Raises
+    ------
+    ValueError
+        For booleans and strings which are not finite numbers ("nan", "inf"...)
+    """
+    if isinstance(value, str):
+        # Fast path for plain numbers
+        try:
+            number = float(value)
+        except ValueError:
+            if not value.strip():
+                return math.nan
+            number = convert_decimal_separator(value)
+        if not math.isfinite(number):
+            raise ValueError(f"Invalid number: {value}")
+        return number
+    if value is None:
+        return math.nan
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid number: {value}")
+    if isinstance(value, (int, float)):
+        return float(value)
+    return convert_decimal_separator(str(value))
+
+
+@functools.cache
+def _enum_lookup(enum_type) -> dict:
+    """
+    Maps the lower-cased names and labels of an enumeration to their code
+    """
+    lookup = {}
+    for member in enum_type:
+        lookup[member.name.lower()] = member.value
+        lookup[str(member).lower()] = member.value
+    return lookup
+
+
+def parse_enum(value, enum_type) -> int:
+    """
+    Parses an enumerated cell given as member name or label
+
+    Parameters
+    ----------
+    value : str or None
+    enum_type : type
+
+    Returns
+    -------
+    int
+        Code of the member (member.value), 0 for absent values
+    """
+    if value is None or not str(value).strip():
+        return 0
+    try:
+        return _enum_lookup(enum_type)[str(value).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Invalid {enum_type.__name__}: {value}")
+
+
+def _plain_number_column(cells: list) -> Optional[np.ndarray]:
+    # Fast path of parse_records: a whole column converted by numpy, unless it gives other values
+    # than parse_number, numpy also accepting booleans and "nan" or "inf" strings
+    if any(type(cell) is bool for cell in cells):
+        return None
+    try:
+        values = np.array(cells, dtype=float)
+    except (ValueError, TypeError):
+        return None
+    if any(isinstance(cells[i], str) for i in np.flatnonzero(~np.isfinite(values))):
+        return None
+    return values
+
+
+def parse_records(records: list) -> CaseChunk:
+    """
+    Parses records into columns. A case with an unparsable cell gets an input error,
+    the cell being left absent, as does a record which is not a JSON object.
+
+    Parameters
+    ----------
+    records : list
+        dict per case (other values being invalid records, see read_records)
+
+    Returns
+    -------
+    CaseChunk
+    """
+    size = len(records)
+    errors = [[] for _ in range(size)]
+    if not all(isinstance(record, dict) for record in records):
+        records = list(records)
+        for i, record in enumerate(records):
+            if isinstance(record, json.JSONDecodeError):
+                errors[i].append(f"Invalid JSON: {record}")
+                records[i] = {}
+            elif not isinstance(record, dict):
+                errors[i].append(f"Invalid record: a JSON object is expected, not {type(record).__name__}")
+                records[i] = {}
+    ids = [record.get(ID_COLUMN) for record in records]
+    columns = {}
+
+    for name in NUMERIC_COLUMNS:
+        cells = [record.get(name) for record in records]
+        columns[name] = _plain_number_column(cells)
+        if columns[name] is not None:
+            continue
+        columns[name] = np.full(size, np.nan)
+        for i, cell in enumerate(cells):
+            try:
+                columns[name][i] = parse_number(cell)
+            except ValueError as e:
+                errors[i].append(f"{name}: {e}")
+
+    for name, enum_type in ENUM_COLUMNS.items():
+        columns[name] = np.zeros(size, dtype=np.int64)
+        for i, record in enumerate(records):
+            try:
+                columns[name][i] = parse_enum(record.get(name), enum_type)
+            except ValueError as e:
+                errors[i].append(f"{name}: {e}")
+
+    return CaseChunk(ids, columns, ["; ".join(error) if error else None for error in errors])
+
+
+# --- Computation
+
+def compute_chunk(chunk: CaseChunk, use_inverse_table: bool = False) -> ResultBatch:
+    """
+    Computes the cooling methods for all cases of a chunk in one vectorized pass
+
+    Parameters
+    ----------
+    chunk : CaseChunk
+    use_inverse_table : bool
+        See compute.run
+
+    Returns
+    -------
+    ResultBatch
+    """
+    return compute.compute_batch(
+        tympanic_temperature=chunk.columns["tympanic_temperature"],
+        rectal_temperature=chunk.columns["rectal_temperature"],
+        ambient_temperature=chunk.columns["ambient_temperature"],
+        body_mass=chunk.columns["body_mass"],
+        body_condition=chunk.columns["body_condition"],
+        environment=chunk.columns["environment"],
+        supporting_base=chunk.columns["supporting_base"],
+        user_corrective_factor=chunk.columns["user_corrective_factor"],
+        use_inverse_table=use_inverse_table
+    )
+
+
+# --- Writing
+
+def _format_values(values: np.ndarray) -> list:
+    # Floats, None for NaN
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def _format_errors(error_code: np.ndarray) -> list:
+    # Names of the errors of each bitmask ("" without error)
+    names = {code: ErrorCode(code).name if code else "" for code in np.unique(error_code).tolist()}
+    return [names[code] for code in error_code.tolist()]
+
+
+def format_rows(chunk: CaseChunk, results: ResultBatch) -> list:
+    """
+    Formats the results of a chunk as one tuple per case (values of OUTPUT_COLUMNS, None for absent values).
+    Cases with an input error get no results.
+
+    Parameters
+    ----------
+    chunk : CaseChunk
+    results : ResultBatch
+
+    Returns
+    -------
+    list of tuple
+    """
+    rectal, brain, baccino = results.henssge_rectal, results.henssge_brain, results.baccino
+    columns = [
+        chunk.ids,
+        chunk.input_errors,
+        _format_values(rectal.post_mortem_interval),
+        _format_values(rectal.confidence_interval),
+        _format_values(rectal.thermal_quotient),
+        _format_values(rectal.corrective_factor),
+        _format_errors(rectal.error_code),
+        _format_values(brain.post_mortem_interval),
+        _format_values(brain.confidence_interval),
+        _format_errors(brain.error_code),
+        _format_values(baccino.post_mortem_interval_interval),
+        _format_values(baccino.confidence_interval_interval),
+        _format_values(baccino.post_mortem_interval_global),
+        _format_values(baccino.confidence_interval_global),
+        _format_errors(baccino.error_code),
+    ]
+    no_results = (None,) * (len(columns) - 2)
+    return [row if not row[1] else row[:2] + no_results for row in zip(*columns)]
+
+
+class RecordWriter:
+
+    # Constructor
+    def __init__(self, stream, output_format: str, header: bool = True):
+        """
+        Writes output rows (values of OUTPUT_COLUMNS) to a CSV or JSON Lines stream
+
+        Parameters
+        ----------
+        stream : text stream
+        output_format : str
+            'csv' or 'jsonl'
+        header : bool
+            Start CSV output with the column names
+        """
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown format: {output_format}")
+
+        self.stream = stream
+        self.output_format = output_format
+        self._csv_writer = None
+        if output_format == "csv":
+            self._csv_writer = csv.writer(stream, lineterminator="\n")
+            if header:
+                self._csv_writer.writerow(OUTPUT_COLUMNS)
+
+    def write(self, rows: list) -> None:
+        if self._csv_writer:
+            self._csv_writer.writerows(rows)
+        else:
+            self.stream.writelines(json.dumps(dict(zip(OUTPUT_COLUMNS, row))) + "\n" for row in rows)
+
+
+# --- Entry point
+
+def process_block(block: str, fieldnames: Optional[list], input_format: str, output_format: str, use_inverse_table: bool = False) -> tuple:
+    """
+    Parses, computes and formats a block of records (see read_blocks), in the calling process or in a worker
+
+    Parameters
+    ----------
+    block : str
+    fieldnames : list
+    input_format : str
+    output_format : str
+    use_inverse_table : bool
+        See compute.run
+
+    Returns
+    -------
+    tuple
+        - Number of cases
+        - Output text (without CSV header)
+    """
+    chunk = parse_records(read_records(block, fieldnames, input_format))
+    output = io.StringIO(newline="")
+    RecordWriter(output, output_format, header=False).write(format_rows(chunk, compute_chunk(chunk, use_inverse_table)))
+    return len(chunk), output.getvalue()
+
+
+def _submit_in_order(executor: ProcessPoolExecutor, function, blocks: Iterator[tuple], max_pending: int) -> Iterator:
+    # Results of function on each block in input order, with at most max_pending blocks in flight (bounded memory)
+    pending = collections.deque()
+    for block in blocks:
+        pending.append(executor.submit(function, *block))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def run(input_stream, output_stream, input_format: str, output_format: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        use_inverse_table: bool = False, workers: int = 1, progress: bool = False) -> int:
+    """
+    Streams all cases of input_stream to output_stream
+
+    Parameters
+    ----------
+    input_stream : text stream
+    output_stream : text stream
+    input_format : str
+        'csv' or 'jsonl'
+    output_format : str
+        'csv' or 'jsonl'
+    chunk_size : int
+        Number of cases per chunk (at most 2 chunks per worker are held in memory)
+    use_inverse_table : bool
+        See compute.run
+    workers : int
+        Number of worker processes (1 to process the chunks in the calling process)
+    progress : bool
+        Report the number of processed cases and the throughput on the standard error
+
+    Returns
+    -------
+    int
+        Number of cases processed
+    """
+    function = functools.partial(process_block, input_format=input_format, output_format=output_format, use_inverse_table=use_inverse_table)
+    blocks = read_blocks(input_stream, input_format, chunk_size)
+
+    # CSV header
+    RecordWriter(output_stream, output_format)
+
+    count = 0
+    start = time.perf_counter()
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        results = _submit_in_order(executor, function, blocks, 2 * workers) if executor else (function(*block) for block in blocks)
+        for chunk_count, text in results:
+            output_stream.write(text)
+            count += chunk_count
+            if progress:
+                elapsed = time.perf_counter() - start
+                print(f"\r{count} cases, {count / elapsed:.0f} cases/s", end="", file=sys.stderr, flush=True)
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+    if progress:
+        print(file=sys.stderr)
+
+    return count
+
+
+def _guess_format(path: str, given: Optional[str]) -> str:
+    # Explicit format, otherwise from the file extension
+    if given:
+        return given
+    if path.lower().endswith(".csv"):
+        return "csv"
+    if path.lower().endswith((".jsonl", ".json", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Cannot guess the format of '{path}', use --input-format / --output-format")
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.batch", description="Computes the cooling methods for a file of cases.")
+    parser.add_argument("input", help="Input file (CSV or JSON Lines), '-' for standard input")
+    parser.add_argument("output", help="Output file (CSV or JSON Lines), '-' for standard output")
+    parser.add_argument("--input-format", choices=FORMATS)
+    parser.add_argument("--output-format", choices=FORMATS)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Cases held in memory at once")
+    parser.add_argument("--inverse-table", action="store_true", help="Read the Henssge PMI from precomputed inverse tables")
+    parser.add_argument("--workers", type=int, default=1, help=f"Worker processes (this host has {os.cpu_count()} cores)")
+    parser.add_argument("--progress", action="store_true", help="Report progress on the standard error")
+    arguments = parser.parse_args(argv)
+
+    try:
+        input_format = _guess_format(arguments.input, arguments.input_format)
+        output_format = _guess_format(arguments.output, arguments.output_format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    input_stream = sys.stdin if arguments.input == "-" else open(arguments.input, newline="", encoding="utf-8-sig")
+    output_stream = sys.stdout if arguments.output == "-" else open(arguments.output, "w", newline="", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        count = run(input_stream, output_stream, input_format, output_format, arguments.chunk_size, arguments.inverse_table,
+                    arguments.workers, arguments.progress)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{count} cases processed in {elapsed:.1f} s ({count / elapsed if elapsed else 0:.0f} cases/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
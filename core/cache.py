@@ -0,0 +1,201 @@
+# core/cache.py
+
+import enum
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from core.input_parameters import InputParameters
+from core.value_object import ValueObject
+
+# Constants
+PREDEFINED_CORRECTIVE_FACTOR_INPUTS = ("body_condition", "environment", "supporting_base")
+"""Inputs only used to look up the corrective factor, ignored when the user gives it manually"""
+
+
+class CacheStatistics(ValueObject):
+    __slots__ = ("hits", "misses", "evictions", "size")
+
+    # Constructor
+    def __init__(self, hits: int, misses: int, evictions: int, size: int):
+        """
+        Snapshot of the counters of a ResultCache
+
+        Parameters
+        ----------
+        hits : int
+        misses : int
+        evictions : int
+            Entries removed because the cache was full or their time to live was over
+        size : int
+            Current number of entries
+        """
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.size = size
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self):
+        return f"hits: {self.hits}, misses: {self.misses} ({100 * self.hit_rate:.1f} % hit rate), evictions: {self.evictions}, size: {self.size}"
+
+
+class ResultCache:
+
+    # Constructor
+    def __init__(self, max_size: int = 1024, ttl: float = None, decimals: int = 6, clock=time.monotonic):
+        """
+        Bounded and thread-safe memoization of the computation results (least recently used
+        entries are evicted first), see compute.run(..., cache=...) and compute().
+
+        Results are immutable, so the cached objects are shared between callers. Concurrent misses
+        on the same key may compute it twice; the computations are deterministic so either result
+        is kept.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum number of entries
+        ttl : float
+            Time to live of the entries (in seconds), None to keep them until evicted
+        decimals : int
+            Number of decimals the measured values are rounded to in the keys
+        clock : callable
+            Time source (in seconds) of the time to live
+        """
+        if max_size < 1:
+            raise ValueError("The cache size must be at least 1")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.decimals = decimals
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expiry time, result)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def key(self, method, input_parameters: InputParameters, *args) -> tuple:
+        """
+        Normalized key of a computation: only the inputs read by the method (see its INPUTS),
+        measured values rounded, enumerations as codes, and the body condition, environment and
+        supporting base dropped when the corrective factor is given manually.
+
+        Parameters
+        ----------
+        method : module
+            Computation module (core.computations.*)
+        input_parameters : InputParameters
+        args
+            Other arguments of the computation (e.g. use_inverse_table)
+
+        Returns
+        -------
+        tuple
+        """
+        inputs = method.INPUTS
+        if "user_corrective_factor" in inputs and input_parameters.user_corrective_factor:
+            inputs = tuple(name for name in inputs if name not in PREDEFINED_CORRECTIVE_FACTOR_INPUTS)
+        return (method.__name__, args) + tuple((name, self._normalize(getattr(input_parameters, name))) for name in inputs)
+
+    def _normalize(self, value):
+        # Missing values (None, and 0 which the validations treat as missing) share one key, NaN
+        # being kept apart as the validations reject it as out of range
+        if isinstance(value, enum.Enum):
+            return value.value
+        if not value:
+            return None
+        if math.isnan(value):
+            return "NaN"
+        return round(float(value), self.decimals)
+
+    def compute(self, method, input_parameters: InputParameters, *args):
+        """
+        Result of method.compute(input_parameters, *args), computed on a miss only, from the
+        rounded input parameters (see rounded)
+
+        Parameters
+        ----------
+        method : module
+            Computation module (core.computations.*)
+        input_parameters : InputParameters
+        args
+            Other arguments of the computation (e.g. use_inverse_table)
+        """
+        return self.get_or_compute(self.key(method, input_parameters, *args),
+                                   lambda: method.compute(self.rounded(input_parameters), *args))
+
+    def rounded(self, input_parameters: InputParameters) -> InputParameters:
+        """
+        Input parameters with the measured values rounded as in the keys, which the cached results
+        are computed from: a result (and the values quoted by its error message) is the same for
+        all the inputs sharing its key, whichever of them was computed first.
+
+        Parameters
+        ----------
+        input_parameters : InputParameters
+
+        Returns
+        -------
+        InputParameters
+        """
+        values = {}
+        for name in InputParameters.__slots__:
+            value = getattr(input_parameters, name)
+            if isinstance(value, float) and math.isfinite(value):
+                value = round(value, self.decimals)
+            values[name] = value
+        return InputParameters(**values)
+
+    def get_or_compute(self, key, function):
+        """
+        Cached value of the key, function() being called and its result stored on a miss
+
+        Parameters
+        ----------
+        key : hashable
+        function : callable
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] is None or entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self._evictions += 1
+            self._misses += 1
+
+        # Computed outside the lock, so that other keys are not blocked
+        result = function()
+
+        with self._lock:
+            self._entries[key] = (None if self.ttl is None else self._clock() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return result
+
+    def statistics(self) -> CacheStatistics:
+        with self._lock:
+            return CacheStatistics(self._hits, self._misses, self._evictions, len(self._entries))
+
+    def clear(self):
+        """
+        Removes all entries and resets the statistics
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
@@ -1,10 +1,16 @@
 import numpy as np
-import warnings
-from scipy.optimize import fsolve
 
-from core.constants import TemperatureLimitsType, TEMPERATURE_LIMITS
+from core.computations import spec
+from core.computations.common import ComputationError
+from core.constants import ErrorCode
 from core.input_parameters import InputParameters
+from core.output_batch import BaccinoBatchResults
 from core.output_results import BaccinoResults
+from core.validation import validate, validate_field_batch
+
+# Constants
+INPUTS = spec.BACCINO_INPUTS
+"""Input parameters read by the computation"""
 
 
 # Main computation
@@ -22,9 +28,10 @@ def compute(input_parameters) -> BaccinoResults:
     """
 
     # Validate inputs
-    input_is_valid, input_error = _validate_input(input_parameters)
-    if not input_is_valid:
-        return BaccinoResults(error_message=input_error)
+    input_parameters = validate(input_parameters)
+    input_error_result = spec.input_error_result(BaccinoResults, INPUTS, input_parameters)
+    if input_error_result is not None:
+        return input_error_result
 
     # Try computation
     try:
@@ -36,52 +43,68 @@ def compute(input_parameters) -> BaccinoResults:
         baccino_confidence_interval = _compute_confidence_interval(baccino_interval)
         baccino_confidence_global = _compute_confidence_interval(baccino_global)
 
-    except ValueError as e:
-        return BaccinoResults(error_message=str(e))
+    except ComputationError as e:
+        return BaccinoResults(error_code=e.error_code, error_values=e.error_values)
 
     return BaccinoResults(baccino_interval, baccino_global, baccino_confidence_interval, baccino_confidence_global)
 
 
-# Input verifications
-def _validate_input(input_parameters: InputParameters) -> tuple:
+def compute_batch(tympanic_temperature, ambient_temperature) -> BaccinoBatchResults:
     """
-    Validation of members of input parameters
-    
+    Vectorized counterpart of compute() over arrays of cases
+
     Parameters
     ----------
-    input_parameters : InputParameters        
+    tympanic_temperature : array_like
+        Measured tympanic temperatures (in °C), NaN if absent
+    ambient_temperature : array_like
+        Ambient temperatures (in °C), NaN if absent
 
     Returns
     -------
-    bool
-        True if inputs are valid
-    str
-        Human readable error message, or None on success.     
+    BaccinoBatchResults
     """
+    tympanic_temperature, ambient_temperature = np.broadcast_arrays(
+        np.asarray(tympanic_temperature, dtype=float), np.asarray(ambient_temperature, dtype=float)
+    )
+
+    # Validate inputs
+    error_code = _validate_input_batch(tympanic_temperature, ambient_temperature)
 
-    error_message = []
+    # Validity conditions of the equations (see _equation_interval and _equation_global)
+    valid = error_code == ErrorCode.NONE
+    error_code[valid & (tympanic_temperature >= 37)] |= ErrorCode.TYMPANIC_TEMPERATURE_TOO_HIGH
+    valid = error_code == ErrorCode.NONE
+    error_code[valid & (tympanic_temperature <= ambient_temperature)] |= ErrorCode.TYMPANIC_BELOW_AMBIENT
+    valid = error_code == ErrorCode.NONE
 
-    # Verification of temperature limits
-    tympanic_limits = TEMPERATURE_LIMITS.get(TemperatureLimitsType.TYMPANIC)
-    if not input_parameters.tympanic_temperature:
-        error_message.append(f"The tympanic temperature is absent and must be between {tympanic_limits[0]}°C and {tympanic_limits[1]}°C.")
-    elif not (tympanic_limits[0] <= input_parameters.tympanic_temperature <= tympanic_limits[1]):
-        error_message.append(
-            f"The tympanic temperature ({input_parameters.tympanic_temperature}°C) is not valid and must be between {tympanic_limits[0]}°C and {tympanic_limits[1]}°C.")
+    # Compute PMI and confidence interval
+    baccino_interval = np.where(valid, (56.44 * (37.0 - tympanic_temperature) - 150.0) / 60.0, np.nan)
+    baccino_global = np.where(valid, (57.0 * (37.0 - tympanic_temperature) + 6.7 * ambient_temperature - 240.0) / 60.0, np.nan)
 
-    ambient_limits = TEMPERATURE_LIMITS.get(TemperatureLimitsType.AMBIENT)
-    if not input_parameters.ambient_temperature:
-        error_message.append(f"The ambient temperature is absent and must be between {ambient_limits[0]}°C and {ambient_limits[1]}°C.")
-    elif not (ambient_limits[0] <= input_parameters.ambient_temperature <= ambient_limits[1]):
-        error_message.append(
-            f"The ambient temperature ({input_parameters.ambient_temperature}°C) is not valid and must be between {ambient_limits[0]}°C and {ambient_limits[1]}°C.")
+    return BaccinoBatchResults(
+        baccino_interval,
+        baccino_global,
+        _compute_confidence_interval(baccino_interval),
+        _compute_confidence_interval(baccino_global),
+        error_code
+    )
 
-    # Raise error if some values are not valid
-    if len(error_message) > 0:
-        return False, '\n'.join(error_message)
 
-    # Returns true if everything is valid
-    return True, None
+# Input verifications
+def _validate_input_batch(tympanic_temperature: np.ndarray, ambient_temperature: np.ndarray) -> np.ndarray:
+    """
+    Vectorized validation of input arrays, following the same rules as validate
+
+    Returns
+    -------
+    np.ndarray
+        ErrorCode bitmask of each row
+    """
+    return (
+        validate_field_batch("tympanic_temperature", tympanic_temperature)
+        | validate_field_batch("ambient_temperature", ambient_temperature)
+    )
 
 
 # Internal computations
@@ -107,11 +130,11 @@ def _equation_interval(tympanic_temperature: float) -> float:
 
     Raises
     ------
-    ValueError
+    ComputationError
         If the tympanic temperature is less than or equal to the ambient temperature.
     """
     if tympanic_temperature >= 37:
-        raise ValueError("The tympanic temperature must be less than 37°C.")
+        raise ComputationError(ErrorCode.TYMPANIC_TEMPERATURE_TOO_HIGH)
 
     return (56.44 * (37.0 - tympanic_temperature) - 150.0) / 60.0
 
@@ -140,13 +163,13 @@ def _equation_global(tympanic_temperature: float, ambient_temperature: float) ->
 
     Raises
     ------
-    ValueError
+    ComputationError
         If the tympanic temperature is less than or equal to the ambient temperature.
     """
     if tympanic_temperature <= ambient_temperature:
-        raise ValueError("Tympanic temperature must be greater than ambient temperature.")
+        raise ComputationError(ErrorCode.TYMPANIC_BELOW_AMBIENT)
     if tympanic_temperature >= 37:
-        raise ValueError("The tympanic temperature must be less than 37°C.")
+        raise ComputationError(ErrorCode.TYMPANIC_TEMPERATURE_TOO_HIGH)
 
     return (57.0 * (37.0 - tympanic_temperature) + 6.7 * ambient_temperature - 240.0) / 60.0
 
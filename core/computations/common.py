@@ -1,8 +1,105 @@
 import numpy as np
-import warnings
-from scipy.optimize import fsolve
 
-from core.constants import BodyCondition, EnvironmentType, SupportingBase, CORRECTIVE_FACTOR, SUPPORTING_BASE_FACTOR, STANDARD_BODY_TEMPERATURE
+from core.constants import BodyCondition, EnvironmentType, SupportingBase, CORRECTIVE_FACTOR, SUPPORTING_BASE_FACTOR, STANDARD_BODY_TEMPERATURE, \
+    ErrorCode, ERROR_INPUTS
+
+
+def enum_codes(values, enum_type) -> np.ndarray:
+    """
+    Converts enum members to their integer codes (member.value), as used to index the dense lookup tables.
+    Codes are passed through unchanged, and anything else (None, unknown or foreign members) becomes 0,
+    which the tables treat as NOT_SPECIFIED.
+
+    Parameters
+    ----------
+    values : enum member, int or sequence of them
+    enum_type : type
+        Enum class of the members
+
+    Returns
+    -------
+    np.ndarray
+        Integer codes (np.int64)
+    """
+    size = max(member.value for member in enum_type) + 1
+    array = np.asarray(values)
+    if array.dtype.kind in 'iu':
+        codes = array.astype(np.int64)
+    else:
+        to_code = np.frompyfunc(lambda value: value.value if isinstance(value, enum_type) else 0, 1, 1)
+        codes = np.asarray(to_code(array.astype(object)), dtype=np.int64)
+
+    return np.where((0 <= codes) & (codes < size), codes, 0)
+
+
+def _compile_corrective_factor_tables() -> tuple:
+    """
+    Compiles CORRECTIVE_FACTOR and SUPPORTING_BASE_FACTOR into dense arrays indexed by enum codes,
+    with the fallback rules of determine_corrective_factor baked in:
+    - unknown body conditions (code 0 included) read the NOT_SPECIFIED row
+    - environments missing from a row read its NOT_SPECIFIED column
+    - INDIFFERENT, NOT_SPECIFIED and unknown supporting bases add nothing
+
+    Returns
+    -------
+    tuple
+        - Corrective factors, shape (body condition codes, environment codes)
+        - Supporting base factors, shape (supporting base codes, body condition codes)
+    """
+    body_conditions = {member.value: member for member in BodyCondition}
+    environments = {member.value: member for member in EnvironmentType}
+    supporting_bases = {member.value: member for member in SupportingBase}
+
+    corrective_factor = np.empty((max(body_conditions) + 1, max(environments) + 1))
+    supporting_base_factor = np.zeros((max(supporting_bases) + 1, max(body_conditions) + 1))
+
+    for body_condition_code in range(corrective_factor.shape[0]):
+        body_condition = body_conditions.get(body_condition_code)
+        if body_condition not in CORRECTIVE_FACTOR:
+            body_condition = BodyCondition.NOT_SPECIFIED
+        row = CORRECTIVE_FACTOR[body_condition]
+
+        for environment_code in range(corrective_factor.shape[1]):
+            environment = environments.get(environment_code)
+            if environment not in row:
+                environment = EnvironmentType.NOT_SPECIFIED
+            corrective_factor[body_condition_code, environment_code] = row[environment]
+
+        for supporting_base_code, supporting_base in supporting_bases.items():
+            if supporting_base != SupportingBase.INDIFFERENT and supporting_base != SupportingBase.NOT_SPECIFIED and supporting_base in SUPPORTING_BASE_FACTOR:
+                supporting_base_factor[supporting_base_code, body_condition_code] = SUPPORTING_BASE_FACTOR[supporting_base].get(body_condition, 0.0)
+
+    return corrective_factor, supporting_base_factor
+
+
+_CORRECTIVE_FACTOR_TABLE, _SUPPORTING_BASE_FACTOR_TABLE = _compile_corrective_factor_tables()
+"""Dense versions of CORRECTIVE_FACTOR and SUPPORTING_BASE_FACTOR, see _compile_corrective_factor_tables"""
+
+
+def lookup_intervals_batch(values, intervals: dict, enum_type) -> tuple:
+    """
+    Vectorized lookup of the PMI interval of a thanatological sign
+
+    Parameters
+    ----------
+    values : array_like
+        Enum members or codes (see enum_codes)
+    intervals : dict
+        (min, max) interval in hours of each member
+    enum_type : type
+
+    Returns
+    -------
+    tuple
+        - Interval minimums (NaN where not specified)
+        - Interval maximums (NaN where not specified)
+    """
+    table = np.full((max(member.value for member in enum_type) + 1, 2), np.nan)
+    for member, interval in intervals.items():
+        table[member.value] = interval
+
+    codes = enum_codes(values, enum_type)
+    return table[codes, 0], table[codes, 1]
 
 
 def compute_thermal_quotient(temperature: float, ambient_temperature: float) -> float:
@@ -19,6 +116,34 @@ def compute_thermal_quotient(temperature: float, ambient_temperature: float) ->
     """
     return (temperature - ambient_temperature) / (STANDARD_BODY_TEMPERATURE - ambient_temperature)
 
+def validate_range_batch(values: np.ndarray, limits: tuple, missing_error: ErrorCode, range_error: ErrorCode) -> np.ndarray:
+    """
+    Vectorized counterpart of the input verifications of each method:
+    flags absent values (NaN, or 0 as in the scalar verifications) and values outside the limits.
+
+    Parameters
+    ----------
+    values : np.ndarray
+    limits : tuple
+        (min, max) limits
+    missing_error : ErrorCode
+        Error set for absent values
+    range_error : ErrorCode
+        Error set for values outside the limits
+
+    Returns
+    -------
+    np.ndarray
+        Error codes (ErrorCode.NONE for valid values)
+    """
+    missing = np.isnan(values) | (values == 0.0)
+    out_of_range = ~missing & ~((limits[0] <= values) & (values <= limits[1]))
+
+    error_code = np.zeros(values.shape, dtype=np.int64)
+    error_code[missing] = missing_error
+    error_code[out_of_range] = range_error
+    return error_code
+
 def determine_corrective_factor(
         body_condition: BodyCondition,
         environment: EnvironmentType,
@@ -55,28 +180,66 @@ def determine_corrective_factor(
     corrective_factor = user_corrective_factor
 
     # If no user input, determine corrective from body_condition and environment
+    # (missing or invalid values fall back to NOT_SPECIFIED, see _compile_corrective_factor_tables)
     if not corrective_factor:
-        # Handle missing or invalid body_condition
-        if body_condition not in CORRECTIVE_FACTOR:
-            body_condition = BodyCondition.NOT_SPECIFIED
-
-        # Handle missing or invalid environment
-        body_condition_correction_factor = CORRECTIVE_FACTOR.get(body_condition)
-        if environment not in body_condition_correction_factor:
-            environment = EnvironmentType.NOT_SPECIFIED
-
-        # Get initial corrective factor from predefined table
-        corrective_factor = body_condition_correction_factor.get(environment)
-
-        # Add supporting base factor if applicable
-        if supporting_base != SupportingBase.INDIFFERENT and supporting_base != SupportingBase.NOT_SPECIFIED and supporting_base in SUPPORTING_BASE_FACTOR:
-            corrective_factor += SUPPORTING_BASE_FACTOR.get(supporting_base).get(body_condition, 0.0)
+        body_condition_code = int(enum_codes(body_condition, BodyCondition))
+        corrective_factor = (_CORRECTIVE_FACTOR_TABLE[body_condition_code, int(enum_codes(environment, EnvironmentType))]
+                             + _SUPPORTING_BASE_FACTOR_TABLE[int(enum_codes(supporting_base, SupportingBase)), body_condition_code])
 
     # Calculate weight-adjusted corrective factor
     corrective_factor = _compute_adjusted_corrective_factor(corrective_factor, body_mass, body_condition, environment, supporting_base)
 
     return np.round(corrective_factor, 3)
 
+def determine_corrective_factor_batch(
+        body_condition,
+        environment,
+        supporting_base,
+        user_corrective_factor,
+        body_mass
+) -> np.ndarray:
+    """
+    Vectorized counterpart of determine_corrective_factor, resolving all rows in one pass
+    through the dense corrective factor tables.
+
+    Parameters
+    ----------
+    body_condition : array_like
+        BodyCondition members or codes (None or 0 if not specified)
+    environment : array_like
+        EnvironmentType members or codes (None or 0 if not specified)
+    supporting_base : array_like
+        SupportingBase members or codes (None or 0 if not specified)
+    user_corrective_factor : array_like
+        Manual corrective factors (NaN or 0 if absent)
+    body_mass : array_like
+        Body masses in kg
+
+    All arrays are broadcast together.
+
+    Returns
+    -------
+    np.ndarray
+        Final adjusted corrective factors (NaN where the body mass is NaN)
+    """
+    body_condition_code = enum_codes(body_condition, BodyCondition)
+    user_corrective_factor = np.asarray(user_corrective_factor, dtype=float)
+    body_mass = np.asarray(body_mass, dtype=float)
+
+    corrective_factor = np.where(
+        np.isnan(user_corrective_factor) | (user_corrective_factor == 0.0),
+        _CORRECTIVE_FACTOR_TABLE[body_condition_code, enum_codes(environment, EnvironmentType)]
+        + _SUPPORTING_BASE_FACTOR_TABLE[enum_codes(supporting_base, SupportingBase), body_condition_code],
+        user_corrective_factor
+    )
+
+    # Weight adjustment, skipped as in _compute_adjusted_corrective_factor
+    with np.errstate(divide='ignore', invalid='ignore'):
+        adjusted = (-1.2815 / ((body_mass ** -0.625 - 0.0284) * (-3.24596 * np.exp(-0.89959 * corrective_factor)) - 0.0354)) ** 1.6 / body_mass
+    corrective_factor = np.where((corrective_factor == 1.0) | (body_mass == 70), corrective_factor, adjusted)
+
+    return np.where(np.isnan(body_mass), np.nan, np.round(corrective_factor, 3))
+
 def _compute_adjusted_corrective_factor(corrective_factor: float, body_mass: float, body_condition: BodyCondition, environment: EnvironmentType,
                                         supporting_base: SupportingBase) -> float:
     """
@@ -101,4 +264,207 @@ def _compute_adjusted_corrective_factor(corrective_factor: float, body_mass: flo
     if corrective_factor == 1.0 or body_mass == 70:
         return corrective_factor
     
-    return (-1.2815 / ((body_mass ** -0.625 - 0.0284) * (-3.24596 * np.exp(-0.89959 * corrective_factor)) - 0.0354)) ** 1.6 / body_mass
\ No newline at end of file
+    return (-1.2815 / ((body_mass ** -0.625 - 0.0284) * (-3.24596 * np.exp(-0.89959 * corrective_factor)) - 0.0354)) ** 1.6 / body_mass
+
+
+class ComputationError(ValueError):
+
+    # Constructor
+    def __init__(self, error_code: ErrorCode, **error_values):
+        """
+        Error of a computation step, carrying the ErrorCode reported for it. The message is only
+        rendered when displayed (see ErrorCode.describe).
+
+        Parameters
+        ----------
+        error_code : ErrorCode
+        error_values
+            Values quoted by the message (e.g. thermal_quotient=1.2)
+        """
+        super().__init__(error_code)
+        self.error_code = error_code
+        self.error_values = tuple(error_values.items())
+
+    def __str__(self):
+        return self.error_code.describe(self.error_values)
+
+
+def error_values(error_code: ErrorCode, input_parameters) -> tuple:
+    """
+    Invalid input values quoted by the messages of an input validation error code
+
+    Parameters
+    ----------
+    error_code : ErrorCode
+    input_parameters : InputParameters
+
+    Returns
+    -------
+    tuple
+        (name, value) pairs, see ErrorCode.describe
+    """
+    return tuple((name, getattr(input_parameters, name)) for error, name in ERROR_INPUTS.items() if error in error_code)
+
+
+class SolverResult:
+
+    # Constructor
+    def __init__(self, root, iterations, residual, converged):
+        """
+        Outcome of solve_monotonic / solve_monotonic_batch (floats, or arrays with one value per row)
+
+        Parameters
+        ----------
+        root
+            Approximation of the root
+        iterations
+            Number of iterations performed
+        residual
+            function(root) - target
+        converged
+            True if the tolerance was reached within the maximum number of iterations
+        """
+        self.root = root
+        self.iterations = iterations
+        self.residual = residual
+        self.converged = converged
+
+
+def solve_monotonic(function, derivative, target: float, lower: float, upper: float, tolerance: float = 1e-12,
+                    max_iterations: int = 100) -> SolverResult:
+    """
+    Solves function(t) = target for a function monotonic on [lower, upper], such as a cooling curve.
+
+    Newton iterations use the analytic derivative and are kept inside a bracket of the root,
+    which shrinks at each evaluation; a bisection step is taken whenever a Newton step would
+    leave the bracket, so that the iterations always converge.
+
+    Parameters
+    ----------
+    function : callable
+        Monotonic function on [lower, upper]
+    derivative : callable
+        Derivative of function
+    target : float
+    lower : float
+    upper : float
+        Bounds of an interval containing the root
+    tolerance : float
+        Relative tolerance on the root
+    max_iterations : int
+
+    Returns
+    -------
+    SolverResult
+
+    Raises
+    ------
+    ComputationError
+        If function(t) - target has the same sign at both bounds (no root in the interval)
+    """
+    residual_lower = function(lower) - target
+    residual_upper = function(upper) - target
+    if residual_lower == 0.0:
+        return SolverResult(lower, 0, 0.0, True)
+    if residual_upper == 0.0:
+        return SolverResult(upper, 0, 0.0, True)
+    if not (residual_lower < 0.0 < residual_upper or residual_upper < 0.0 < residual_lower):
+        raise ComputationError(ErrorCode.NO_SOLUTION)
+
+    increasing = residual_upper > 0.0
+    root = lower if abs(residual_lower) < abs(residual_upper) else upper
+    residual = residual_lower if root == lower else residual_upper
+
+    for iteration in range(1, max_iterations + 1):
+        # Shrink the bracket around the root
+        if (residual > 0.0) == increasing:
+            upper = root
+        else:
+            lower = root
+
+        # Newton step, replaced by bisection when it leaves the bracket
+        slope = derivative(root)
+        next_root = root - residual / slope if slope != 0.0 else float('nan')
+        if not lower < next_root < upper:
+            next_root = 0.5 * (lower + upper)
+
+        converged = abs(next_root - root) <= tolerance * (1.0 + abs(root))
+        root = next_root
+        residual = function(root) - target
+        if converged or residual == 0.0:
+            return SolverResult(root, iteration, residual, True)
+
+    return SolverResult(root, max_iterations, residual, False)
+
+
+def solve_monotonic_batch(function, derivative, target: np.ndarray, lower: np.ndarray, upper: np.ndarray, tolerance: float = 1e-12,
+                          max_iterations: int = 100) -> SolverResult:
+    """
+    Vectorized counterpart of solve_monotonic, solving one equation per row.
+    Each iteration only evaluates the rows that have not converged yet.
+
+    Rows whose root is not bracketed by [lower, upper] are not solved:
+    their root and residual are NaN and they are reported as not converged.
+
+    Parameters
+    ----------
+    function : callable
+        Vectorized function, monotonic on each [lower, upper]
+    derivative : callable
+        Vectorized derivative of function
+    target : np.ndarray
+    lower : np.ndarray
+    upper : np.ndarray
+    tolerance : float
+    max_iterations : int
+
+    Returns
+    -------
+    SolverResult
+        With one value per row in each member
+    """
+    target, lower, upper = (np.array(values, dtype=float) for values in np.broadcast_arrays(target, lower, upper))
+    residual_lower = function(lower) - target
+    residual_upper = function(upper) - target
+
+    # Start from the bound with the smallest residual
+    start_lower = np.abs(residual_lower) < np.abs(residual_upper)
+    root = np.where(start_lower, lower, upper)
+    residual = np.where(start_lower, residual_lower, residual_upper)
+    increasing = residual_upper > residual_lower
+    iterations = np.zeros(root.shape, dtype=int)
+    converged = residual == 0.0
+
+    bracketed = ((residual_lower <= 0.0) & (residual_upper >= 0.0)) | ((residual_lower >= 0.0) & (residual_upper <= 0.0))
+    root[~bracketed] = np.nan
+    residual[~bracketed] = np.nan
+
+    active = np.flatnonzero(bracketed & ~converged)
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+
+        t = root[active]
+        r = residual[active]
+
+        # Shrink the brackets around the roots
+        above = (r > 0.0) == increasing[active]
+        upper[active] = np.where(above, t, upper[active])
+        lower[active] = np.where(above, lower[active], t)
+
+        # Newton steps, replaced by bisection when they leave the brackets
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t_next = t - r / derivative(t)
+        outside = ~((lower[active] < t_next) & (t_next < upper[active]))
+        t_next = np.where(outside, 0.5 * (lower[active] + upper[active]), t_next)
+
+        r_next = function(t_next) - target[active]
+        root[active] = t_next
+        residual[active] = r_next
+        iterations[active] += 1
+
+        done = (np.abs(t_next - t) <= tolerance * (1.0 + np.abs(t))) | (r_next == 0.0)
+        converged[active[done]] = True
+        active = active[~done]
+
+    return SolverResult(root, iterations, residual, converged)
@@ -1,20 +1,35 @@
+import functools
 import numpy as np
-import warnings
-from scipy.optimize import fsolve
+from typing import Optional
 
-from core.computations.common import compute_thermal_quotient
-from core.constants import TemperatureLimitsType, TEMPERATURE_LIMITS
+from core.computations import spec
+from core.computations.common import compute_thermal_quotient, solve_monotonic, solve_monotonic_batch, SolverResult, \
+    ComputationError
+from core.computations.inverse_table import InverseTable, MAX_PMI_ERROR
+from core.constants import ErrorCode
 from core.input_parameters import InputParameters
+from core.output_batch import HenssgeBrainBatchResults
 from core.output_results import HenssgeBrainResults
+from core.validation import validate, validate_field_batch
+
+# Constants
+INPUTS = spec.HENSSGE_BRAIN_INPUTS
+"""Input parameters read by the computation"""
+
+_PEAK_TIME = np.log((0.135 * 1.07) / (1.135 * 0.127)) / (1.07 - 0.127)
+"""Time (in hours) at which the brain cooling curve is maximal, the curve decreasing monotonically afterwards"""
 
 
 # Main computation
-def compute(input_parameters) -> HenssgeBrainResults:
+def compute(input_parameters, use_inverse_table: bool = False) -> HenssgeBrainResults:
     """
     
     Parameters
     ----------
     input_parameters : InputParameters
+    use_inverse_table : bool
+        Read the PMI from the precomputed inverse table (estimated within inverse_table.MAX_PMI_ERROR),
+        solving the equation only outside the table
 
     Returns
     -------
@@ -23,73 +38,95 @@ def compute(input_parameters) -> HenssgeBrainResults:
     """
 
     # Validate inputs
-    input_is_valid, input_error = _validate_input(input_parameters)
-    if not input_is_valid:
-        return HenssgeBrainResults(error_message=input_error)
+    input_parameters = validate(input_parameters)
+    input_error_result = spec.input_error_result(HenssgeBrainResults, INPUTS, input_parameters)
+    if input_error_result is not None:
+        return input_error_result
 
     # Try computation
     try:
         # Compute PMI
-        initial_interval = 1.0
-        with warnings.catch_warnings():
-
-            warnings.simplefilter("error")
-
-            try:
-                post_mortem_interval = fsolve(_equation, initial_interval, args=(input_parameters.tympanic_temperature, input_parameters.ambient_temperature))[0]
-
-            except RuntimeWarning:
-                return HenssgeBrainResults(error_message="Convergence error")
+        thermal_quotient = compute_thermal_quotient(input_parameters.tympanic_temperature, input_parameters.ambient_temperature)
+        post_mortem_interval = _solve_post_mortem_interval(thermal_quotient, use_inverse_table)
 
         # Compute confidence interval
         confidence_interval = _compute_confidence_interval(post_mortem_interval)
 
-    except ValueError as e:
-        return HenssgeBrainResults(error_message=str(e))
+    except ComputationError as e:
+        return HenssgeBrainResults(error_code=e.error_code, error_values=e.error_values)
 
     return HenssgeBrainResults(post_mortem_interval, confidence_interval)
 
 
-# Input verifications
-def _validate_input(input_parameters: InputParameters) -> tuple:
+def compute_batch(tympanic_temperature, ambient_temperature, use_inverse_table: bool = False) -> HenssgeBrainBatchResults:
     """
-    Validation of members of input parameters
-    
+    Vectorized counterpart of compute() over arrays of cases
+
     Parameters
     ----------
-    input_parameters : InputParameters        
+    tympanic_temperature : array_like
+        Measured tympanic temperatures (in °C), NaN if absent
+    ambient_temperature : array_like
+        Ambient temperatures (in °C), NaN if absent
+    use_inverse_table : bool
+        Read the PMI from the precomputed inverse table (estimated within inverse_table.MAX_PMI_ERROR),
+        solving the equation only for the rows outside the table
 
     Returns
     -------
-    bool
-        True if inputs are valid
-    str
-        Human readable error message, or None on success.     
+    HenssgeBrainBatchResults
     """
+    tympanic_temperature, ambient_temperature = np.broadcast_arrays(
+        np.asarray(tympanic_temperature, dtype=float), np.asarray(ambient_temperature, dtype=float)
+    )
 
-    error_message = []
+    # Validate inputs
+    error_code = _validate_input_batch(tympanic_temperature, ambient_temperature)
 
-    # Verification of temperature limits
-    tympanic_limits = TEMPERATURE_LIMITS.get(TemperatureLimitsType.TYMPANIC)
-    if not input_parameters.tympanic_temperature:
-        error_message.append(f"The tympanic temperature is absent and must be between {tympanic_limits[0]}°C and {tympanic_limits[1]}°C.")
-    elif not (tympanic_limits[0] <= input_parameters.tympanic_temperature <= tympanic_limits[1]):
-        error_message.append(
-            f"The tympanic temperature ({input_parameters.tympanic_temperature}°C) is not valid and must be between {tympanic_limits[0]}°C and {tympanic_limits[1]}°C.")
+    # The equation only has a solution for 0 < Q <= 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        thermal_quotient = compute_thermal_quotient(tympanic_temperature, ambient_temperature)
+    solvable = (0.0 < thermal_quotient) & (thermal_quotient <= 1.0)
+    error_code[(error_code == ErrorCode.NONE) & ~solvable] |= ErrorCode.NO_SOLUTION
 
-    ambient_limits = TEMPERATURE_LIMITS.get(TemperatureLimitsType.AMBIENT)
-    if not input_parameters.ambient_temperature:
-        error_message.append(f"The ambient temperature is absent and must be between {ambient_limits[0]}°C and {ambient_limits[1]}°C.")
-    elif not (ambient_limits[0] <= input_parameters.ambient_temperature <= ambient_limits[1]):
-        error_message.append(
-            f"The ambient temperature ({input_parameters.ambient_temperature}°C) is not valid and must be between {ambient_limits[0]}°C and {ambient_limits[1]}°C.")
+    # Compute PMI of valid rows
+    valid = error_code == ErrorCode.NONE
+    post_mortem_interval = np.full(valid.shape, np.nan)
+    if use_inverse_table:
+        post_mortem_interval[valid] = _lookup_post_mortem_interval_batch(thermal_quotient[valid])
+    unsolved = valid & np.isnan(post_mortem_interval)
+    solver_result = _solve_post_mortem_interval_batch(thermal_quotient[unsolved])
+    post_mortem_interval[unsolved] = solver_result.root
+    error_code[np.flatnonzero(unsolved)[~solver_result.converged]] |= ErrorCode.NO_CONVERGENCE
+    valid = error_code == ErrorCode.NONE
 
-    # Raise error if some values are not valid
-    if len(error_message) > 0:
-        return False, '\n'.join(error_message)
+    # Compute confidence interval, the method being not applicable beyond 13.5 hours
+    error_code[valid & (post_mortem_interval > 13.5)] |= ErrorCode.OUT_OF_VALIDITY_RANGE
+    valid = error_code == ErrorCode.NONE
+    post_mortem_interval[~valid] = np.nan
+    confidence_interval = np.select(
+        [post_mortem_interval <= 6.5, post_mortem_interval <= 10.5, post_mortem_interval <= 13.5],
+        [1.5, 2.5, 3.5],
+        np.nan
+    )
 
-    # Returns true if everything is valid
-    return True, None
+    return HenssgeBrainBatchResults(post_mortem_interval, confidence_interval, error_code)
+
+
+# Input verifications
+def _validate_input_batch(tympanic_temperature: np.ndarray, ambient_temperature: np.ndarray) -> np.ndarray:
+    """
+    Vectorized validation of input arrays, following the same rules as validate
+
+    Returns
+    -------
+    np.ndarray
+        ErrorCode bitmask of each row
+    """
+    return (
+        validate_field_batch("tympanic_temperature", tympanic_temperature)
+        | validate_field_batch("ambient_temperature", ambient_temperature)
+    )
 
 
 # Internal computations
@@ -109,7 +146,7 @@ def _compute_confidence_interval(post_mortem_interval: float) -> float:
 
     Raises
     ------
-    ValueError
+    ComputationError
         If the post-mortem interval is greater than 13.5 hours, as the method
         becomes significantly less accurate beyond this limit
     """
@@ -120,29 +157,137 @@ def _compute_confidence_interval(post_mortem_interval: float) -> float:
     elif 10.5 < post_mortem_interval <= 13.5:
         return 3.5
     else:
-        raise ValueError("Error: The method becomes less accurate beyond 13.5 hours")
+        raise ComputationError(ErrorCode.OUT_OF_VALIDITY_RANGE)
 
 
-def _equation(post_mortem_interval: float, tympanic_temperature: float, ambient_temperature: float) -> float:
+def _solve_post_mortem_interval(thermal_quotient: float, use_inverse_table: bool = False) -> float:
     """
-    Calculates the post-mortem interval according to another Henssge equation (variation of the equation for brain temperature) from the tympanic temperature.
+    Solves temperature_decrease(t) = Q with the safeguarded Newton solver, on the bracket given by _bracket
 
     Parameters
     ----------
-    post_mortem_interval : float
-        Time elapsed since death (Post-Mortem Interval or PMI) in hours
-    tympanic_temperature : float
-        Measured tympanic temperature in °C
-    ambient_temperature : float
-        Measured ambient temperature in °C
+    thermal_quotient : float
+    use_inverse_table : bool
+        Read the PMI from the inverse table when its estimated error is within MAX_PMI_ERROR
 
     Returns
     -------
     float
-        Post-mortem interval
+        Post-mortem interval in hours
+
+    Raises
+    ------
+    ComputationError
+        If the thermal quotient is outside ]0, 1] (no solution) or the solver did not converge
+    """
+    if not 0.0 < thermal_quotient <= 1.0:
+        raise ComputationError(ErrorCode.NO_SOLUTION, thermal_quotient=thermal_quotient)
+
+    if use_inverse_table:
+        post_mortem_interval = _lookup_post_mortem_interval(thermal_quotient)
+        if post_mortem_interval is not None:
+            return post_mortem_interval
+
+    lower, upper = _bracket(thermal_quotient)
+    result = solve_monotonic(temperature_decrease, _temperature_decrease_derivative, thermal_quotient, lower, upper)
+    if not result.converged:
+        raise ComputationError(ErrorCode.NO_CONVERGENCE)
+
+    return float(result.root)
+
+
+def _bracket(thermal_quotient):
+    """
+    Bounds of the post-mortem interval for thermal quotients in ]0, 1].
+
+    As 1.135 * exp(-0.127 t) >= temperature_decrease(t) >= exp(-0.127 t), the root lies in
+    [-ln(Q) / 0.127, ln(1.135 / Q) / 0.127], restricted to the decreasing part of the curve.
+    The upper bound, nearly reached for small Q, is widened by a few seconds against rounding errors.
+
+    Parameters
+    ----------
+    thermal_quotient : float or np.ndarray
+
+    Returns
+    -------
+    tuple
+        Lower and upper bounds (in hours)
     """
-    thermal_quotient = compute_thermal_quotient(tympanic_temperature, ambient_temperature)
-    return thermal_quotient - temperature_decrease(post_mortem_interval)
+    lower = np.maximum(-np.log(thermal_quotient) / 0.127, _PEAK_TIME)
+    upper = np.maximum(np.log(1.135 / thermal_quotient) / 0.127 + 1e-3, _PEAK_TIME)
+    return lower, upper
+
 
 def temperature_decrease(post_mortem_interval: float) -> float:
     return 1.135 * np.exp(-0.127 * post_mortem_interval) - 0.135 * np.exp(-1.07 * post_mortem_interval)
+
+
+def _temperature_decrease_derivative(post_mortem_interval: float) -> float:
+    return -0.144145 * np.exp(-0.127 * post_mortem_interval) + 0.14445 * np.exp(-1.07 * post_mortem_interval)
+
+
+@functools.lru_cache(maxsize=None)
+def _inverse_table() -> InverseTable:
+    """
+    Inverse table of temperature_decrease on its decreasing part, built on first use
+
+    Returns
+    -------
+    InverseTable
+    """
+    return InverseTable.build(
+        temperature_decrease,
+        _temperature_decrease_derivative,
+        _PEAK_TIME + 1e-3,
+        20.0
+    )
+
+
+def _lookup_post_mortem_interval(thermal_quotient: float) -> Optional[float]:
+    """
+    Reads the post-mortem interval from the inverse table
+
+    Parameters
+    ----------
+    thermal_quotient : float
+
+    Returns
+    -------
+    float
+        Post-mortem interval in hours, or None if the thermal quotient is outside
+        the part of the table estimated accurate within MAX_PMI_ERROR
+    """
+    post_mortem_interval, error = _inverse_table().lookup(thermal_quotient)
+    if not error <= MAX_PMI_ERROR:
+        return None
+    return float(post_mortem_interval)
+
+
+def _lookup_post_mortem_interval_batch(thermal_quotient: np.ndarray) -> np.ndarray:
+    """
+    Vectorized counterpart of _lookup_post_mortem_interval
+
+    Returns
+    -------
+    np.ndarray
+        Post-mortem intervals in hours (NaN where the table is not accurate enough)
+    """
+    post_mortem_interval, error = _inverse_table().lookup(thermal_quotient)
+    return np.where(error <= MAX_PMI_ERROR, post_mortem_interval, np.nan)
+
+
+def _solve_post_mortem_interval_batch(thermal_quotient: np.ndarray) -> SolverResult:
+    """
+    Vectorized counterpart of _solve_post_mortem_interval, for thermal quotients in ]0, 1]
+
+    Parameters
+    ----------
+    thermal_quotient : np.ndarray
+
+    Returns
+    -------
+    SolverResult
+        Post-mortem intervals in hours as roots
+    """
+    lower, upper = _bracket(thermal_quotient)
+    return solve_monotonic_batch(temperature_decrease, _temperature_decrease_derivative, thermal_quotient, lower, upper)
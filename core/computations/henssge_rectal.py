@@ -1,20 +1,38 @@
+import functools
+import math
+
 import numpy as np
-import warnings
-from scipy.optimize import fsolve
 
-from core.computations.common import determine_corrective_factor, compute_thermal_quotient
-from core.constants import TEMPERATURE_LIMITS, BODY_MASS_LIMIT, TemperatureLimitsType
+from core.computations import spec
+from core.computations.common import determine_corrective_factor, compute_thermal_quotient, ComputationError
+from core.computations.inverse_table import InverseTable, MAX_PMI_ERROR
+from core.constants import ErrorCode
 from core.input_parameters import InputParameters
+from core.output_batch import HenssgeRectalBatchResults
 from core.output_results import HenssgeRectalResults
+from core.validation import validate, validate_field_batch
+
+# Constants
+INPUTS = spec.HENSSGE_RECTAL_INPUTS
+"""Input parameters read by the computation"""
+
+_MAX_ITERATIONS = 100
+"""Maximum number of Newton iterations when solving the cooling polynomial"""
+
+_EPSILON = np.finfo(float).eps
+"""Machine epsilon, used as relative stopping tolerance"""
 
 
 # Main computation
-def compute(input_parameters) -> HenssgeRectalResults:
+def compute(input_parameters, use_inverse_table: bool = False) -> HenssgeRectalResults:
     """
     
     Parameters
     ----------
     input_parameters : InputParameters
+    use_inverse_table : bool
+        Read the PMI from the precomputed inverse tables (estimated within inverse_table.MAX_PMI_ERROR),
+        solving the equation only outside the tables
 
     Returns
     -------
@@ -23,9 +41,10 @@ def compute(input_parameters) -> HenssgeRectalResults:
     """
 
     # Validate inputs
-    input_is_valid, input_error = _validate_input(input_parameters)
-    if not input_is_valid:
-        return HenssgeRectalResults(error_message=input_error)
+    input_parameters = validate(input_parameters)
+    input_error_result = spec.input_error_result(HenssgeRectalResults, INPUTS, input_parameters)
+    if input_error_result is not None:
+        return input_error_result
 
     # Determine the combined corrective factor
     corrective_factor = determine_corrective_factor(
@@ -39,76 +58,92 @@ def compute(input_parameters) -> HenssgeRectalResults:
     # Try computation
     try:
         # Compute PMI
-        initial_interval = 1.0
-        with warnings.catch_warnings():
-
-            warnings.simplefilter("error")
-
-            try:
-                pmi = fsolve(
-                    _equation,
-                    initial_interval,
-                    args=(input_parameters.rectal_temperature, input_parameters.ambient_temperature, input_parameters.body_mass * corrective_factor)
-                )[0]
-
-            except RuntimeWarning:
-                return HenssgeRectalResults(error_message="Convergence error")
-
-        # Compute confidence interval and thermal quotient
         thermal_quotient = compute_thermal_quotient(input_parameters.rectal_temperature, input_parameters.ambient_temperature)
+        pmi = _solve_post_mortem_interval(thermal_quotient, input_parameters.ambient_temperature, input_parameters.body_mass * corrective_factor,
+                                          use_inverse_table)
+
+        # Compute confidence interval
         confidence_interval = _adjust_confidence_interval(thermal_quotient, corrective_factor)
 
-    except ValueError as e:
-        return HenssgeRectalResults(error_message=str(e))
+    except ComputationError as e:
+        return HenssgeRectalResults(error_code=e.error_code, error_values=e.error_values)
 
     return HenssgeRectalResults(pmi, confidence_interval, thermal_quotient, corrective_factor)
 
 
-# Input verifications
-def _validate_input(input_parameters: InputParameters) -> tuple:
+def compute_batch(rectal_temperature, ambient_temperature, body_mass, corrective_factor, use_inverse_table: bool = False) -> HenssgeRectalBatchResults:
     """
-    Validation of members of input parameters
-    
+    Vectorized counterpart of compute() over arrays of cases
+
     Parameters
     ----------
-    input_parameters : InputParameters        
+    rectal_temperature : array_like
+        Measured rectal temperatures (in °C), NaN if absent
+    ambient_temperature : array_like
+        Ambient temperatures (in °C), NaN if absent
+    body_mass : array_like
+        Body masses (in kg), NaN if absent
+    corrective_factor : array_like
+        Combined corrective factors, as returned by determine_corrective_factor
+    use_inverse_table : bool
+        Read the PMI from the precomputed inverse tables (estimated within inverse_table.MAX_PMI_ERROR),
+        solving the equation only for the rows outside the tables
 
     Returns
     -------
-    bool
-        True if inputs are valid
-    str
-        Human readable error message, or None on success.     
+    HenssgeRectalBatchResults
     """
+    rectal_temperature, ambient_temperature, body_mass, corrective_factor = np.broadcast_arrays(
+        *(np.asarray(values, dtype=float) for values in (rectal_temperature, ambient_temperature, body_mass, corrective_factor))
+    )
 
-    error_message = []
-
-    # Verification of temperature limits
-    ambient_limits = TEMPERATURE_LIMITS.get(TemperatureLimitsType.AMBIENT)
-    if not input_parameters.ambient_temperature:
-        error_message.append(f"The ambient temperature is absent and must be between {ambient_limits[0]}°C and {ambient_limits[1]}°C.")
-    elif not (ambient_limits[0] <= input_parameters.ambient_temperature <= ambient_limits[1]):
-        error_message.append(
-            f"The ambient temperature ({input_parameters.ambient_temperature}°C) is not valid and must be between {ambient_limits[0]}°C and {ambient_limits[1]}°C.")
-
-    rectal_limits = TEMPERATURE_LIMITS.get(TemperatureLimitsType.RECTAL)
-    if not input_parameters.rectal_temperature:
-        error_message.append(f"The rectal temperature is absent and must be between {rectal_limits[0]}°C and {rectal_limits[1]}°C.")
-    elif not (rectal_limits[0] <= input_parameters.rectal_temperature <= rectal_limits[1]):
-        error_message.append(f"The rectal temperature ({input_parameters.rectal_temperature}°C) is not valid and must be between {rectal_limits[0]}°C and {rectal_limits[1]}°C.")
+    # Validate inputs
+    error_code = _validate_input_batch(rectal_temperature, ambient_temperature, body_mass)
+
+    # The equation only has a solution for 0 < Q <= 1 and a positive cooling constant,
+    # the latter being NaN for a corrected body mass that is not positive (or NaN), as in the scalar
+    corrected_body_mass = body_mass * corrective_factor
+    positive_mass = corrected_body_mass > 0.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        thermal_quotient = compute_thermal_quotient(rectal_temperature, ambient_temperature)
+    k = np.where(positive_mass, _cooling_constant(np.where(positive_mass, corrected_body_mass, 1.0)), np.nan)
+    solvable = (0.0 < thermal_quotient) & (thermal_quotient <= 1.0) & (k > 0.0)
+    error_code[(error_code == ErrorCode.NONE) & ~solvable] |= ErrorCode.NO_SOLUTION
+    valid = error_code == ErrorCode.NONE
+
+    # Compute PMI and confidence interval of valid rows
+    pmi = np.full(valid.shape, np.nan)
+    if use_inverse_table:
+        pmi[valid] = _lookup_post_mortem_interval_batch(thermal_quotient[valid], ambient_temperature[valid], k[valid])
+    unsolved = valid & np.isnan(pmi)
+    x = _solve_cooling_polynomial_batch(thermal_quotient[unsolved], ambient_temperature[unsolved])
+    pmi[unsolved] = np.where(x < 1.0, -np.log(x) / k[unsolved], 0.0)
+    confidence_interval = np.where(valid, _adjust_confidence_interval_batch(thermal_quotient, corrective_factor), np.nan)
+
+    return HenssgeRectalBatchResults(
+        pmi,
+        confidence_interval,
+        np.where(valid, thermal_quotient, np.nan),
+        np.where(valid, corrective_factor, np.nan),
+        error_code
+    )
 
-    # Verification of body mass limits
-    if not input_parameters.body_mass:
-        error_message.append(f"The body mass is absent and must be between {BODY_MASS_LIMIT[0]}kg and {BODY_MASS_LIMIT[1]}kg.")
-    elif not (BODY_MASS_LIMIT[0] <= input_parameters.body_mass <= BODY_MASS_LIMIT[1]):
-        error_message.append(f"The body mass ({input_parameters.body_mass}kg) is not valid and must be between {BODY_MASS_LIMIT[0]}kg and {BODY_MASS_LIMIT[1]}kg.")
 
-    # Raise error if some values are not valid
-    if len(error_message) > 0:
-        return False, '\n'.join(error_message)
+# Input verifications
+def _validate_input_batch(rectal_temperature: np.ndarray, ambient_temperature: np.ndarray, body_mass: np.ndarray) -> np.ndarray:
+    """
+    Vectorized validation of input arrays, following the same rules as validate
 
-    # Returns true if everything is valid
-    return True, None
+    Returns
+    -------
+    np.ndarray
+        ErrorCode bitmask of each row
+    """
+    return (
+        validate_field_batch("ambient_temperature", ambient_temperature)
+        | validate_field_batch("rectal_temperature", rectal_temperature)
+        | validate_field_batch("body_mass", body_mass)
+    )
 
 
 # Internal computations
@@ -138,34 +173,222 @@ def _adjust_confidence_interval(thermal_quotient: float, corrective_factor: floa
         return 7.0 if corrective_factor_not_1 else 4.5
     return 7.0
 
-def _equation(post_mortem_interval: float, rectal_temperature: float, ambient_temperature: float, body_mass: float) -> float:
+def _adjust_confidence_interval_batch(thermal_quotient: np.ndarray, corrective_factor: np.ndarray) -> np.ndarray:
     """
-    Calculates the post-mortem interval according to the Henssge equation from the rectal temperature.
+    Vectorized counterpart of _adjust_confidence_interval
+
+    Returns
+    -------
+    np.ndarray
+        Confidence intervals in hours
+    """
+    corrective_factor_not_1 = ~np.isclose(corrective_factor, 1.0)
+
+    return np.select(
+        [
+            (1 > thermal_quotient) & (thermal_quotient > 0.5),
+            (0.5 > thermal_quotient) & (thermal_quotient > 0.3),
+            (0.3 > thermal_quotient) & (thermal_quotient > 0.2)
+        ],
+        [
+            2.8,
+            np.where(corrective_factor_not_1, 4.5, 3.2),
+            np.where(corrective_factor_not_1, 7.0, 4.5)
+        ],
+        7.0
+    )
+
+def _solve_post_mortem_interval(thermal_quotient: float, ambient_temperature: float, body_mass: float, use_inverse_table: bool = False) -> float:
+    """
+    Inverts the Henssge rectal equation for the post-mortem interval.
+
+    With x = exp(-k * t), the temperature decrease is the polynomial p(x) = a * x - (a - 1) * x^n,
+    which is increasing and concave on [0, 1] with p(0) = 0 and p(1) = 1. The single root of
+    p(x) = Q in (0, 1] is found with Newton iterations started from the lower bound Q / a: on a
+    concave increasing function they approach the root monotonically from the left, so no
+    bracketing failure or overshoot can occur. The PMI is then t = -ln(x) / k.
 
     Parameters
     ----------
-    post_mortem_interval : float
-        Time elapsed since death (Post-Mortem Interval or PMI) in hours
-    rectal_temperature : float
-        Measured rectal temperature in °C
+    thermal_quotient : float
+        Thermal quotient (Q)
     ambient_temperature : float
         Measured ambient temperature in °C
     body_mass : float
-        Body mass in kg
+        Body mass in kg (already multiplied by the corrective factor)
+    use_inverse_table : bool
+        Read k * t from the inverse table of the regime when its estimated error is within MAX_PMI_ERROR
 
     Returns
     -------
     float
-        Post-mortem interval
+        Post-mortem interval in hours
+
+    Raises
+    ------
+    ComputationError
+        If the thermal quotient is outside ]0, 1], the corrected body mass or the cooling constant
+        is not positive, in which case the equation has no solution
     """
-    thermal_quotient = compute_thermal_quotient(rectal_temperature, ambient_temperature)    
-    return thermal_quotient - temperature_decrease(post_mortem_interval, ambient_temperature, body_mass)
+    if not 0.0 < thermal_quotient <= 1.0:
+        raise ComputationError(ErrorCode.NO_SOLUTION, thermal_quotient=thermal_quotient)
 
+    # Checked before the power of the cooling constant, undefined for a mass that is not positive (or NaN)
+    if not body_mass > 0.0:
+        raise ComputationError(ErrorCode.NO_SOLUTION, corrected_body_mass=body_mass)
+    k = _cooling_constant(body_mass)
+    if not k > 0.0:
+        raise ComputationError(ErrorCode.NO_SOLUTION, corrected_body_mass=body_mass)
 
-def temperature_decrease(post_mortem_interval: float, ambient_temperature: float, body_mass: float) -> float:
-    k = (1.2815 / body_mass ** 0.625) - 0.0284
+    if thermal_quotient == 1.0:
+        return 0.0
+
+    a, n = _cooling_polynomial(ambient_temperature)
+    b = a - 1.0
+
+    if use_inverse_table:
+        cooling_parameter, error = _inverse_table(a, n).lookup(thermal_quotient)
+        if error <= MAX_PMI_ERROR * k:
+            return float(cooling_parameter) / k
+
+    # Newton iterations from the left, stopped as soon as the iterate no longer increases
+    x = thermal_quotient / a
+    for _ in range(_MAX_ITERATIONS):
+        x_n = x ** (n - 1)
+        step = (thermal_quotient - a * x + b * x_n * x) / (a - n * b * x_n)
+        if not step > 4.0 * _EPSILON * x:
+            break
+        x = min(x + step, 1.0)
+
+    return -math.log(x) / k
+
+
+def _solve_cooling_polynomial_batch(thermal_quotient: np.ndarray, ambient_temperature: np.ndarray) -> np.ndarray:
+    """
+    Vectorized counterpart of the root finding in _solve_post_mortem_interval.
+    Each Newton iteration only updates the rows that have not converged yet.
+
+    Parameters
+    ----------
+    thermal_quotient : np.ndarray
+        Thermal quotients, all in ]0, 1]
+    ambient_temperature : np.ndarray
+        Measured ambient temperatures in °C
+
+    Returns
+    -------
+    np.ndarray
+        Roots x = exp(-k * t) of the cooling polynomials
+    """
+    regime_below_23 = ambient_temperature <= 23
+    a = np.where(regime_below_23, 1.25, 1.11)
+    n = np.where(regime_below_23, 5, 10)
+    b = a - 1.0
+
+    x = np.where(thermal_quotient < 1.0, thermal_quotient / a, 1.0)
+    active = np.flatnonzero(thermal_quotient < 1.0)
+    for _ in range(_MAX_ITERATIONS):
+        if active.size == 0:
+            break
+
+        x_active = x[active]
+        x_n = x_active ** (n[active] - 1)
+        step = (thermal_quotient[active] - a[active] * x_active + b[active] * x_n * x_active) / (a[active] - n[active] * b[active] * x_n)
+        moving = step > 4.0 * _EPSILON * x_active
+
+        active = active[moving]
+        x[active] = np.minimum(x_active[moving] + step[moving], 1.0)
 
+    return x
+
+
+@functools.lru_cache(maxsize=None)
+def _inverse_table(a: float, n: int) -> InverseTable:
+    """
+    Inverse table of the cooling polynomial a * x - (a - 1) * x^n as a function of
+    the cooling parameter u = -ln(x) = k * t, built on first use
+
+    Parameters
+    ----------
+    a : float
+    n : int
+
+    Returns
+    -------
+    InverseTable
+    """
+    b = a - 1.0
+    return InverseTable.build(
+        lambda u: a * np.exp(-u) - b * np.exp(-n * u),
+        lambda u: -a * np.exp(-u) + n * b * np.exp(-n * u),
+        1e-4,
+        16.0
+    )
+
+
+def _lookup_post_mortem_interval_batch(thermal_quotient: np.ndarray, ambient_temperature: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """
+    Reads the post-mortem intervals from the inverse tables of each ambient temperature regime
+
+    Parameters
+    ----------
+    thermal_quotient : np.ndarray
+    ambient_temperature : np.ndarray
+    k : np.ndarray
+        Cooling constants
+
+    Returns
+    -------
+    np.ndarray
+        Post-mortem intervals in hours (NaN where the estimated error of the tables exceeds MAX_PMI_ERROR)
+    """
+    cooling_parameter = np.full(thermal_quotient.shape, np.nan)
+    error = np.full(thermal_quotient.shape, np.inf)
+    regime_below_23 = ambient_temperature <= 23
+    for regime in (regime_below_23, ~regime_below_23):
+        if regime.any():
+            a, n = _cooling_polynomial(ambient_temperature[regime][0])
+            cooling_parameter[regime], error[regime] = _inverse_table(a, n).lookup(thermal_quotient[regime])
+
+    return np.where(error <= MAX_PMI_ERROR * k, cooling_parameter / k, np.nan)
+
+
+def _cooling_constant(body_mass: float) -> float:
+    """
+    Cooling constant k of the Henssge equation (1/h)
+
+    Parameters
+    ----------
+    body_mass : float
+        Body mass in kg (already multiplied by the corrective factor)
+
+    Returns
+    -------
+    float
+    """
+    return (1.2815 / body_mass ** 0.625) - 0.0284
+
+
+def _cooling_polynomial(ambient_temperature: float) -> tuple:
+    """
+    Coefficients (a, n) of the cooling polynomial a * x - (a - 1) * x^n for the ambient temperature regime
+
+    Parameters
+    ----------
+    ambient_temperature : float
+        Measured ambient temperature in °C
+
+    Returns
+    -------
+    tuple
+    """
     if ambient_temperature <= 23:
-        return 1.25 * np.exp(-k * post_mortem_interval) - 0.25 * np.exp(-5 * k * post_mortem_interval)
-    else:
-        return 1.11 * np.exp(-k * post_mortem_interval) - 0.11 * np.exp(-10 * k * post_mortem_interval)
\ No newline at end of file
+        return 1.25, 5
+    return 1.11, 10
+
+
+def temperature_decrease(post_mortem_interval: float, ambient_temperature: float, body_mass: float) -> float:
+    k = _cooling_constant(body_mass)
+    a, n = _cooling_polynomial(ambient_temperature)
+
+    return a * np.exp(-k * post_mortem_interval) - (a - 1) * np.exp(-n * k * post_mortem_interval)
@@ -1,4 +1,7 @@
+from core.computations import spec
+from core.computations.common import lookup_intervals_batch
 from core.constants import IdiomuscularReactionType
+from core.output_batch import PostMortemIntervalBatchResults
 from core.output_results import PostMortemIntervalResults
 
 # Constants
@@ -11,7 +14,10 @@ IDIOMUSCULAR_REACTION_INTERVALS = {
 }
 """Intervals for idiomuscular reactions (in hours ?)"""
 
-NAME = "Idiomuscular Reaction"
+NAME = spec.IDIOMUSCULAR_REACTION_NAME
+
+INPUTS = spec.IDIOMUSCULAR_REACTION_INPUTS
+"""Input parameters read by the computation"""
 
 # Main computation
 def compute(input_parameters) -> PostMortemIntervalResults:
@@ -28,7 +34,23 @@ def compute(input_parameters) -> PostMortemIntervalResults:
     """
 
     _type = input_parameters.idiomuscular_reaction
-    if not _type or _type not in IDIOMUSCULAR_REACTION_INTERVALS or _type == IdiomuscularReactionType.NOT_SPECIFIED:
-        return PostMortemIntervalResults(NAME, error_message="Not Specified")
+    if spec.is_not_specified(_type, IdiomuscularReactionType.NOT_SPECIFIED) or _type not in IDIOMUSCULAR_REACTION_INTERVALS:
+        return PostMortemIntervalResults(NAME, error_message=spec.NOT_SPECIFIED_MESSAGE)
 
     return PostMortemIntervalResults(NAME, IDIOMUSCULAR_REACTION_INTERVALS.get(_type))
+
+
+def compute_batch(idiomuscular_reaction) -> PostMortemIntervalBatchResults:
+    """
+    Vectorized counterpart of compute()
+
+    Parameters
+    ----------
+    idiomuscular_reaction : array_like
+        IdiomuscularReactionType members or codes
+
+    Returns
+    -------
+    PostMortemIntervalBatchResults
+    """
+    return PostMortemIntervalBatchResults(NAME, *lookup_intervals_batch(idiomuscular_reaction, IDIOMUSCULAR_REACTION_INTERVALS, IdiomuscularReactionType))
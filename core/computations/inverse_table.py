@@ -0,0 +1,143 @@
+import numpy as np
+
+# Constants
+MAX_PMI_ERROR = 1.0 / 3600.0
+"""Post-mortem interval error (in hours) tolerated for a table-driven inversion (1 second).
+This is an empirical estimate, not a proven bound: the error is only measured at sample points
+of each interval (see InverseTable.build)"""
+
+_SAFETY_FACTOR = 2.0
+"""Margin applied to the interpolation errors measured when building a table (for the error between the samples)"""
+
+_ERROR_SAMPLES = np.array([0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875])
+"""Relative positions, inside each interval, at which the interpolation error is measured"""
+
+
+class InverseTable:
+
+    # Constructor
+    def __init__(self, data: np.ndarray):
+        """
+        Precomputed inverse of a monotonic cooling curve Q = f(v), answering Q -> v
+        with a binary search followed by a cubic Hermite interpolation.
+
+        The table is indexed by w = -ln(Q), in which the curves of the Henssge methods
+        are close to linear. Each interval carries an estimate of its interpolation error,
+        so that callers can check, query by query, the accuracy they can expect. The estimate
+        is empirical (see build), the error between the sampled points not being bounded.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Array of shape (4, size) whose rows are:
+            - w = -ln(Q) at the nodes (increasing)
+            - v at the nodes
+            - dv/dw at the nodes
+            - estimated interpolation error of the interval starting at each node (last one unused)
+        """
+        self.data = data
+
+    @classmethod
+    def build(cls, function, derivative, start: float, stop: float, size: int = 4096) -> "InverseTable":
+        """
+        Tabulates the inverse of a decreasing function over [start, stop]
+
+        Nodes are spaced quadratically, dense near start where the curves flatten
+        (the inverse having an infinite slope where the derivative vanishes).
+
+        The error of each interval is estimated from the exact function at _ERROR_SAMPLES,
+        the largest one being multiplied by _SAFETY_FACTOR. This is a measurement, not a
+        bound of the cubic Hermite interpolation error.
+
+        Parameters
+        ----------
+        function : callable
+            Vectorized function v -> Q, decreasing and positive on [start, stop]
+        derivative : callable
+            Vectorized derivative of function
+        start : float
+        stop : float
+        size : int
+            Number of nodes
+
+        Returns
+        -------
+        InverseTable
+        """
+        value = start + (stop - start) * np.linspace(0.0, 1.0, size) ** 2
+        thermal_quotient = function(value)
+        data = np.empty((4, size))
+        data[0] = -np.log(thermal_quotient)
+        data[1] = value
+        data[2] = -thermal_quotient / derivative(value)
+        data[3] = 0.0
+        table = cls(data)
+
+        # Estimate the interpolation error inside each interval from samples of the exact function
+        samples = value[:-1, None] + np.diff(value)[:, None] * _ERROR_SAMPLES
+        interpolated, _ = table.lookup(function(samples))
+        data[3, :-1] = _SAFETY_FACTOR * np.max(np.abs(interpolated - samples), axis=1)
+
+        return table
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: str = 'r') -> "InverseTable":
+        """
+        Loads a table saved with save(), memory-mapped by default
+
+        Parameters
+        ----------
+        path : str
+        mmap_mode : str
+            See numpy.load
+
+        Returns
+        -------
+        InverseTable
+        """
+        return cls(np.load(path, mmap_mode=mmap_mode))
+
+    def save(self, path: str) -> None:
+        """
+        Saves the table as a .npy file
+
+        Parameters
+        ----------
+        path : str
+        """
+        np.save(path, self.data)
+
+    def lookup(self, thermal_quotient):
+        """
+        Interpolates v for each thermal quotient
+
+        Parameters
+        ----------
+        thermal_quotient : float or np.ndarray
+
+        Returns
+        -------
+        tuple
+            - Interpolated values (NaN outside the table)
+            - Estimated error of each value (inf outside the table)
+        """
+        w_nodes, value_nodes, slope_nodes, error_estimates = self.data
+
+        # Values outside the table (Q <= 0, Q > 1, NaN) give non-finite intermediates, masked below
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            w = -np.log(thermal_quotient)
+            inside = (w_nodes[0] <= w) & (w <= w_nodes[-1])
+            index = np.clip(np.searchsorted(w_nodes, w, side='right') - 1, 0, len(w_nodes) - 2)
+
+            # Cubic Hermite interpolation on the interval
+            w0, w1 = w_nodes[index], w_nodes[index + 1]
+            step = w1 - w0
+            theta = (w - w0) / step
+            theta_2 = theta * theta
+            theta_3 = theta_2 * theta
+            value = ((2.0 * theta_3 - 3.0 * theta_2 + 1.0) * value_nodes[index]
+                     + (theta_3 - 2.0 * theta_2 + theta) * step * slope_nodes[index]
+                     + (3.0 * theta_2 - 2.0 * theta_3) * value_nodes[index + 1]
+                     + (theta_3 - theta_2) * step * slope_nodes[index + 1])
+
+        return np.where(inside, value, np.nan), np.where(inside, error_estimates[index], np.inf)
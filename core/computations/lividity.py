@@ -1,4 +1,7 @@
+from core.computations import spec
+from core.computations.common import lookup_intervals_batch
 from core.constants import LividityType
+from core.output_batch import PostMortemIntervalBatchResults
 from core.output_results import PostMortemIntervalResults
 
 # Constants
@@ -11,7 +14,10 @@ LIVIDITY_INTERVALS = {
 }
 """Intervals for lividity (in hours ?)"""
 
-NAME = "Lividity"
+NAME = spec.LIVIDITY_NAME
+
+INPUTS = spec.LIVIDITY_INPUTS
+"""Input parameters read by the computation"""
 
 # Main computation
 def compute(input_parameters) -> PostMortemIntervalResults:
@@ -28,7 +34,23 @@ def compute(input_parameters) -> PostMortemIntervalResults:
     """
 
     _type = input_parameters.lividity
-    if not _type or _type not in LIVIDITY_INTERVALS or _type == LividityType.NOT_SPECIFIED:
-        return PostMortemIntervalResults(NAME, error_message="Not Specified")
+    if spec.is_not_specified(_type, LividityType.NOT_SPECIFIED) or _type not in LIVIDITY_INTERVALS:
+        return PostMortemIntervalResults(NAME, error_message=spec.NOT_SPECIFIED_MESSAGE)
 
     return PostMortemIntervalResults(NAME, LIVIDITY_INTERVALS.get(_type))
+
+
+def compute_batch(lividity) -> PostMortemIntervalBatchResults:
+    """
+    Vectorized counterpart of compute()
+
+    Parameters
+    ----------
+    lividity : array_like
+        LividityType members or codes
+
+    Returns
+    -------
+    PostMortemIntervalBatchResults
+    """
+    return PostMortemIntervalBatchResults(NAME, *lookup_intervals_batch(lividity, LIVIDITY_INTERVALS, LividityType))
@@ -1,4 +1,7 @@
+from core.computations import spec
+from core.computations.common import lookup_intervals_batch
 from core.constants import LividityDisappearanceType
+from core.output_batch import PostMortemIntervalBatchResults
 from core.output_results import PostMortemIntervalResults
 
 # Constants
@@ -9,7 +12,10 @@ LIVIDITY_DISAPPEARANCE_INTERVALS = {
 }
 """Intervals for lividity disappearance (in hours ?)"""
 
-NAME = "Lividity Disappearance"
+NAME = spec.LIVIDITY_DISAPPEARANCE_NAME
+
+INPUTS = spec.LIVIDITY_DISAPPEARANCE_INPUTS
+"""Input parameters read by the computation"""
 
 
 # Main computation
@@ -27,7 +33,23 @@ def compute(input_parameters) -> PostMortemIntervalResults:
     """
 
     _type = input_parameters.lividity_disappearance
-    if not _type or _type not in LIVIDITY_DISAPPEARANCE_INTERVALS or _type == LividityDisappearanceType.NOT_SPECIFIED:
-        return PostMortemIntervalResults(NAME, error_message="Not Specified")
+    if spec.is_not_specified(_type, LividityDisappearanceType.NOT_SPECIFIED) or _type not in LIVIDITY_DISAPPEARANCE_INTERVALS:
+        return PostMortemIntervalResults(NAME, error_message=spec.NOT_SPECIFIED_MESSAGE)
 
     return PostMortemIntervalResults(NAME, LIVIDITY_DISAPPEARANCE_INTERVALS.get(_type))
+
+
+def compute_batch(lividity_disappearance) -> PostMortemIntervalBatchResults:
+    """
+    Vectorized counterpart of compute()
+
+    Parameters
+    ----------
+    lividity_disappearance : array_like
+        LividityDisappearanceType members or codes
+
+    Returns
+    -------
+    PostMortemIntervalBatchResults
+    """
+    return PostMortemIntervalBatchResults(NAME, *lookup_intervals_batch(lividity_disappearance, LIVIDITY_DISAPPEARANCE_INTERVALS, LividityDisappearanceType))
@@ -1,4 +1,7 @@
+from core.computations import spec
+from core.computations.common import lookup_intervals_batch
 from core.constants import LividityMobilityType
+from core.output_batch import PostMortemIntervalBatchResults
 from core.output_results import PostMortemIntervalResults
 
 # Constants
@@ -10,7 +13,10 @@ LIVIDITY_MOBILITY_INTERVALS = {
 }
 """Intervals for lividity mobility (in hours ?)"""
 
-NAME = "Lividity Mobility"
+NAME = spec.LIVIDITY_MOBILITY_NAME
+
+INPUTS = spec.LIVIDITY_MOBILITY_INPUTS
+"""Input parameters read by the computation"""
 
 
 # Main computation
@@ -28,7 +34,23 @@ def compute(input_parameters) -> PostMortemIntervalResults:
     """
 
     _type = input_parameters.lividity_mobility
-    if not _type or _type not in LIVIDITY_MOBILITY_INTERVALS or _type == LividityMobilityType.NOT_SPECIFIED:
-        return PostMortemIntervalResults(NAME, error_message="Not Specified")
+    if spec.is_not_specified(_type, LividityMobilityType.NOT_SPECIFIED) or _type not in LIVIDITY_MOBILITY_INTERVALS:
+        return PostMortemIntervalResults(NAME, error_message=spec.NOT_SPECIFIED_MESSAGE)
 
     return PostMortemIntervalResults(NAME, LIVIDITY_MOBILITY_INTERVALS.get(_type))
+
+
+def compute_batch(lividity_mobility) -> PostMortemIntervalBatchResults:
+    """
+    Vectorized counterpart of compute()
+
+    Parameters
+    ----------
+    lividity_mobility : array_like
+        LividityMobilityType members or codes
+
+    Returns
+    -------
+    PostMortemIntervalBatchResults
+    """
+    return PostMortemIntervalBatchResults(NAME, *lookup_intervals_batch(lividity_mobility, LIVIDITY_MOBILITY_INTERVALS, LividityMobilityType))
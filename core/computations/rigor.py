@@ -1,4 +1,7 @@
+from core.computations import spec
+from core.computations.common import lookup_intervals_batch
 from core.constants import RigorType
+from core.output_batch import PostMortemIntervalBatchResults
 from core.output_results import PostMortemIntervalResults
 
 # Constants
@@ -12,7 +15,10 @@ RIGOR_INTERVALS = {
 }
 """Intervals for rigor (in hours ?)"""
 
-NAME = "Rigor"
+NAME = spec.RIGOR_NAME
+
+INPUTS = spec.RIGOR_INPUTS
+"""Input parameters read by the computation"""
 
 
 # Main computation
@@ -30,7 +36,23 @@ def compute(input_parameters) -> PostMortemIntervalResults:
     """
 
     _type = input_parameters.rigor_type
-    if not _type or _type not in RIGOR_INTERVALS or _type == RigorType.NOT_SPECIFIED:
-        return PostMortemIntervalResults(NAME, error_message="Not Specified")
+    if spec.is_not_specified(_type, RigorType.NOT_SPECIFIED) or _type not in RIGOR_INTERVALS:
+        return PostMortemIntervalResults(NAME, error_message=spec.NOT_SPECIFIED_MESSAGE)
 
     return PostMortemIntervalResults(NAME, RIGOR_INTERVALS.get(_type))
+
+
+def compute_batch(rigor_type) -> PostMortemIntervalBatchResults:
+    """
+    Vectorized counterpart of compute()
+
+    Parameters
+    ----------
+    rigor_type : array_like
+        RigorType members or codes
+
+    Returns
+    -------
+    PostMortemIntervalBatchResults
+    """
+    return PostMortemIntervalBatchResults(NAME, *lookup_intervals_batch(rigor_type, RIGOR_INTERVALS, RigorType))
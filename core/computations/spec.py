@@ -0,0 +1,74 @@
+from core.computations.common import error_values
+
+# Constants
+HENSSGE_RECTAL_INPUTS = ("rectal_temperature", "ambient_temperature", "body_mass", "body_condition", "environment", "supporting_base",
+                         "user_corrective_factor")
+"""Input parameters read by the Henssge rectal computation"""
+
+HENSSGE_BRAIN_INPUTS = ("tympanic_temperature", "ambient_temperature")
+"""Input parameters read by the Henssge brain computation"""
+
+BACCINO_INPUTS = ("tympanic_temperature", "ambient_temperature")
+"""Input parameters read by the Baccino computation"""
+
+IDIOMUSCULAR_REACTION_NAME = "Idiomuscular Reaction"
+IDIOMUSCULAR_REACTION_INPUTS = ("idiomuscular_reaction",)
+"""Input parameters read by the idiomuscular reaction computation"""
+
+LIVIDITY_NAME = "Lividity"
+LIVIDITY_INPUTS = ("lividity",)
+"""Input parameters read by the lividity computation"""
+
+LIVIDITY_DISAPPEARANCE_NAME = "Lividity Disappearance"
+LIVIDITY_DISAPPEARANCE_INPUTS = ("lividity_disappearance",)
+"""Input parameters read by the lividity disappearance computation"""
+
+LIVIDITY_MOBILITY_NAME = "Lividity Mobility"
+LIVIDITY_MOBILITY_INPUTS = ("lividity_mobility",)
+"""Input parameters read by the lividity mobility computation"""
+
+RIGOR_NAME = "Rigor"
+RIGOR_INPUTS = ("rigor_type",)
+"""Input parameters read by the rigor computation"""
+
+NOT_SPECIFIED_MESSAGE = "Not Specified"
+"""Error message of a thanatological sign without observation"""
+
+
+def input_error_result(result_type: type, inputs: tuple, input_parameters):
+    """
+    Result of a cooling method when the inputs it reads are not valid, its first check: shared
+    by the computation modules and the registry, which returns it without importing them
+
+    Parameters
+    ----------
+    result_type : type
+        Results class of the method (e.g. BaccinoResults)
+    inputs : tuple
+        Input parameters read by the method
+    input_parameters : ValidatedParameters
+
+    Returns
+    -------
+    object
+        None if the inputs are valid
+    """
+    input_error_code = input_parameters.error_code(inputs)
+    if input_error_code:
+        return result_type(error_code=input_error_code, error_values=error_values(input_error_code, input_parameters))
+    return None
+
+
+def is_not_specified(value, not_specified) -> bool:
+    """
+    Whether a thanatological sign was not observed (absent or NOT_SPECIFIED member), in which case
+    its result is NOT_SPECIFIED_MESSAGE
+
+    Parameters
+    ----------
+    value : Enum
+        Observed sign
+    not_specified : Enum
+        NOT_SPECIFIED member of its enumeration
+    """
+    return not value or value == not_specified
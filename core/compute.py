@@ -1,11 +1,85 @@
 # core/compute.py
 
-from core.computations import henssge_rectal, henssge_brain, baccino, idiomuscular_reaction, lividity, lividity_disappearance, lividity_mobility, rigor
+import numpy as np
+
+from core.cache import ResultCache
+from core.computations.common import determine_corrective_factor_batch, enum_codes
+from core.constants import BODY_MASS_LIMIT, BodyCondition, EnvironmentType, SupportingBase
+from core.input_batch import InputBatch
 from core.input_parameters import InputParameters
+from core.output_batch import ResultBatch
 from core.output_results import OutputResults
+from core.registry import METHODS, select
+from core.validation import validate
 
 
-def run(input_parameters: InputParameters) -> OutputResults:
+def changed_methods(input_parameters: InputParameters, previous_input_parameters: InputParameters, methods=None) -> tuple:
+    """
+    Methods whose results may differ between two sets of input parameters: the ones reading
+    at least one changed input (see registry.Method)
+
+    Parameters
+    ----------
+    input_parameters : InputParameters
+    previous_input_parameters : InputParameters
+    methods : str or iterable of str
+        Names of the methods or groups considered (see registry.select), None for all
+
+    Returns
+    -------
+    tuple
+        Names of the methods
+    """
+    return tuple(name for name in select(methods)
+                 if any(getattr(input_parameters, field) != getattr(previous_input_parameters, field) for field in METHODS[name].inputs))
+
+
+def compute_methods(input_parameters: InputParameters, methods=None, use_inverse_table: bool = False, cache: ResultCache = None,
+                    previous: dict = None) -> dict:
+    """
+    Computes the selected registered methods (see registry.register_method), built-in or not.
+    The module of a method is only imported when its inputs are present and valid, the result
+    of absent inputs being returned without it.
+
+    Parameters
+    ----------
+    input_parameters : InputParameters
+    methods : str or iterable of str
+        Names of the methods or groups to compute (see registry.select), None for all
+    use_inverse_table : bool
+        See run()
+    cache : ResultCache
+        See run()
+    previous : dict
+        Results kept as they are, by method name
+
+    Returns
+    -------
+    dict
+        Result of each selected method, by name, in computation order
+    """
+    input_parameters = validate(input_parameters)
+    options = {"use_inverse_table": use_inverse_table}
+    previous = previous or {}
+
+    def compute(name):
+        if name in previous:
+            return previous[name]
+        method = METHODS[name]
+        if method.absent_result is not None:
+            result = method.absent_result(input_parameters)
+            if result is not None:
+                return result
+        args = tuple(options[option] for option in method.options)
+        if cache is None:
+            return method.module.compute(input_parameters, *args)
+        return cache.compute(method.module, input_parameters, *args)
+
+    return {name: compute(name) for name in select(methods)}
+
+
+def run(input_parameters: InputParameters, use_inverse_table: bool = False, cache: ResultCache = None,
+        previous: OutputResults = None, previous_input_parameters: InputParameters = None, methods=None) -> OutputResults:
     """
     Compute using different methods for estimating the post-mortem interval (PMI).
     It also handles errors and warnings in case of missing or unusable values.
@@ -20,33 +94,148 @@ def run(input_parameters: InputParameters) -> OutputResults:
     - Livor Mortis
     - Disappearance of Livor Mortis
     - Livor Mortis Mobility
+
+    With use_inverse_table, the Henssge methods read the PMI from precomputed inverse tables
+    (estimated accurate within inverse_table.MAX_PMI_ERROR, see inverse_table) instead of solving their equation.
+
+    The computation is re-entrant: it neither changes process-wide state (such as warning
+    filters) nor shares mutable state between calls, so it can be called from several threads.
+
+    With a cache, the result of each method is looked up on the inputs it reads (see ResultCache.key)
+    and only computed on a miss.
+
+    The measured inputs are validated once (see validation.validate) and the result shared by all methods.
+
+    With the previous results and their input parameters (computed with the same use_inverse_table),
+    only the methods reading a changed input are computed again (see changed_methods), the others
+    keeping their previous result.
+
+    With methods (names or groups such as registry.THERMAL, see registry.select), only the selected
+    methods are computed, the others being None. Method modules are imported on first use (see
+    compute_methods). The results of the methods registered besides the built-in ones are in
+    OutputResults.other_results (see OutputResults.get).
     """
+    if previous is not None and previous_input_parameters is None:
+        raise ValueError("The input parameters of the previous results are required")
 
-    results = OutputResults()
+    names = select(methods)
+    reused = {}
+    if previous is not None:
+        changed = changed_methods(input_parameters, previous_input_parameters, names)
+        reused = {name: previous.get(name) for name in names if name not in changed and previous.get(name) is not None}
 
-    # Henssge rectal computation
-    results.henssge_rectal = henssge_rectal.compute(input_parameters)
+    results = compute_methods(input_parameters, names, use_inverse_table, cache, reused)
 
-    # Henssge brain computation
-    results.henssge_brain = henssge_brain.compute(input_parameters)
+    # --- Return
+    built_in = {name: results.pop(name) for name in OutputResults.__slots__ if name in results}
+    return OutputResults(**built_in, other_results=results)
 
-    # Baccino computation
-    results.baccino = baccino.compute(input_parameters)
 
-    # Idiomuscular reaction
-    results.idiomuscular_reaction = idiomuscular_reaction.compute(input_parameters)
+def compute_batch(
+        tympanic_temperature=np.nan,
+        rectal_temperature=np.nan,
+        ambient_temperature=np.nan,
+        body_mass=np.nan,
+        body_condition=None,
+        environment=None,
+        supporting_base=None,
+        user_corrective_factor=np.nan,
+        use_inverse_table: bool = False
+) -> ResultBatch:
+    """
+    Compute the cooling methods (Henssge rectal, Henssge brain and Baccino) for a batch of cases in one vectorized pass.
+    Each row gives the same results as run() on the corresponding InputParameters, errors being reported
+    as an ErrorCode bitmask per row instead of a message.
 
-    # Lividity
-    results.lividity = lividity.compute(input_parameters)
+    Parameters
+    ----------
+    tympanic_temperature : array_like
+        Measured tympanic temperatures (in °C), NaN if absent
+    rectal_temperature : array_like
+        Measured rectal temperatures (in °C), NaN if absent
+    ambient_temperature : array_like
+        Ambient temperatures (in °C), NaN if absent
+    body_mass : array_like
+        Body masses (in kg), NaN if absent
+    body_condition : sequence of BodyCondition
+        Members or their codes (member.value)
+    environment : sequence of EnvironmentType
+        Members or their codes (member.value)
+    supporting_base : sequence of SupportingBase
+        Members or their codes (member.value)
+    user_corrective_factor : array_like
+        Manual corrective factors, NaN if absent
+    use_inverse_table : bool
+        Read the Henssge PMI from precomputed inverse tables, see run()
 
-    # Lividity Disappearance
-    results.lividity_disappearance = lividity_disappearance.compute(input_parameters)
+    All arrays are broadcast together, so a scalar applies to every case.
 
-    # Lividity Mobility
-    results.lividity_mobility = lividity_mobility.compute(input_parameters)
+    Returns
+    -------
+    ResultBatch
+    """
+    from core.computations import henssge_rectal, henssge_brain, baccino
 
-    # Rigor
-    results.rigor = rigor.compute(input_parameters)
+    numeric_columns = [np.atleast_1d(np.asarray(values, dtype=float)) for values in
+                       (tympanic_temperature, rectal_temperature, ambient_temperature, body_mass, user_corrective_factor)]
+    enum_columns = [np.atleast_1d(enum_codes(values, enum_type)) for values, enum_type in
+                    ((body_condition, BodyCondition), (environment, EnvironmentType), (supporting_base, SupportingBase))]
+    shape = np.broadcast_shapes(*(column.shape for column in numeric_columns + enum_columns))
+    tympanic_temperature, rectal_temperature, ambient_temperature, body_mass, user_corrective_factor = (
+        np.broadcast_to(column, shape) for column in numeric_columns
+    )
+    body_condition, environment, supporting_base = (np.broadcast_to(column, shape) for column in enum_columns)
 
-    # --- Return
-    return results
+    # Corrective factor, only determined for the rows with a usable body mass
+    valid_body_mass = (BODY_MASS_LIMIT[0] <= body_mass) & (body_mass <= BODY_MASS_LIMIT[1])
+    corrective_factor = np.where(
+        valid_body_mass,
+        determine_corrective_factor_batch(body_condition, environment, supporting_base, user_corrective_factor,
+                                          np.where(valid_body_mass, body_mass, np.nan)),
+        np.nan
+    )
+
+    return ResultBatch(
+        henssge_rectal.compute_batch(rectal_temperature, ambient_temperature, body_mass, corrective_factor, use_inverse_table),
+        henssge_brain.compute_batch(tympanic_temperature, ambient_temperature, use_inverse_table),
+        baccino.compute_batch(tympanic_temperature, ambient_temperature)
+    )
+
+
+def run_batch(input_batch: InputBatch, use_inverse_table: bool = False) -> ResultBatch:
+    """
+    Compute all methods for all cases of an InputBatch: the cooling methods as compute_batch(),
+    and the thanatological signs from their codes
+
+    Parameters
+    ----------
+    input_batch : InputBatch
+    use_inverse_table : bool
+
+    Returns
+    -------
+    ResultBatch
+    """
+    from core.computations import idiomuscular_reaction, lividity, lividity_disappearance, lividity_mobility, rigor
+
+    results = compute_batch(
+        tympanic_temperature=input_batch.tympanic_temperature,
+        rectal_temperature=input_batch.rectal_temperature,
+        ambient_temperature=input_batch.ambient_temperature,
+        body_mass=input_batch.body_mass,
+        body_condition=input_batch.body_condition,
+        environment=input_batch.environment,
+        supporting_base=input_batch.supporting_base,
+        user_corrective_factor=input_batch.user_corrective_factor,
+        use_inverse_table=use_inverse_table
+    )
+    return ResultBatch(
+        results.henssge_rectal,
+        results.henssge_brain,
+        results.baccino,
+        idiomuscular_reaction=idiomuscular_reaction.compute_batch(input_batch.idiomuscular_reaction),
+        rigor=rigor.compute_batch(input_batch.rigor_type),
+        lividity=lividity.compute_batch(input_batch.lividity),
+        lividity_disappearance=lividity_disappearance.compute_batch(input_batch.lividity_disappearance),
+        lividity_mobility=lividity_mobility.compute_batch(input_batch.lividity_mobility)
+    )
@@ -1,6 +1,7 @@
 # core/constants.py
 
-from enum import Enum, auto
+from enum import Enum, IntFlag, auto
+from typing import Optional
 
 
 # --- Enumerations
@@ -309,6 +310,78 @@ class LividityMobilityType(Enum):
         return str(self.value)
 
 
+class ErrorCode(IntFlag):
+    """Reasons for which a computation could not be performed (combinable as a bitmask)"""
+
+    NONE = 0
+    """No error"""
+
+    TYMPANIC_TEMPERATURE_MISSING = auto()
+    """Tympanic temperature is absent"""
+
+    TYMPANIC_TEMPERATURE_OUT_OF_RANGE = auto()
+    """Tympanic temperature is outside the temperature limits"""
+
+    RECTAL_TEMPERATURE_MISSING = auto()
+    """Rectal temperature is absent"""
+
+    RECTAL_TEMPERATURE_OUT_OF_RANGE = auto()
+    """Rectal temperature is outside the temperature limits"""
+
+    AMBIENT_TEMPERATURE_MISSING = auto()
+    """Ambient temperature is absent"""
+
+    AMBIENT_TEMPERATURE_OUT_OF_RANGE = auto()
+    """Ambient temperature is outside the temperature limits"""
+
+    BODY_MASS_MISSING = auto()
+    """Body mass is absent"""
+
+    BODY_MASS_OUT_OF_RANGE = auto()
+    """Body mass is outside the body mass limits"""
+
+    NO_SOLUTION = auto()
+    """The cooling equation has no solution for the measured temperatures (e.g. a thermal quotient outside ]0, 1],
+    formerly reported as a convergence error)"""
+
+    NO_CONVERGENCE = auto()
+    """The equation solver did not converge"""
+
+    OUT_OF_VALIDITY_RANGE = auto()
+    """The estimated PMI is beyond the validity range of the method"""
+
+    TYMPANIC_TEMPERATURE_TOO_HIGH = auto()
+    """Tympanic temperature is not below 37°C"""
+
+    TYMPANIC_BELOW_AMBIENT = auto()
+    """Tympanic temperature is not above the ambient temperature"""
+
+    def describe(self, error_values: tuple = ()) -> Optional[str]:
+        """
+        Human readable message of each error of the bitmask, one per line (None without error).
+        Messages are only rendered here, validations and results just carry the ErrorCode.
+
+        Parameters
+        ----------
+        error_values : tuple
+            (name, value) pairs of the values quoted by the detailed messages (see DETAILED_ERROR_MESSAGES),
+            the generic message being used for the errors without such value
+        """
+        if not self:
+            return None
+
+        messages = []
+        for error in ERROR_MESSAGES:
+            if error in self:
+                message = ERROR_MESSAGES[error]
+                for name, value in error_values:
+                    if (error, name) in DETAILED_ERROR_MESSAGES:
+                        message = DETAILED_ERROR_MESSAGES[error, name].format(value=value)
+                        break
+                messages.append(message)
+        return "\n".join(messages)
+
+
 # --- Constants
 # --------------------------------
 
@@ -325,6 +398,41 @@ STANDARD_BODY_TEMPERATURE = 37.2
 BODY_MASS_LIMIT = (1.0, 200.0)
 """Body mass limit in Kg"""
 
+ERROR_MESSAGES = {
+    ErrorCode.TYMPANIC_TEMPERATURE_MISSING: "The tympanic temperature is absent and must be between {0}°C and {1}°C.".format(*TEMPERATURE_LIMITS[TemperatureLimitsType.TYMPANIC]),
+    ErrorCode.TYMPANIC_TEMPERATURE_OUT_OF_RANGE: "The tympanic temperature is not valid and must be between {0}°C and {1}°C.".format(*TEMPERATURE_LIMITS[TemperatureLimitsType.TYMPANIC]),
+    ErrorCode.AMBIENT_TEMPERATURE_MISSING: "The ambient temperature is absent and must be between {0}°C and {1}°C.".format(*TEMPERATURE_LIMITS[TemperatureLimitsType.AMBIENT]),
+    ErrorCode.AMBIENT_TEMPERATURE_OUT_OF_RANGE: "The ambient temperature is not valid and must be between {0}°C and {1}°C.".format(*TEMPERATURE_LIMITS[TemperatureLimitsType.AMBIENT]),
+    ErrorCode.RECTAL_TEMPERATURE_MISSING: "The rectal temperature is absent and must be between {0}°C and {1}°C.".format(*TEMPERATURE_LIMITS[TemperatureLimitsType.RECTAL]),
+    ErrorCode.RECTAL_TEMPERATURE_OUT_OF_RANGE: "The rectal temperature is not valid and must be between {0}°C and {1}°C.".format(*TEMPERATURE_LIMITS[TemperatureLimitsType.RECTAL]),
+    ErrorCode.BODY_MASS_MISSING: "The body mass is absent and must be between {0}kg and {1}kg.".format(*BODY_MASS_LIMIT),
+    ErrorCode.BODY_MASS_OUT_OF_RANGE: "The body mass is not valid and must be between {0}kg and {1}kg.".format(*BODY_MASS_LIMIT),
+    ErrorCode.NO_SOLUTION: "No solution: the cooling equation has no solution for the measured temperatures.",
+    ErrorCode.NO_CONVERGENCE: "Convergence error",
+    ErrorCode.OUT_OF_VALIDITY_RANGE: "Error: The method becomes less accurate beyond 13.5 hours",
+    ErrorCode.TYMPANIC_TEMPERATURE_TOO_HIGH: "The tympanic temperature must be less than 37°C.",
+    ErrorCode.TYMPANIC_BELOW_AMBIENT: "Tympanic temperature must be greater than ambient temperature.",
+}
+"""Generic message of each error, in display order: the order of the checks before the error codes (see ErrorCode.describe)"""
+
+DETAILED_ERROR_MESSAGES = {
+    (ErrorCode.TYMPANIC_TEMPERATURE_OUT_OF_RANGE, "tympanic_temperature"): "The tympanic temperature ({{value}}°C) is not valid and must be between {0}°C and {1}°C.".format(*TEMPERATURE_LIMITS[TemperatureLimitsType.TYMPANIC]),
+    (ErrorCode.RECTAL_TEMPERATURE_OUT_OF_RANGE, "rectal_temperature"): "The rectal temperature ({{value}}°C) is not valid and must be between {0}°C and {1}°C.".format(*TEMPERATURE_LIMITS[TemperatureLimitsType.RECTAL]),
+    (ErrorCode.AMBIENT_TEMPERATURE_OUT_OF_RANGE, "ambient_temperature"): "The ambient temperature ({{value}}°C) is not valid and must be between {0}°C and {1}°C.".format(*TEMPERATURE_LIMITS[TemperatureLimitsType.AMBIENT]),
+    (ErrorCode.BODY_MASS_OUT_OF_RANGE, "body_mass"): "The body mass ({{value}}kg) is not valid and must be between {0}kg and {1}kg.".format(*BODY_MASS_LIMIT),
+    (ErrorCode.NO_SOLUTION, "thermal_quotient"): "No solution: the thermal quotient (Q = {value:.2f}) must be between 0 and 1.",
+    (ErrorCode.NO_SOLUTION, "corrected_body_mass"): "No solution: the corrected body mass ({value:.1f}kg) is outside the range of the Henssge equation.",
+}
+"""Message of an error quoting a value, keyed by error and value name (see ErrorCode.describe)"""
+
+ERROR_INPUTS = {
+    ErrorCode.TYMPANIC_TEMPERATURE_OUT_OF_RANGE: "tympanic_temperature",
+    ErrorCode.RECTAL_TEMPERATURE_OUT_OF_RANGE: "rectal_temperature",
+    ErrorCode.AMBIENT_TEMPERATURE_OUT_OF_RANGE: "ambient_temperature",
+    ErrorCode.BODY_MASS_OUT_OF_RANGE: "body_mass",
+}
+"""Input parameter quoted in the message of each input error"""
+
 CORRECTIVE_FACTOR = {
     BodyCondition.NOT_SPECIFIED: {
         EnvironmentType.NOT_SPECIFIED: 1.0,
@@ -0,0 +1,144 @@
+# core/input_batch.py
+
+import functools
+
+import numpy as np
+
+from core.computations.common import enum_codes
+from core.constants import IdiomuscularReactionType, RigorType, LividityType, LividityDisappearanceType, \
+    LividityMobilityType, BodyCondition, EnvironmentType, SupportingBase
+from core.input_parameters import InputParameters
+
+# Constants
+NUMERIC_COLUMNS = ("tympanic_temperature", "rectal_temperature", "ambient_temperature", "body_mass", "user_corrective_factor")
+"""Float columns (NaN if absent)"""
+
+ENUM_COLUMNS = {
+    "body_condition": BodyCondition,
+    "environment": EnvironmentType,
+    "supporting_base": SupportingBase,
+    "idiomuscular_reaction": IdiomuscularReactionType,
+    "rigor_type": RigorType,
+    "lividity": LividityType,
+    "lividity_disappearance": LividityDisappearanceType,
+    "lividity_mobility": LividityMobilityType,
+}
+"""Enumeration code columns (member.value, 0 if absent) and their enumeration"""
+
+CODE_DTYPE = np.int8
+"""Type of the enumeration code columns"""
+
+
+class InputBatch:
+
+    # Constructor
+    def __init__(self, size: int = None, **columns):
+        """
+        Columnar counterpart of InputParameters for many cases: float64 columns for the measures
+        and small integer codes for the enumerations, about 48 bytes per case.
+
+        Parameters
+        ----------
+        size : int
+            Number of cases, required only when no column is given
+        columns : array_like
+            Columns named as the InputParameters members (see NUMERIC_COLUMNS and ENUM_COLUMNS).
+            Enumerations are given as members or codes. Missing columns are absent for every case,
+            and scalars apply to every case.
+        """
+        unknown_columns = set(columns) - set(NUMERIC_COLUMNS) - set(ENUM_COLUMNS)
+        if unknown_columns:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown_columns))}")
+
+        arrays = {name: np.asarray(values, dtype=float) for name, values in columns.items() if name in NUMERIC_COLUMNS}
+        arrays.update({name: enum_codes(values, ENUM_COLUMNS[name]).astype(CODE_DTYPE) for name, values in columns.items() if name in ENUM_COLUMNS})
+        shape = np.broadcast_shapes(*(np.shape(array) for array in arrays.values()), () if size is None else (size,))
+        if len(shape) != 1:
+            raise ValueError("The columns must be one-dimensional")
+
+        for name in NUMERIC_COLUMNS:
+            setattr(self, name, np.array(np.broadcast_to(arrays.get(name, np.nan), shape), dtype=float))
+        for name in ENUM_COLUMNS:
+            setattr(self, name, np.array(np.broadcast_to(arrays.get(name, 0), shape), dtype=CODE_DTYPE))
+
+    def __len__(self):
+        return len(self.tympanic_temperature)
+
+    def __getitem__(self, index):
+        """
+        InputParameters of a case for an integer index, batch of the selected cases otherwise
+        (slice, integer array or boolean mask)
+        """
+        if isinstance(index, (int, np.integer)):
+            return self.input_parameters(index)
+        return InputBatch(**{name: getattr(self, name)[index] for name in self.columns()})
+
+    @staticmethod
+    def columns() -> tuple:
+        """Names of all columns"""
+        return NUMERIC_COLUMNS + tuple(ENUM_COLUMNS)
+
+    def input_parameters(self, index: int) -> InputParameters:
+        """
+        Parameters
+        ----------
+        index : int
+
+        Returns
+        -------
+        InputParameters
+            Scalar parameters of a case (None for absent values)
+        """
+        values = {}
+        for name in NUMERIC_COLUMNS:
+            value = float(getattr(self, name)[index])
+            values[name] = None if np.isnan(value) else value
+        for name, enum_type in ENUM_COLUMNS.items():
+            values[name] = _members(enum_type)[getattr(self, name)[index]]
+        return InputParameters(**values)
+
+    def to_input_parameters(self) -> list:
+        """
+        Returns
+        -------
+        list
+            InputParameters of each case
+        """
+        return [self.input_parameters(i) for i in range(len(self))]
+
+    @classmethod
+    def from_input_parameters(cls, input_parameters: list) -> "InputBatch":
+        """
+        Builds a batch from scalar parameters (None values becoming NaN or code 0)
+
+        Parameters
+        ----------
+        input_parameters : list of InputParameters
+        """
+        columns = {
+            name: [np.nan if getattr(parameters, name) is None else getattr(parameters, name) for parameters in input_parameters]
+            for name in NUMERIC_COLUMNS
+        }
+        columns.update({name: [getattr(parameters, name) for parameters in input_parameters] for name in ENUM_COLUMNS})
+        return cls(len(input_parameters), **columns)
+
+    @classmethod
+    def concatenate(cls, batches: list) -> "InputBatch":
+        """
+        Concatenates the cases of several batches
+
+        Parameters
+        ----------
+        batches : list of InputBatch
+        """
+        return cls(sum(len(batch) for batch in batches),
+                   **{name: np.concatenate([getattr(batch, name) for batch in batches]) for name in cls.columns()})
+
+
+@functools.cache
+def _members(enum_type) -> list:
+    # Enumeration members indexed by code (None for code 0 and unused codes)
+    members = [None] * (max(member.value for member in enum_type) + 1)
+    for member in enum_type:
+        members[member.value] = member
+    return members
@@ -2,9 +2,13 @@
 
 from core.constants import IdiomuscularReactionType, RigorType, LividityType, LividityDisappearanceType, \
     LividityMobilityType, BodyCondition, EnvironmentType, SupportingBase
+from core.value_object import ValueObject
 
 
-class InputParameters:
+class InputParameters(ValueObject):
+    __slots__ = ("tympanic_temperature", "rectal_temperature", "ambient_temperature", "body_mass", "body_condition",
+                 "environment", "supporting_base", "idiomuscular_reaction", "rigor_type", "lividity",
+                 "lividity_disappearance", "lividity_mobility", "user_corrective_factor")
 
     # Constructor
     def __init__(
@@ -24,7 +28,8 @@ class InputParameters:
             user_corrective_factor: float = None
     ):
         """
-        Object encapsulating all inputs parameters needed by the core computation
+        Immutable object encapsulating all inputs parameters needed by the core computation,
+        hashable by value (see ValueObject)
         
         Parameters
         ----------
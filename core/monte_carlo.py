@@ -0,0 +1,229 @@
+# core/monte_carlo.py
+
+import numpy as np
+
+from core import compute
+from core.input_parameters import InputParameters
+
+# Constants
+SAMPLED_PARAMETERS = ("tympanic_temperature", "rectal_temperature", "ambient_temperature", "body_mass", "user_corrective_factor")
+"""Input parameters that can be given an uncertainty"""
+
+
+class Fixed:
+
+    # Constructor
+    def __init__(self, value: float):
+        """
+        Exact value (no uncertainty)
+
+        Parameters
+        ----------
+        value : float
+        """
+        self.value = value
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return np.full(size, self.value, dtype=float)
+
+
+class Normal:
+
+    # Constructor
+    def __init__(self, mean: float, standard_deviation: float):
+        """
+        Normally distributed value
+
+        Parameters
+        ----------
+        mean : float
+        standard_deviation : float
+        """
+        self.mean = mean
+        self.standard_deviation = standard_deviation
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.normal(self.mean, self.standard_deviation, size)
+
+
+class Uniform:
+
+    # Constructor
+    def __init__(self, low: float, high: float):
+        """
+        Value uniformly distributed over [low, high[
+
+        Parameters
+        ----------
+        low : float
+        high : float
+        """
+        self.low = low
+        self.high = high
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return rng.uniform(self.low, self.high, size)
+
+
+class PostMortemIntervalDistribution:
+
+    # Constructor
+    def __init__(self, post_mortem_interval: np.ndarray, samples: int, percentiles: tuple, bins: int):
+        """
+        Distribution of the post-mortem intervals (in hours) obtained by one method
+
+        Parameters
+        ----------
+        post_mortem_interval : np.ndarray
+            PMI of the samples having a solution
+        samples : int
+            Total number of samples, with or without solution
+        percentiles : tuple
+            Percentiles to compute, in [0, 100]
+        bins : int
+            Number of histogram bins
+        """
+        # Fraction of the samples having a solution
+        self.valid_fraction = len(post_mortem_interval) / samples if samples else 0.0
+
+        # Statistics, the histogram being (counts, bin edges in hours) as returned by numpy.histogram
+        if len(post_mortem_interval):
+            self.mean = float(np.mean(post_mortem_interval))
+            self.percentiles = dict(zip(percentiles, np.percentile(post_mortem_interval, percentiles).tolist()))
+            self.histogram = np.histogram(post_mortem_interval, bins)
+        else:
+            self.mean = np.nan
+            self.percentiles = {percentile: np.nan for percentile in percentiles}
+            self.histogram = (np.zeros(bins, dtype=np.int64), np.full(bins + 1, np.nan))
+
+    def __str__(self):
+        # Display results as string
+        percentiles = ", ".join(f"P{percentile:g}: {value:.2f} h" for percentile, value in self.percentiles.items())
+        return f"Mean: {self.mean:.2f} h ({percentiles}), valid samples: {100 * self.valid_fraction:.1f} %"
+
+
+class MonteCarloResults:
+
+    # Constructor
+    def __init__(
+            self,
+            henssge_rectal: PostMortemIntervalDistribution,
+            henssge_brain: PostMortemIntervalDistribution,
+            baccino_interval: PostMortemIntervalDistribution,
+            baccino_global: PostMortemIntervalDistribution,
+            samples: int,
+            seed: int = None
+    ):
+        """
+        PMI distributions of the cooling methods under input uncertainty
+
+        Parameters
+        ----------
+        henssge_rectal : PostMortemIntervalDistribution
+        henssge_brain : PostMortemIntervalDistribution
+        baccino_interval : PostMortemIntervalDistribution
+        baccino_global : PostMortemIntervalDistribution
+        samples : int
+            Number of samples drawn
+        seed : int
+            Seed of the random generator
+        """
+        self.henssge_rectal = henssge_rectal
+        self.henssge_brain = henssge_brain
+        self.baccino_interval = baccino_interval
+        self.baccino_global = baccino_global
+        self.samples = samples
+        self.seed = seed
+
+    def __str__(self):
+        """
+        Display results as string
+        """
+        return "\n".join([
+            f"**Monte Carlo ({self.samples} samples):**",
+            f"- Henssge Rectal: {self.henssge_rectal}",
+            f"- Henssge Brain: {self.henssge_brain}",
+            f"- Baccino Interval Method: {self.baccino_interval}",
+            f"- Baccino Global Method: {self.baccino_global}",
+        ])
+
+
+def run(
+        input_parameters: InputParameters,
+        uncertainties: dict = None,
+        samples: int = 1_000_000,
+        seed: int = None,
+        percentiles: tuple = (2.5, 50.0, 97.5),
+        bins: int = 100,
+        use_inverse_table: bool = True
+) -> MonteCarloResults:
+    """
+    Propagates the measurement uncertainties to the PMI of the cooling methods (Henssge rectal,
+    Henssge brain and Baccino): the uncertain inputs are sampled from their distributions, and
+    all samples go through the vectorized computations at once (see compute.compute_batch).
+
+    Parameters
+    ----------
+    input_parameters : InputParameters
+        Measured values, used as is for the parameters without uncertainty
+    uncertainties : dict
+        Distribution (Fixed, Normal, Uniform or any object with a sample(rng, size) method) of each
+        uncertain parameter, keyed by name (see SAMPLED_PARAMETERS). Samples outside the limits of a
+        method have no solution and are left out of its distribution (see valid_fraction).
+    samples : int
+        Number of samples
+    seed : int
+        Seed of the random generator, for reproducible results
+    percentiles : tuple
+        Percentiles of the PMI to compute, in [0, 100]
+    bins : int
+        Number of histogram bins
+    use_inverse_table : bool
+        Read the Henssge PMI from the precomputed inverse tables (estimated within inverse_table.MAX_PMI_ERROR,
+        far below any sampled spread), see compute.run
+
+    Returns
+    -------
+    MonteCarloResults
+    """
+
+    # Input verifications
+    uncertainties = uncertainties or {}
+    unknown_parameters = set(uncertainties) - set(SAMPLED_PARAMETERS)
+    if unknown_parameters:
+        raise ValueError(f"No uncertainty can be given to: {', '.join(sorted(unknown_parameters))}")
+
+    # Sampling
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name in SAMPLED_PARAMETERS:
+        distribution = uncertainties.get(name)
+        if distribution is None:
+            value = getattr(input_parameters, name)
+            columns[name] = np.nan if value is None else value
+        elif isinstance(distribution, (int, float)):
+            columns[name] = Fixed(distribution).sample(rng, samples)
+        else:
+            columns[name] = distribution.sample(rng, samples)
+
+    # Main computation
+    batch = compute.compute_batch(
+        body_condition=input_parameters.body_condition,
+        environment=input_parameters.environment,
+        supporting_base=input_parameters.supporting_base,
+        use_inverse_table=use_inverse_table,
+        **columns
+    )
+
+    def distribution_of(post_mortem_interval: np.ndarray, error_code: np.ndarray) -> PostMortemIntervalDistribution:
+        post_mortem_interval = np.broadcast_to(post_mortem_interval, samples)[np.broadcast_to(error_code, samples) == 0]
+        return PostMortemIntervalDistribution(post_mortem_interval, samples, percentiles, bins)
+
+    return MonteCarloResults(
+        distribution_of(batch.henssge_rectal.post_mortem_interval, batch.henssge_rectal.error_code),
+        distribution_of(batch.henssge_brain.post_mortem_interval, batch.henssge_brain.error_code),
+        distribution_of(batch.baccino.post_mortem_interval_interval, batch.baccino.error_code),
+        distribution_of(batch.baccino.post_mortem_interval_global, batch.baccino.error_code),
+        samples,
+        seed
+    )
@@ -0,0 +1,404 @@
+# core/output_batch.py
+
+import numpy as np
+
+from core.constants import ErrorCode
+from core.output_results import HenssgeRectalResults, HenssgeBrainResults, BaccinoResults, PostMortemIntervalResults, OutputResults
+
+
+class _BatchResults:
+    """
+    Columnar counterpart of a scalar result class: one array per constructor argument
+    (_COLUMNS, in order), the last one being the error_code column.
+    Rows can be sliced, concatenated, and converted from and to the scalar results.
+    """
+
+    _COLUMNS = ()
+    """Names of the columns, in constructor order"""
+
+    _RESULT_CLASS = None
+    """Scalar result class of a row"""
+
+    def __len__(self):
+        return len(self.error_code)
+
+    def __getitem__(self, index):
+        """
+        Scalar result of a row for an integer index, batch of the selected rows otherwise
+        (slice, integer array or boolean mask)
+        """
+        if isinstance(index, (int, np.integer)):
+            return self.result(index)
+        return type(self)(*(getattr(self, column)[index] for column in self._COLUMNS))
+
+    def result(self, index: int):
+        """
+        Scalar result of a row (its error message being rendered from its error code when displayed)
+
+        Parameters
+        ----------
+        index : int
+
+        Returns
+        -------
+        Instance of _RESULT_CLASS
+        """
+        error_code = ErrorCode(int(self.error_code[index]))
+        if error_code:
+            return self._RESULT_CLASS(error_code=error_code)
+        return self._RESULT_CLASS(*(float(getattr(self, column)[index]) for column in self._COLUMNS[:-1]))
+
+    def has_error(self, error_code: ErrorCode = None) -> np.ndarray:
+        """
+        Boolean mask of the rows failing for any of the given reasons, e.g.
+        batch[batch.has_error(ErrorCode.NO_SOLUTION | ErrorCode.NO_CONVERGENCE)]
+
+        Parameters
+        ----------
+        error_code : ErrorCode
+            Reasons to look for (bitmask), None for any reason
+
+        Returns
+        -------
+        np.ndarray
+        """
+        if error_code is None:
+            return self.error_code != ErrorCode.NONE
+        return (self.error_code & int(error_code)) != 0
+
+    def to_results(self) -> list:
+        """
+        Returns
+        -------
+        list
+            Scalar result of each row
+        """
+        return [self.result(i) for i in range(len(self))]
+
+    @classmethod
+    def from_results(cls, results: list):
+        """
+        Builds a batch from scalar results (None values becoming NaN)
+
+        Parameters
+        ----------
+        results : list
+            Instances of _RESULT_CLASS
+        """
+        columns = [
+            np.array([np.nan if getattr(result, column) is None else getattr(result, column) for result in results], dtype=float)
+            for column in cls._COLUMNS[:-1]
+        ]
+        return cls(*columns, np.array([int(result.error_code) for result in results], dtype=np.int64))
+
+    @classmethod
+    def concatenate(cls, batches: list):
+        """
+        Concatenates the rows of several batches
+
+        Parameters
+        ----------
+        batches : list
+        """
+        return cls(*(np.concatenate([getattr(batch, column) for batch in batches]) for column in cls._COLUMNS))
+
+
+class HenssgeRectalBatchResults(_BatchResults):
+
+    _COLUMNS = ("post_mortem_interval", "confidence_interval", "thermal_quotient", "corrective_factor", "error_code")
+    _RESULT_CLASS = HenssgeRectalResults
+
+    # Constructor
+    def __init__(
+            self,
+            post_mortem_interval: np.ndarray,
+            confidence_interval: np.ndarray,
+            thermal_quotient: np.ndarray,
+            corrective_factor: np.ndarray,
+            error_code: np.ndarray
+    ):
+        """
+        Arrays of Henssge rectal output results, one row per case (NaN on rows in error)
+
+        Parameters
+        ----------
+        post_mortem_interval : np.ndarray
+            in hours
+
+        confidence_interval : np.ndarray
+            in hours
+
+        thermal_quotient : np.ndarray
+        corrective_factor : np.ndarray
+        error_code : np.ndarray
+            ErrorCode bitmask of each row (0 on success)
+        """
+        self.post_mortem_interval = post_mortem_interval
+        self.confidence_interval = confidence_interval
+        self.thermal_quotient = thermal_quotient
+        self.corrective_factor = corrective_factor
+        self.error_code = error_code
+
+
+class HenssgeBrainBatchResults(_BatchResults):
+
+    _COLUMNS = ("post_mortem_interval", "confidence_interval", "error_code")
+    _RESULT_CLASS = HenssgeBrainResults
+
+    # Constructor
+    def __init__(
+            self,
+            post_mortem_interval: np.ndarray,
+            confidence_interval: np.ndarray,
+            error_code: np.ndarray
+    ):
+        """
+        Arrays of Henssge brain output results, one row per case (NaN on rows in error)
+
+        Parameters
+        ----------
+        post_mortem_interval : np.ndarray
+            in hours
+
+        confidence_interval : np.ndarray
+            in hours
+
+        error_code : np.ndarray
+            ErrorCode bitmask of each row (0 on success)
+        """
+        self.post_mortem_interval = post_mortem_interval
+        self.confidence_interval = confidence_interval
+        self.error_code = error_code
+
+
+class BaccinoBatchResults(_BatchResults):
+
+    _COLUMNS = ("post_mortem_interval_interval", "post_mortem_interval_global", "confidence_interval_interval", "confidence_interval_global",
+                "error_code")
+    _RESULT_CLASS = BaccinoResults
+
+    # Constructor
+    def __init__(
+            self,
+            post_mortem_interval_interval: np.ndarray,
+            post_mortem_interval_global: np.ndarray,
+            confidence_interval_interval: np.ndarray,
+            confidence_interval_global: np.ndarray,
+            error_code: np.ndarray
+    ):
+        """
+        Arrays of Baccino output results, one row per case (NaN on rows in error)
+
+        Parameters
+        ----------
+        post_mortem_interval_interval : np.ndarray
+            in hours
+
+        post_mortem_interval_global : np.ndarray
+            in hours
+
+        confidence_interval_interval : np.ndarray
+            in hours
+
+        confidence_interval_global : np.ndarray
+            in hours
+
+        error_code : np.ndarray
+            ErrorCode bitmask of each row (0 on success)
+        """
+        self.post_mortem_interval_interval = post_mortem_interval_interval
+        self.post_mortem_interval_global = post_mortem_interval_global
+        self.confidence_interval_interval = confidence_interval_interval
+        self.confidence_interval_global = confidence_interval_global
+        self.error_code = error_code
+
+
+class PostMortemIntervalBatchResults:
+
+    # Constructor
+    def __init__(self, name: str, min: np.ndarray, max: np.ndarray):
+        """
+        Arrays of the PMI intervals of a thanatological sign, one row per case
+        (NaN on rows where the sign is not specified)
+
+        Parameters
+        ----------
+        name : str
+            Name of the sign
+        min : np.ndarray
+            in hours
+        max : np.ndarray
+            in hours
+        """
+        self.name = name
+        self.min = min
+        self.max = max
+
+    def __len__(self):
+        return len(self.min)
+
+    def __getitem__(self, index):
+        """
+        PostMortemIntervalResults of a row for an integer index, batch of the selected rows otherwise
+        """
+        if isinstance(index, (int, np.integer)):
+            return self.result(index)
+        return PostMortemIntervalBatchResults(self.name, self.min[index], self.max[index])
+
+    def result(self, index: int) -> PostMortemIntervalResults:
+        """
+        Scalar result of a row ("Not Specified" error where the sign is not specified)
+
+        Parameters
+        ----------
+        index : int
+        """
+        if np.isnan(self.min[index]):
+            return PostMortemIntervalResults(self.name, error_message="Not Specified")
+        return PostMortemIntervalResults(self.name, (float(self.min[index]), float(self.max[index])))
+
+    def to_results(self) -> list:
+        """
+        Returns
+        -------
+        list
+            PostMortemIntervalResults of each row
+        """
+        return [self.result(i) for i in range(len(self))]
+
+    @classmethod
+    def from_results(cls, name: str, results: list) -> "PostMortemIntervalBatchResults":
+        """
+        Builds a batch from scalar results, results in error (or None) being not specified
+
+        Parameters
+        ----------
+        name : str
+        results : list of PostMortemIntervalResults
+        """
+        valid = [result is not None and not result.error_message for result in results]
+        return cls(
+            name,
+            np.array([result.min if is_valid else np.nan for result, is_valid in zip(results, valid)], dtype=float),
+            np.array([result.max if is_valid else np.nan for result, is_valid in zip(results, valid)], dtype=float)
+        )
+
+    @classmethod
+    def concatenate(cls, batches: list) -> "PostMortemIntervalBatchResults":
+        """
+        Concatenates the rows of several batches of the same sign
+
+        Parameters
+        ----------
+        batches : list of PostMortemIntervalBatchResults
+        """
+        return cls(batches[0].name, np.concatenate([batch.min for batch in batches]), np.concatenate([batch.max for batch in batches]))
+
+
+SIGNS = ("idiomuscular_reaction", "rigor", "lividity", "lividity_disappearance", "lividity_mobility")
+"""OutputResults members of the thanatological signs"""
+
+
+class ResultBatch:
+
+    # Constructor
+    def __init__(
+            self,
+            henssge_rectal: HenssgeRectalBatchResults,
+            henssge_brain: HenssgeBrainBatchResults,
+            baccino: BaccinoBatchResults,
+            idiomuscular_reaction: PostMortemIntervalBatchResults = None,
+            rigor: PostMortemIntervalBatchResults = None,
+            lividity: PostMortemIntervalBatchResults = None,
+            lividity_disappearance: PostMortemIntervalBatchResults = None,
+            lividity_mobility: PostMortemIntervalBatchResults = None
+    ):
+        """
+        Results of the methods for a batch of cases, the thanatological signs being
+        None when they were not computed (see compute.compute_batch and compute.run_batch)
+
+        Parameters
+        ----------
+        henssge_rectal : HenssgeRectalBatchResults
+        henssge_brain : HenssgeBrainBatchResults
+        baccino : BaccinoBatchResults
+        idiomuscular_reaction : PostMortemIntervalBatchResults
+        rigor : PostMortemIntervalBatchResults
+        lividity : PostMortemIntervalBatchResults
+        lividity_disappearance : PostMortemIntervalBatchResults
+        lividity_mobility : PostMortemIntervalBatchResults
+        """
+        self.henssge_rectal = henssge_rectal
+        self.henssge_brain = henssge_brain
+        self.baccino = baccino
+        self.idiomuscular_reaction = idiomuscular_reaction
+        self.rigor = rigor
+        self.lividity = lividity
+        self.lividity_disappearance = lividity_disappearance
+        self.lividity_mobility = lividity_mobility
+
+    def __len__(self):
+        return len(self.henssge_rectal)
+
+    def __getitem__(self, index):
+        """
+        OutputResults of a case for an integer index (signs not computed being None),
+        batch of the selected cases otherwise (slice, integer array or boolean mask)
+        """
+        signs = {name: None if getattr(self, name) is None else getattr(self, name)[index] for name in SIGNS}
+        if isinstance(index, (int, np.integer)):
+            return OutputResults(henssge_rectal=self.henssge_rectal[index], henssge_brain=self.henssge_brain[index],
+                                 baccino=self.baccino[index], **signs)
+        return ResultBatch(self.henssge_rectal[index], self.henssge_brain[index], self.baccino[index], **signs)
+
+    def to_results(self) -> list:
+        """
+        Returns
+        -------
+        list
+            OutputResults of each case
+        """
+        return [self[i] for i in range(len(self))]
+
+    @classmethod
+    def from_results(cls, results: list) -> "ResultBatch":
+        """
+        Builds a batch from OutputResults (a sign being left out if no result has it)
+
+        Parameters
+        ----------
+        results : list of OutputResults
+        """
+        signs = {}
+        for name in SIGNS:
+            sign_results = [getattr(result, name) for result in results]
+            named = [result for result in sign_results if result is not None]
+            signs[name] = PostMortemIntervalBatchResults.from_results(named[0].name, sign_results) if named else None
+
+        return cls(
+            HenssgeRectalBatchResults.from_results([result.henssge_rectal for result in results]),
+            HenssgeBrainBatchResults.from_results([result.henssge_brain for result in results]),
+            BaccinoBatchResults.from_results([result.baccino for result in results]),
+            **signs
+        )
+
+    @classmethod
+    def concatenate(cls, batches: list) -> "ResultBatch":
+        """
+        Concatenates the cases of several batches (a sign being left out if a batch does not have it)
+
+        Parameters
+        ----------
+        batches : list of ResultBatch
+        """
+        signs = {
+            name: PostMortemIntervalBatchResults.concatenate([getattr(batch, name) for batch in batches])
+            if all(getattr(batch, name) is not None for batch in batches) else None
+            for name in SIGNS
+        }
+        return cls(
+            HenssgeRectalBatchResults.concatenate([batch.henssge_rectal for batch in batches]),
+            HenssgeBrainBatchResults.concatenate([batch.henssge_brain for batch in batches]),
+            BaccinoBatchResults.concatenate([batch.baccino for batch in batches]),
+            **signs
+        )
@@ -4,8 +4,25 @@ from typing import Optional
 import numpy as np
 
 from core import time_converter
+from core.constants import ErrorCode
+from core.time_converter import TimeContext, DEFAULT_TIME_CONTEXT
+from core.value_object import ValueObject
 
-class HenssgeRectalResults:
+class _CoolingResults(ValueObject):
+    __slots__ = ("_error_message", "error_code", "error_values")
+
+    @property
+    def error_message(self) -> Optional[str]:
+        """
+        Error message given explicitly, or else rendered from the error code (None on success)
+        """
+        if self._error_message is not None:
+            return self._error_message
+        return self.error_code.describe(self.error_values)
+
+
+class HenssgeRectalResults(_CoolingResults):
+    __slots__ = ("post_mortem_interval", "confidence_interval", "thermal_quotient", "corrective_factor")
 
     # Constructors
     def __init__(
@@ -14,7 +31,9 @@ class HenssgeRectalResults:
             confidence_interval: float = None,
             thermal_quotient: float = None,
             corrective_factor: float = None,
-            error_message: str = None
+            error_message: str = None,
+            error_code: ErrorCode = ErrorCode.NONE,
+            error_values: tuple = ()
     ):
         """        
         Object encapsulating Henssge rectal output results
@@ -30,12 +49,19 @@ class HenssgeRectalResults:
         thermal_quotient
         corrective_factor
         error_message
+        error_code : ErrorCode
+            Reasons of the error (ErrorCode.NONE on success)
+        error_values : tuple
+            (name, value) pairs quoted in the message rendered from error_code when no error_message
+            is given, see ErrorCode.describe
         """
         self.post_mortem_interval = post_mortem_interval
         self.confidence_interval = confidence_interval
         self.thermal_quotient = thermal_quotient
         self.corrective_factor = corrective_factor
-        self.error_message = error_message
+        self._error_message = error_message
+        self.error_code = error_code
+        self.error_values = error_values
 
     def pmi_min(self):
         return self.post_mortem_interval - self.confidence_interval
@@ -44,8 +70,16 @@ class HenssgeRectalResults:
         return self.post_mortem_interval + self.confidence_interval
 
     def __str__(self):
+        return self.to_string()
+
+    def to_string(self, context: TimeContext = DEFAULT_TIME_CONTEXT) -> str:
         """
         Display results as string
+
+        Parameters
+        ----------
+        context : TimeContext
+            Formatting context (relative PMIs or absolute times of death)
         """
         title = "**Henssge Rectal:**"
 
@@ -54,15 +88,15 @@ class HenssgeRectalResults:
 
         lines = [title]
         pmi_str = time_converter.format_pmi_range_string(
-            self.pmi_min(), self.pmi_max(), self.post_mortem_interval, prefix=""
+            self.pmi_min(), self.pmi_max(), self.post_mortem_interval, prefix="", context=context
         )
-        if time_converter.get_reference_datetime() is not None and '[' in pmi_str:
+        if context.is_absolute() and '[' in pmi_str:
              parts = pmi_str.split('[')
              if len(parts) == 2:
                  interval = parts[1].replace(' - ', ' / ').replace(']', '')
                  pmi_str = f"{parts[0].strip()} [{interval}]"
 
-        label = "Estimated ToD" if time_converter.get_reference_datetime() is not None else "Estimated PMI"
+        label = "Estimated ToD" if context.is_absolute() else "Estimated PMI"
         lines.append(f"- {label}: {pmi_str.strip()}")
 
         if self.confidence_interval is not None:
@@ -74,13 +108,16 @@ class HenssgeRectalResults:
 
         return "\n".join(lines)
 
-class HenssgeBrainResults:
+class HenssgeBrainResults(_CoolingResults):
+    __slots__ = ("post_mortem_interval", "confidence_interval")
     # Constructor
     def __init__(
             self,
             post_mortem_interval: float = None,
             confidence_interval: float = None,
-            error_message: str = None
+            error_message: str = None,
+            error_code: ErrorCode = ErrorCode.NONE,
+            error_values: tuple = ()
     ):
         """
         
@@ -93,10 +130,17 @@ class HenssgeBrainResults:
             in hours
             
         error_message
+        error_code : ErrorCode
+            Reasons of the error (ErrorCode.NONE on success)
+        error_values : tuple
+            (name, value) pairs quoted in the message rendered from error_code when no error_message
+            is given, see ErrorCode.describe
         """
         self.confidence_interval = confidence_interval
         self.post_mortem_interval = post_mortem_interval
-        self.error_message = error_message
+        self._error_message = error_message
+        self.error_code = error_code
+        self.error_values = error_values
 
     def pmi_min(self):
         return self.post_mortem_interval - self.confidence_interval
@@ -105,8 +149,16 @@ class HenssgeBrainResults:
         return self.post_mortem_interval + self.confidence_interval
 
     def __str__(self):
+        return self.to_string()
+
+    def to_string(self, context: TimeContext = DEFAULT_TIME_CONTEXT) -> str:
         """
         Display results as string
+
+        Parameters
+        ----------
+        context : TimeContext
+            Formatting context (relative PMIs or absolute times of death)
         """
         title = "**Henssge Brain:**"
         if self.error_message:
@@ -114,15 +166,15 @@ class HenssgeBrainResults:
 
         lines = [title]
         pmi_str = time_converter.format_pmi_range_string(
-            self.pmi_min(), self.pmi_max(), self.post_mortem_interval, prefix=""
+            self.pmi_min(), self.pmi_max(), self.post_mortem_interval, prefix="", context=context
         )
-        if time_converter.get_reference_datetime() is not None and '[' in pmi_str:
+        if context.is_absolute() and '[' in pmi_str:
              parts = pmi_str.split('[')
              if len(parts) == 2:
                  interval = parts[1].replace(' - ', ' / ').replace(']', '')
                  pmi_str = f"{parts[0].strip()} [{interval}]"
 
-        label = "Estimated time of death" if time_converter.get_reference_datetime() is not None else "Estimated PMI"
+        label = "Estimated time of death" if context.is_absolute() else "Estimated PMI"
         lines.append(f"- {label}: {pmi_str.strip()}")
         
         if self.confidence_interval is not None:
@@ -131,7 +183,9 @@ class HenssgeBrainResults:
         return "\n".join(lines)
 
 
-class BaccinoResults:
+class BaccinoResults(_CoolingResults):
+    __slots__ = ("post_mortem_interval_interval", "post_mortem_interval_global", "confidence_interval_interval",
+                 "confidence_interval_global")
     # Constructor
     def __init__(
             self,
@@ -139,7 +193,9 @@ class BaccinoResults:
             post_mortem_interval_global: float = None,
             confidence_interval_interval: float = None,
             confidence_interval_global: float = None,
-            error_message: str = None
+            error_message: str = None,
+            error_code: ErrorCode = ErrorCode.NONE,
+            error_values: tuple = ()
     ):
         """
         
@@ -158,23 +214,38 @@ class BaccinoResults:
             in hours
             
         error_message
+        error_code : ErrorCode
+            Reasons of the error (ErrorCode.NONE on success)
+        error_values : tuple
+            (name, value) pairs quoted in the message rendered from error_code when no error_message
+            is given, see ErrorCode.describe
         """
         self.post_mortem_interval_interval = post_mortem_interval_interval
         self.post_mortem_interval_global = post_mortem_interval_global
         self.confidence_interval_interval = confidence_interval_interval
         self.confidence_interval_global = confidence_interval_global
-        self.error_message = error_message
+        self._error_message = error_message
+        self.error_code = error_code
+        self.error_values = error_values
 
     def __str__(self):
+        return self.to_string()
+
+    def to_string(self, context: TimeContext = DEFAULT_TIME_CONTEXT) -> str:
         """
         Display results as string
+
+        Parameters
+        ----------
+        context : TimeContext
+            Formatting context (relative PMIs or absolute times of death)
         """
         title = "**Baccino:**"
         if self.error_message:
             return f"{title}\n{self.error_message}"
 
         lines = [title]
-        label = "Estimated time of death" if time_converter.get_reference_datetime() is not None else "Estimated PMI"
+        label = "Estimated time of death" if context.is_absolute() else "Estimated PMI"
 
         # Interval Method
         if self.post_mortem_interval_interval is not None and self.confidence_interval_interval is not None:
@@ -182,8 +253,8 @@ class BaccinoResults:
             ci_int = self.confidence_interval_interval
             min_int = max(0.0, center_int - ci_int)
             max_int = center_int + ci_int
-            pmi_string_int = time_converter.format_pmi_range_string(min_int, max_int, center_int, prefix="")
-            if time_converter.get_reference_datetime() is not None and '[' in pmi_string_int:
+            pmi_string_int = time_converter.format_pmi_range_string(min_int, max_int, center_int, prefix="", context=context)
+            if context.is_absolute() and '[' in pmi_string_int:
                  parts = pmi_string_int.split('[')
                  if len(parts) == 2:
                      interval = parts[1].replace(' - ', ' / ').replace(']', '')
@@ -196,8 +267,8 @@ class BaccinoResults:
             ci_glob = self.confidence_interval_global
             min_glob = max(0.0, center_glob - ci_glob)
             max_glob = center_glob + ci_glob
-            pmi_string_glob = time_converter.format_pmi_range_string(min_glob, max_glob, center_glob, prefix="")
-            if time_converter.get_reference_datetime() is not None and '[' in pmi_string_glob:
+            pmi_string_glob = time_converter.format_pmi_range_string(min_glob, max_glob, center_glob, prefix="", context=context)
+            if context.is_absolute() and '[' in pmi_string_glob:
                  parts = pmi_string_glob.split('[')
                  if len(parts) == 2:
                      interval = parts[1].replace(' - ', ' / ').replace(']', '')
@@ -206,7 +277,8 @@ class BaccinoResults:
 
         return "\n".join(lines)
 
-class PostMortemIntervalResults:
+class PostMortemIntervalResults(ValueObject):
+    __slots__ = ("name", "min", "max", "error_message")
     # Constructor
     def __init__(
             self,
@@ -230,48 +302,103 @@ class PostMortemIntervalResults:
         self.error_message = error_message
 
     def __str__(self):
+        return self.to_string()
+
+    def to_string(self, context: TimeContext = DEFAULT_TIME_CONTEXT) -> str:
         # Display results as string
         title = f"**{self.name}:** "
         if self.error_message:
             return f"{title}{self.error_message}"
 
-        label = "Estimated ToD" if time_converter.get_reference_datetime() is not None else "Estimated PMI"
+        label = "Estimated ToD" if context.is_absolute() else "Estimated PMI"
         Notspecified = "Not specified"
         pmi_value_string = time_converter.format_pmi_range_string(
-            self.min, self.max, prefix=""
+            self.min, self.max, prefix="", context=context
         ).strip()
         if pmi_value_string == "Not specified" or not pmi_value_string: 
             return f"{title} Not specified"
         else:
             return f"{title} {label} {pmi_value_string}"
 
-class OutputResults:
+class OutputResults(ValueObject):
+    __slots__ = ("henssge_rectal", "henssge_brain", "baccino", "idiomuscular_reaction", "rigor", "lividity",
+                 "lividity_disappearance", "lividity_mobility", "other_results")
 
     # Constructor
-    def __init__(self):
-        self.henssge_rectal: Optional[HenssgeRectalResults] = None
-        self.henssge_brain: Optional[HenssgeBrainResults] = None
-        self.baccino: Optional[BaccinoResults] = None
-        self.idiomuscular_reaction: Optional[PostMortemIntervalResults] = None
-        self.rigor: Optional[PostMortemIntervalResults] = None
-        self.lividity: Optional[PostMortemIntervalResults] = None
-        self.lividity_disappearance: Optional[PostMortemIntervalResults] = None
-        self.lividity_mobility: Optional[PostMortemIntervalResults] = None
-        
+    def __init__(
+            self,
+            henssge_rectal: Optional[HenssgeRectalResults] = None,
+            henssge_brain: Optional[HenssgeBrainResults] = None,
+            baccino: Optional[BaccinoResults] = None,
+            idiomuscular_reaction: Optional[PostMortemIntervalResults] = None,
+            rigor: Optional[PostMortemIntervalResults] = None,
+            lividity: Optional[PostMortemIntervalResults] = None,
+            lividity_disappearance: Optional[PostMortemIntervalResults] = None,
+            lividity_mobility: Optional[PostMortemIntervalResults] = None,
+            other_results=()
+    ):
+        """
+        Results of all methods (None for the methods not computed)
+
+        Parameters
+        ----------
+        other_results : dict or iterable of tuples
+            Results of the methods registered besides the built-in ones (see registry.register_method),
+            by name. Stored as a tuple of (name, result) pairs, in computation order, so that the
+            object stays hashable
+        """
+        self.henssge_rectal = henssge_rectal
+        self.henssge_brain = henssge_brain
+        self.baccino = baccino
+        self.idiomuscular_reaction = idiomuscular_reaction
+        self.rigor = rigor
+        self.lividity = lividity
+        self.lividity_disappearance = lividity_disappearance
+        self.lividity_mobility = lividity_mobility
+        self.other_results = tuple(dict(other_results).items())
+
+    def get(self, name: str):
+        """
+        Result of a method, built-in or not
+
+        Parameters
+        ----------
+        name : str
+            Name of the method (see registry.METHODS)
+
+        Returns
+        -------
+        object
+            None if the method was not computed
+        """
+        if name in self.__slots__ and name != "other_results":
+            return getattr(self, name)
+        return dict(self.other_results).get(name)
 
     def __str__(self):
+        return self.to_string()
+
+    def to_string(self, context: TimeContext = DEFAULT_TIME_CONTEXT) -> str:
         """
         Display results as string
+
+        Parameters
+        ----------
+        context : TimeContext
+            Formatting context (relative PMIs or absolute times of death)
         """
         test = "\n\n".join([
-            str(self.henssge_rectal),
-            str(self.henssge_brain),
-            str(self.baccino),
-            str(self.idiomuscular_reaction),
-            str(self.rigor),
-            str(self.lividity),
-            str(self.lividity_disappearance),
-            str(self.lividity_mobility)
-        ])
+            str(result) if result is None else result.to_string(context)
+            for result in [
+                self.henssge_rectal,
+                self.henssge_brain,
+                self.baccino,
+                self.idiomuscular_reaction,
+                self.rigor,
+                self.lividity,
+                self.lividity_disappearance,
+                self.lividity_mobility
+            ]
+        ] + [result.to_string(context) for _, result in self.other_results])
         
         return test
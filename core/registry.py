@@ -0,0 +1,186 @@
+# core/registry.py
+
+import functools
+import importlib
+import sys
+
+from core.computations import spec
+from core.constants import IdiomuscularReactionType, LividityType, LividityDisappearanceType, LividityMobilityType, RigorType
+from core.output_results import HenssgeRectalResults, HenssgeBrainResults, BaccinoResults, PostMortemIntervalResults
+
+# Constants
+METHODS = {}
+"""Registered methods by name, in computation order (see register_method)"""
+
+THERMAL = "thermal"
+"""Group of the cooling methods"""
+
+SIGNS = "signs"
+"""Group of the thanatological signs"""
+
+
+class Method:
+
+    # Constructor
+    def __init__(self, name: str, module_name: str, inputs: tuple, groups: tuple = (), options: tuple = (),
+                 absent_result=None):
+        """
+        Estimation method computed by compute.run, its module being imported on first use only
+
+        Parameters
+        ----------
+        name : str
+            Name of the method (OutputResults member for the built-in ones)
+        module_name : str
+            Module providing compute(input_parameters, *options) and INPUTS
+        inputs : tuple
+            Input parameters read by the method (the INPUTS of its module, see core.computations.spec)
+        groups : tuple
+            Groups the method can be selected by (e.g. THERMAL)
+        options : tuple
+            Options of compute.run passed to the method, in order (e.g. "use_inverse_table")
+        absent_result : callable
+            Result of the method when its inputs are absent or invalid, returned without importing
+            its module (validated input parameters -> result, or None to compute it)
+        """
+        self.name = name
+        self.module_name = module_name
+        self.inputs = inputs
+        self.groups = groups
+        self.options = options
+        self.absent_result = absent_result
+
+    @property
+    def module(self):
+        """
+        Computation module, imported on first access
+        """
+        return importlib.import_module(self.module_name)
+
+    @property
+    def loaded(self) -> bool:
+        return self.module_name in sys.modules
+
+
+def register_method(name: str, inputs: tuple, groups: tuple = (), options: tuple = (), absent_result=None):
+    """
+    Decorator registering a method: the decorated function returns the name of the module
+    computing it, which is only imported when the method is actually computed.
+    A method registered under an existing name replaces it. Its results, like the built-in ones,
+    provide to_string(context) (see OutputResults.to_string).
+
+    Parameters
+    ----------
+    See Method
+    """
+    def decorator(module_name_function):
+        METHODS[name] = Method(name, module_name_function(), inputs, groups, options, absent_result)
+        return module_name_function
+    return decorator
+
+
+def get(name: str) -> Method:
+    """
+    Parameters
+    ----------
+    name : str
+        Name of a registered method
+
+    Returns
+    -------
+    Method
+
+    Raises
+    ------
+    ValueError
+        If no method is registered under the name
+    """
+    try:
+        return METHODS[name]
+    except KeyError:
+        raise ValueError(f"Unknown method: {name}")
+
+
+def select(methods=None) -> tuple:
+    """
+    Parameters
+    ----------
+    methods : str or iterable of str
+        Names of methods or groups, None for all the registered methods
+
+    Returns
+    -------
+    tuple
+        Names of the selected methods, in computation order
+    """
+    if methods is None:
+        return tuple(METHODS)
+    if isinstance(methods, str):
+        methods = (methods,)
+    methods = set(methods)
+    unknown = methods.difference(METHODS, *(method.groups for method in METHODS.values()))
+    if unknown:
+        raise ValueError(f"Unknown methods: {', '.join(sorted(unknown))}")
+    return tuple(name for name, method in METHODS.items() if name in methods or methods.intersection(method.groups))
+
+
+def _not_specified(name: str, inputs: tuple, not_specified):
+    # Result of a thanatological sign without observation (see spec.is_not_specified)
+    def absent_result(input_parameters):
+        if spec.is_not_specified(getattr(input_parameters, inputs[0]), not_specified):
+            return PostMortemIntervalResults(name, error_message=spec.NOT_SPECIFIED_MESSAGE)
+        return None
+    return absent_result
+
+
+# --- Built-in methods, described by core.computations.spec as their modules
+
+@register_method("henssge_rectal", spec.HENSSGE_RECTAL_INPUTS, (THERMAL,), ("use_inverse_table",),
+                 functools.partial(spec.input_error_result, HenssgeRectalResults, spec.HENSSGE_RECTAL_INPUTS))
+def _henssge_rectal():
+    return "core.computations.henssge_rectal"
+
+
+@register_method("henssge_brain", spec.HENSSGE_BRAIN_INPUTS, (THERMAL,), ("use_inverse_table",),
+                 functools.partial(spec.input_error_result, HenssgeBrainResults, spec.HENSSGE_BRAIN_INPUTS))
+def _henssge_brain():
+    return "core.computations.henssge_brain"
+
+
+@register_method("baccino", spec.BACCINO_INPUTS, (THERMAL,),
+                 absent_result=functools.partial(spec.input_error_result, BaccinoResults, spec.BACCINO_INPUTS))
+def _baccino():
+    return "core.computations.baccino"
+
+
+@register_method("idiomuscular_reaction", spec.IDIOMUSCULAR_REACTION_INPUTS, (SIGNS,),
+                 absent_result=_not_specified(spec.IDIOMUSCULAR_REACTION_NAME, spec.IDIOMUSCULAR_REACTION_INPUTS,
+                                              IdiomuscularReactionType.NOT_SPECIFIED))
+def _idiomuscular_reaction():
+    return "core.computations.idiomuscular_reaction"
+
+
+@register_method("lividity", spec.LIVIDITY_INPUTS, (SIGNS,),
+                 absent_result=_not_specified(spec.LIVIDITY_NAME, spec.LIVIDITY_INPUTS, LividityType.NOT_SPECIFIED))
+def _lividity():
+    return "core.computations.lividity"
+
+
+@register_method("lividity_disappearance", spec.LIVIDITY_DISAPPEARANCE_INPUTS, (SIGNS,),
+                 absent_result=_not_specified(spec.LIVIDITY_DISAPPEARANCE_NAME, spec.LIVIDITY_DISAPPEARANCE_INPUTS,
+                                              LividityDisappearanceType.NOT_SPECIFIED))
+def _lividity_disappearance():
+    return "core.computations.lividity_disappearance"
+
+
+@register_method("lividity_mobility", spec.LIVIDITY_MOBILITY_INPUTS, (SIGNS,),
+                 absent_result=_not_specified(spec.LIVIDITY_MOBILITY_NAME, spec.LIVIDITY_MOBILITY_INPUTS,
+                                              LividityMobilityType.NOT_SPECIFIED))
+def _lividity_mobility():
+    return "core.computations.lividity_mobility"
+
+
+@register_method("rigor", spec.RIGOR_INPUTS, (SIGNS,),
+                 absent_result=_not_specified(spec.RIGOR_NAME, spec.RIGOR_INPUTS, RigorType.NOT_SPECIFIED))
+def _rigor():
+    return "core.computations.rigor"
@@ -2,24 +2,41 @@
 
 import math
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
-from .tools import format_time as format_relative_time
+import numpy as np
 
-# --- Configuration ---
-# This variable will hold the reference datetime if provided by the user.
-_reference_datetime: Optional[datetime] = None
+from .tools import format_time as format_relative_time, format_time_batch as format_relative_time_batch
+
+# --- Formatting context ---
+
+class TimeContext:
+    """
+    Formatting context of PMI values, passed explicitly to every formatter so that
+    concurrent sessions can each render with their own reference time.
+
+    Args:
+        reference: Datetime of the measurements. When set, PMIs are rendered as absolute
+            times of death (reference - PMI), otherwise as relative hours.
+    """
+
+    def __init__(self, reference: Optional[datetime] = None):
+        self._reference = reference
+
+    @property
+    def reference(self) -> Optional[datetime]:
+        """Reference datetime, or None for relative formatting."""
+        return self._reference
+
+    def is_absolute(self) -> bool:
+        """Returns True if PMIs are rendered as absolute times of death."""
+        return self._reference is not None
 
-# --- Public Functions ---
 
-def set_reference_datetime(ref_dt: Optional[datetime]) -> None:
-    """Sets the global reference datetime for calculations."""
-    global _reference_datetime
-    _reference_datetime = ref_dt
+DEFAULT_TIME_CONTEXT = TimeContext()
+"""Context without reference datetime (relative PMI formatting)"""
 
-def get_reference_datetime() -> Optional[datetime]:
-    """Gets the currently set global reference datetime."""
-    return _reference_datetime
+# --- Public Functions ---
 
 def format_absolute_datetime(dt: Optional[datetime]) -> str:
     """Formats a datetime object into 'DD/MM/YYYY - HHhMM'."""
@@ -32,43 +49,156 @@ def format_absolute_datetime(dt: Optional[datetime]) -> str:
         # Handle potential issues with very large/small dates if necessary
         return "Invalid Date"
 
-def calculate_absolute_dt(pmi_hours: Optional[float]) -> Optional[datetime]:
+def calculate_absolute_dt(pmi_hours: Optional[float], context: TimeContext = DEFAULT_TIME_CONTEXT) -> Optional[datetime]:
     """
     Calculates the absolute datetime of death based on the reference time
     and the post-mortem interval in hours.
 
     Args:
         pmi_hours: The post-mortem interval in hours.
+        context: Formatting context holding the reference time.
 
     Returns:
         The calculated absolute datetime of death, or None if calculation
         is not possible (no reference time, infinite/NaN PMI).
     """
-    if _reference_datetime is None or pmi_hours is None or math.isnan(pmi_hours) or math.isinf(pmi_hours):
+    if context.reference is None or pmi_hours is None or math.isnan(pmi_hours) or math.isinf(pmi_hours):
         return None
     try:
         # Time of death = Reference Time - PMI
-        return _reference_datetime - timedelta(hours=pmi_hours)
+        return context.reference - timedelta(hours=pmi_hours)
     except (OverflowError, ValueError):
         # Handle potential errors with very large timedelta values
         return None
 
+# --- Batch Functions ---
+
+DATETIME64_LIMITS = (np.datetime64("0001-01-01T00:00:00", "us"), np.datetime64("9999-12-31T23:59:59.999999", "us"))
+"""Range of the datetime objects, outside of which calculate_absolute_dt returns None"""
+
+_MAX_PMI_HOURS = 1e9
+"""Bound of the PMIs converted to microseconds without overflow (the dates would be out of range beyond)"""
+
+_STRFTIME_FIELDS = {"%Y": 4, "%m": 2, "%d": 2, "%H": 2, "%M": 2}
+"""Directives supported by the batch formatting, with their number of digits"""
+
+
+def calculate_absolute_dt_batch(pmi_hours: np.ndarray,
+                                references: Union[np.ndarray, datetime, None] = None,
+                                context: TimeContext = DEFAULT_TIME_CONTEXT) -> np.ndarray:
+    """
+    Vectorized calculate_absolute_dt: times of death (reference - PMI) of arrays of PMIs.
+
+    Args:
+        pmi_hours: Post-mortem intervals in hours.
+        references: Reference time of each row (datetime64 array), or one datetime for all rows.
+            Defaults to the reference time of the context.
+        context: Formatting context holding the reference time, used without references.
+
+    Returns:
+        datetime64[s] array, NaT where calculate_absolute_dt returns None (no reference time,
+        infinite/NaN PMI, date out of range).
+    """
+    pmi_hours = np.asarray(pmi_hours, dtype=float)
+    if references is None:
+        references = context.reference
+    if references is None:
+        return np.full(pmi_hours.shape, np.datetime64("NaT"), dtype="datetime64[s]")
+    if isinstance(references, datetime):
+        references = references.replace(tzinfo=None)
+    references = np.asarray(references, dtype="datetime64[us]")
+
+    # Computed in microseconds as timedelta does, then truncated to the second
+    valid = np.isfinite(pmi_hours) & (np.abs(pmi_hours) <= _MAX_PMI_HOURS) & ~np.isnat(references)
+    offsets = np.round(np.where(valid, pmi_hours, 0.0) * 3.6e9).astype("timedelta64[us]")
+    dts = references - offsets
+    valid &= (dts >= DATETIME64_LIMITS[0]) & (dts <= DATETIME64_LIMITS[1])
+    return np.where(valid, dts, np.datetime64("NaT")).astype("datetime64[s]")
+
+
+def strftime_batch(dts: np.ndarray, date_format: str, missing: str = "N/A") -> np.ndarray:
+    """
+    Vectorized datetime.strftime, the digits being assembled with array operations.
+
+    Args:
+        dts: datetime64 array.
+        date_format: Format made of %Y, %m, %d, %H, %M and literal characters.
+        missing: String of the NaT values.
+
+    Returns:
+        Array of strings.
+    """
+    dts = np.asarray(dts, dtype="datetime64[s]")
+    valid = ~np.isnat(dts)
+    dts_valid = dts[valid]
+
+    days = dts_valid.astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    seconds = (dts_valid - days).astype(np.int32)
+    fields = {
+        "%Y": months.astype(np.int32) // 12 + 1970,
+        "%m": months.astype(np.int32) % 12 + 1,
+        "%d": (days - months).astype(np.int32) + 1,
+        "%H": seconds // 3600,
+        "%M": seconds // 60 % 60,
+    }
+
+    # Template of the strings as UCS4 code points, the digits being added to its "0" characters
+    template = []
+    digits = []  # (position, field, power of ten)
+    i = 0
+    while i < len(date_format):
+        directive = date_format[i:i + 2]
+        if directive in _STRFTIME_FIELDS:
+            for power in reversed(range(_STRFTIME_FIELDS[directive])):
+                digits.append((len(template), directive, 10 ** power))
+                template.append(ord("0"))
+            i += 2
+        elif directive.startswith("%") and directive != "%%":
+            raise ValueError(f"Unsupported directive {directive} in {date_format}")
+        else:
+            template.append(ord(date_format[i]))
+            i += 2 if directive == "%%" else 1
+    length = max(len(template), 1)
+    characters = np.empty((len(dts_valid), length), dtype=np.uint32)
+    characters[:] = template or [0]
+    for position, directive, power in digits:
+        characters[:, position] += (fields[directive] // power % 10).astype(np.uint32)
+    strings = characters.view(f"<U{length}").reshape(-1)
+
+    output = np.full(dts.shape, missing, dtype=f"<U{max(length, len(missing))}")
+    output[valid] = strings
+
+    # strftime does not pad the years before 1000
+    early = valid.copy()
+    early[valid] = fields["%Y"] < 1000
+    for index in zip(*np.nonzero(early)):
+        output[index] = dts[index].item().strftime(date_format)
+    return output
+
+
+def format_absolute_datetime_batch(dts: np.ndarray) -> np.ndarray:
+    """Vectorized format_absolute_datetime: 'DD/MM/YYYY - HHhMM', 'N/A' for NaT."""
+    return strftime_batch(dts, "%d/%m/%Y - %Hh%M")
+
 # --- Main formatting function for text (run.py) ---
 def format_pmi_range_string(
     pmi_min_hours: Optional[float],
     pmi_max_hours: Optional[float],
     pmi_center_hours: Optional[float] = None,
-    prefix: str = "Estimated PMI"
+    prefix: str = "Estimated PMI",
+    context: TimeContext = DEFAULT_TIME_CONTEXT
 ) -> str:
     """
     Formats a PMI range (min, max, optional center) into a string.
-    Uses absolute dates if a reference datetime is set, otherwise uses relative hours.
+    Uses absolute dates if the context has a reference datetime, otherwise uses relative hours.
 
     Args:
         pmi_min_hours: Minimum PMI in hours. Can be 0 or NaN.
         pmi_max_hours: Maximum PMI in hours. Can be infinity or NaN.
         pmi_center_hours: Optional central estimate PMI in hours.
         prefix: The text to put before the formatted range (e.g., "Estimated PMI").
+        context: Formatting context holding the reference time.
 
     Returns:
         A formatted string representing the PMI.
@@ -81,7 +211,7 @@ def format_pmi_range_string(
         return f"{prefix}: Not specified"
 
     # If no reference time, use original relative formatting
-    if _reference_datetime is None:
+    if context.reference is None:
         min_rel = format_relative_time(pmi_min_hours if not min_is_nan else 0) # Treat NaN min as 0 for display logic
         max_rel = format_relative_time(pmi_max_hours if not max_is_nan else float('inf')) # Treat NaN max as inf
         center_rel = format_relative_time(pmi_center_hours) if pmi_center_hours is not None else None
@@ -105,9 +235,9 @@ def format_pmi_range_string(
             return f"{prefix}: Interval undefined ({min_rel} - {max_rel})"
         
     else: # Absolute Time Calculation
-        dt_latest = calculate_absolute_dt(pmi_min_hours)
-        dt_earliest = calculate_absolute_dt(pmi_max_hours)
-        dt_center = calculate_absolute_dt(pmi_center_hours) if pmi_center_hours is not None else None
+        dt_latest = calculate_absolute_dt(pmi_min_hours, context)
+        dt_earliest = calculate_absolute_dt(pmi_max_hours, context)
+        dt_center = calculate_absolute_dt(pmi_center_hours, context) if pmi_center_hours is not None else None
 
         fmt_latest = format_absolute_datetime(dt_latest)
         fmt_earliest = format_absolute_datetime(dt_earliest)
@@ -132,26 +262,98 @@ def format_pmi_range_string(
         else:
             return f"{prefix}: Cannot determine absolute time"
 
+def format_pmi_range_string_batch(
+    pmi_min_hours: np.ndarray,
+    pmi_max_hours: np.ndarray,
+    pmi_center_hours: Optional[np.ndarray] = None,
+    prefix: str = "Estimated PMI",
+    context: TimeContext = DEFAULT_TIME_CONTEXT,
+    references: Union[np.ndarray, datetime, None] = None
+) -> np.ndarray:
+    """
+    Vectorized format_pmi_range_string, for the export of large batches: the cases are selected
+    with array operations and the strings assembled in bulk.
+
+    Args:
+        pmi_min_hours: Minimum PMIs in hours (NaN for None).
+        pmi_max_hours: Maximum PMIs in hours (NaN for None).
+        pmi_center_hours: Optional central estimates in hours (None for the interval signs).
+        prefix: The text to put before the formatted ranges.
+        context: Formatting context holding the reference time.
+        references: Reference time of each row, see calculate_absolute_dt_batch.
+
+    Returns:
+        Array of the strings of format_pmi_range_string.
+    """
+    pmi_min_hours = np.asarray(pmi_min_hours, dtype=float)
+    pmi_max_hours = np.asarray(pmi_max_hours, dtype=float)
+    min_is_nan = np.isnan(pmi_min_hours)
+    max_is_nan = np.isnan(pmi_max_hours)
+    has_center = pmi_center_hours is not None
+
+    def join(*parts):
+        joined = parts[0]
+        for part in parts[1:]:
+            joined = np.strings.add(joined, part)
+        return joined
+
+    if references is None and context.reference is None:
+        min_rel = format_relative_time_batch(np.where(min_is_nan, 0.0, pmi_min_hours))  # Treat NaN min as 0 for display logic
+        max_rel = format_relative_time_batch(np.where(max_is_nan, np.inf, pmi_max_hours))  # Treat NaN max as inf
+        max_is_finite = ~max_is_nan & ~np.isinf(pmi_max_hours)
+
+        if has_center:
+            interval = join(f"{prefix} ", format_relative_time_batch(pmi_center_hours), " [", min_rel, " - ", max_rel, "]")
+        else:
+            interval = join(f"{prefix} between ", min_rel, " and ", max_rel)
+        output = np.select(
+            [~min_is_nan & max_is_finite & (pmi_min_hours != 0.0),
+             ~min_is_nan & ~max_is_finite,
+             max_is_finite],
+            [interval, join(f"{prefix} > ", min_rel), join(f"{prefix} < ", max_rel)],
+            join(f"{prefix}: Interval undefined (", min_rel, " - ", max_rel, ")"))
+    else:
+        # Min PMI hours -> latest possible death time, max PMI hours -> earliest possible death time
+        dts_latest = calculate_absolute_dt_batch(pmi_min_hours, references, context)
+        dts_earliest = calculate_absolute_dt_batch(pmi_max_hours, references, context)
+        fmt_latest = format_absolute_datetime_batch(dts_latest)
+        fmt_earliest = format_absolute_datetime_batch(dts_earliest)
+        has_latest = ~np.isnat(dts_latest)
+        has_earliest = ~np.isnat(dts_earliest)
+
+        interval = join(f"{prefix} Between ", fmt_earliest, " and ", fmt_latest)
+        if has_center:
+            dts_center = calculate_absolute_dt_batch(pmi_center_hours, references, context)
+            interval = np.where(~np.isnat(dts_center),
+                                join(f"{prefix} ", format_absolute_datetime_batch(dts_center), " [", fmt_earliest, " | ", fmt_latest, "]"),
+                                interval)
+        output = np.select(
+            [has_earliest & has_latest, has_earliest, has_latest],
+            [interval, join(f"{prefix}: After ", fmt_earliest), join(f"{prefix}: Before ", fmt_latest)],
+            f"{prefix}: Cannot determine absolute time")
+
+    return np.where(min_is_nan & max_is_nan, f"{prefix}: Not specified", output)
+
 # --- Function for Plot ---
 
-def format_plot_scatter_label(pmi_hours: Optional[float]) -> str:
+def format_plot_scatter_label(pmi_hours: Optional[float], context: TimeContext = DEFAULT_TIME_CONTEXT) -> str:
     """Formats a label for a single point (scatter) on a plot."""
     if pmi_hours is None or math.isnan(pmi_hours):
         return "N/A"
 
-    if _reference_datetime is None:
+    if context.reference is None:
         return f"{format_relative_time(pmi_hours)}"
     else:
-        dt = calculate_absolute_dt(pmi_hours)
+        dt = calculate_absolute_dt(pmi_hours, context)
         return f"{format_absolute_datetime(dt)}"
 
-def format_plot_ci_label(pmi_min_hours: Optional[float], pmi_max_hours: Optional[float]) -> str:
+def format_plot_ci_label(pmi_min_hours: Optional[float], pmi_max_hours: Optional[float], context: TimeContext = DEFAULT_TIME_CONTEXT) -> str:
     """Formats a label for a confidence interval (axvspan) on a plot."""
     if pmi_min_hours is None or math.isnan(pmi_min_hours) or \
        pmi_max_hours is None or math.isnan(pmi_max_hours):
         return "CI: N/A"
 
-    if _reference_datetime is None:
+    if context.reference is None:
         min_rel = format_relative_time(pmi_min_hours)
         max_rel = format_relative_time(pmi_max_hours)
         return f"CI: {min_rel} - {max_rel}"
@@ -159,20 +361,20 @@ def format_plot_ci_label(pmi_min_hours: Optional[float], pmi_max_hours: Optional
         # Remember: Min PMI hours -> Latest possible death time
         #           Max PMI hours -> Earliest possible death time
         hour_format = "%Hh%M"
-        dt_latest = calculate_absolute_dt(pmi_min_hours)
-        dt_earliest = calculate_absolute_dt(pmi_max_hours)
+        dt_latest = calculate_absolute_dt(pmi_min_hours, context)
+        dt_earliest = calculate_absolute_dt(pmi_max_hours, context)
         fmt_earliest = dt_earliest.strftime(hour_format) if dt_earliest else "N/A"
         fmt_latest = dt_latest.strftime(hour_format) if dt_latest else "N/A"
         return f"{fmt_earliest} - {fmt_latest}"
 
-def format_plot_xlabel() -> str:
+def format_plot_xlabel(context: TimeContext = DEFAULT_TIME_CONTEXT) -> str:
     """Returns the appropriate X-axis label based on reference time."""
-    if _reference_datetime is None:
+    if context.reference is None:
         return "Estimated Post-Mortem Interval (hours)"
     else:
         return "Estimated Time of Death (position relative to measurement time)"
 
-def generate_plot_x_tick_labels(tick_hours: list[float]) -> list[str]:
+def generate_plot_x_tick_labels(tick_hours: list[float], context: TimeContext = DEFAULT_TIME_CONTEXT) -> list[str]:
     """
     Generates labels for X-axis ticks on plots.
     Returns relative hours if no reference datetime is set.
@@ -180,51 +382,40 @@ def generate_plot_x_tick_labels(tick_hours: list[float]) -> list[str]:
     only on the first tick and when the date changes.
 
     Args:
-        tick_hours: A list of tick positions in hours PMI.
+        tick_hours: A list (or array) of tick positions in hours PMI.
+        context: Formatting context holding the reference time.
 
     Returns:
         A list of strings to be used as tick labels.
     """
-    if not tick_hours:
+    if len(tick_hours) == 0:
         return []
 
-    if _reference_datetime is None:
+    if context.reference is None:
         # Relative mode: Simply return hours in standard string format
         return [format_relative_time(h) for h in tick_hours]
     else:
-        # Absolute mode: returns absolute date and hours
-        output_labels = []
-        last_date_str = None # Save the last date displayed
-
-        for hour in tick_hours:
-            if hour < 0: # Do not attempt to calculate for negative ticks (e.g. xlim left=-1)
-                output_labels.append("")
-                continue
-
-            dt = calculate_absolute_dt(hour)
-            if dt is None:
-                output_labels.append("") # Leave blank if not calculable
-                continue
-
-            # Format date and time parts
-            current_date_str = dt.strftime("%d/%m/%Y")
-            hour_str = dt.strftime("%Hh%M") # Hour format only
-
-            # Decide what to display
-            if last_date_str is None or current_date_str != last_date_str:
-                # First time or date change: display Date + Time
-                # Use \n to separate on two lines if necessary
-                label = f"{hour_str}\n{current_date_str}"
-                last_date_str = current_date_str # Update last viewed date
-            else:
-                # Same date as previous: show time only
-                label = hour_str
-
-            output_labels.append(label)
-
-        return output_labels
+        # Absolute mode: returns absolute date and hours, computed for all ticks at once
+        tick_hours = np.asarray(tick_hours, dtype=float)
+        # Do not attempt to calculate for negative ticks (e.g. xlim left=-1), left blank as the not calculable ones
+        dts = calculate_absolute_dt_batch(np.where(tick_hours < 0, np.nan, tick_hours), context=context)
+        hour_strs = strftime_batch(dts, "%Hh%M", missing="")
+        date_strs = strftime_batch(dts, "%d/%m/%Y", missing="")
+
+        # Date + Time on the first tick and when the date changes (blank ticks skipped), time only otherwise
+        valid = ~np.isnat(dts)
+        valid_dates = date_strs[valid]
+        date_changes = np.ones(len(valid_dates), dtype=bool)
+        date_changes[1:] = valid_dates[1:] != valid_dates[:-1]
+        show_date = np.zeros(len(dts), dtype=bool)
+        show_date[valid] = date_changes
+
+        # Use \n to separate on two lines
+        return [f"{hour_str}\n{date_str}" if show else str(hour_str)
+                for hour_str, date_str, show in zip(hour_strs, date_strs, show_date)]
     
-def format_plot_mustache_labels(pmi_min: Optional[float], pmi_max: Optional[float], pmi_center: Optional[float]) -> Tuple[str, str, str]:
+def format_plot_mustache_labels(pmi_min: Optional[float], pmi_max: Optional[float], pmi_center: Optional[float],
+                                context: TimeContext = DEFAULT_TIME_CONTEXT) -> Tuple[str, str, str]:
     """
     Formats labels specifically for the mustache box plot helper.
     Returns (center_label, left_label, right_label)
@@ -234,7 +425,7 @@ def format_plot_mustache_labels(pmi_min: Optional[float], pmi_max: Optional[floa
     has_min = pmi_min is not None and not math.isnan(pmi_min)
     has_max = pmi_max is not None and not math.isnan(pmi_max)
 
-    if _reference_datetime is None:
+    if context.reference is None:
         # Format relatif
         center_str = format_relative_time(pmi_center) if has_center else ""
         left_str = format_relative_time(pmi_min) if has_min else ""
@@ -244,9 +435,9 @@ def format_plot_mustache_labels(pmi_min: Optional[float], pmi_max: Optional[floa
         right_label = right_str
     else:
         # Format absolu
-        dt_center = calculate_absolute_dt(pmi_center) if has_center else None
-        dt_latest = calculate_absolute_dt(pmi_min) if has_min else None    # Min hours -> latest death
-        dt_earliest = calculate_absolute_dt(pmi_max) if has_max else None # Max hours -> earliest death
+        dt_center = calculate_absolute_dt(pmi_center, context) if has_center else None
+        dt_latest = calculate_absolute_dt(pmi_min, context) if has_min else None    # Min hours -> latest death
+        dt_earliest = calculate_absolute_dt(pmi_max, context) if has_max else None # Max hours -> earliest death
         hour_format = "%Hh%M"
 
         center_str = format_absolute_datetime(dt_center) if dt_center else ""
@@ -260,7 +451,7 @@ def format_plot_mustache_labels(pmi_min: Optional[float], pmi_max: Optional[floa
     return center_label, left_label, right_label
 
 
-def format_plot_zone_label(pmi_limit: Optional[float], side: str) -> Tuple[str, str]:
+def format_plot_zone_label(pmi_limit: Optional[float], side: str, context: TimeContext = DEFAULT_TIME_CONTEXT) -> Tuple[str, str]:
     """
     Formats labels specifically for the zone box plot helper.
     Returns (text_label, horizontal_alignment)
@@ -270,7 +461,7 @@ def format_plot_zone_label(pmi_limit: Optional[float], side: str) -> Tuple[str,
 
     text_label, align = "N/A", "center"
 
-    if _reference_datetime is None:
+    if context.reference is None:
         # Format relatif
         formatted_pos = format_relative_time(pmi_limit)
         if side == 'upper': # PMI > limit
@@ -279,7 +470,7 @@ def format_plot_zone_label(pmi_limit: Optional[float], side: str) -> Tuple[str,
             text_label, align = f"PMI < {formatted_pos}", 'right'
     else:
         # Format absolu
-        dt_limit = calculate_absolute_dt(pmi_limit)
+        dt_limit = calculate_absolute_dt(pmi_limit, context)
         formatted_dt = format_absolute_datetime(dt_limit)
         if formatted_dt not in ["N/A", "Invalid Date"]:
             if side == 'upper': # PMI > limit => Death Before dt_limit
@@ -2,6 +2,16 @@
 
 import math
 
+import numpy as np
+
+# Constants
+_HOURS_STRINGS = np.array([str(hours) for hours in range(1000)])
+"""Hours of the usual PMIs as strings, looked up by format_time_batch"""
+
+_MINUTES_STRINGS = np.array([f"{minutes:02}" for minutes in range(60)])
+"""Two-digit minutes, looked up by format_time_batch"""
+
+
 def format_time(time: float) -> str:
     """
     Formats the time in hours and minutes.
@@ -29,4 +39,83 @@ def format_time(time: float) -> str:
         return "∞"
     hours = int(time)
     minutes = int((time - hours) * 60)
-    return f"{hours}h{minutes:02}"
\ No newline at end of file
+    return f"{hours}h{minutes:02}"
+
+def format_time_batch(times: np.ndarray) -> np.ndarray:
+    """
+    Vectorized format_time: the hours and minutes are computed with array operations and the
+    strings assembled in bulk.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Times in hours
+
+    Returns
+    -------
+    np.ndarray
+        Formatted times (same strings as format_time)
+    """
+    times = np.asarray(times, dtype=float)
+    finite = np.isfinite(times)
+    # Negative and huge times are rare: they are left to format_time (sign of the minutes, integer overflow)
+    fallback = finite & ((times < 0) | (times >= 2 ** 53))
+    regular = finite & ~fallback
+
+    hours = np.where(regular, times, 0.0).astype(np.int64)
+    minutes = ((np.where(regular, times, 0.0) - hours) * 60).astype(np.int64)
+    small = hours < len(_HOURS_STRINGS)
+    hours_strings = _HOURS_STRINGS[np.where(small, hours, 0)]
+    if not small.all():
+        hours_strings = np.where(small, hours_strings, hours.astype(str))
+    output = np.strings.add(np.strings.add(hours_strings, "h"), _MINUTES_STRINGS[minutes])
+
+    output = np.where(np.isnan(times), "NaN", np.where(np.isinf(times), "∞", output))
+    if fallback.any():
+        fallback_strings = np.array([format_time(time) for time in times[fallback]])
+        output = output.astype(np.result_type(output, fallback_strings))
+        output[fallback] = fallback_strings
+    return output
+
+def convert_decimal_separator(value: str) -> float:
+    """
+    Convert a numeric string with a comma as a decimal separator to a float.
+    The function handles various input formats including spaces, multiple commas,
+    and different whitespace characters.
+
+    Parameters
+    ----------
+    value : str
+        Input string that may contain a comma as a decimal separator.
+    Returns
+    -------
+    float
+        Converted number.
+    Raises
+    ------
+    ValueError
+        If the input string is empty or cannot be converted to a float.
+    """
+    if not value:
+        raise ValueError("Input value is empty")
+
+    # Clean the input
+    value = (
+        value
+        .strip()  # Remove leading/trailing whitespace
+        .replace('\xa0', ' ')  # Replace non-breaking spaces
+        .replace('\t', ' ')  # Replace tabs with spaces
+        .replace(' ', '')  # Remove all spaces
+    )
+
+    # Check for multiple commas
+    if value.count(',') > 1:
+        raise ValueError(f"Multiple commas found in input: {value}")
+
+    # Replace comma with dot
+    value = value.replace(',', '.')
+
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Invalid number format: {value}")
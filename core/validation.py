@@ -0,0 +1,141 @@
+# core/validation.py
+
+import numpy as np
+
+from core.computations.common import validate_range_batch
+from core.constants import TEMPERATURE_LIMITS, BODY_MASS_LIMIT, TemperatureLimitsType, ErrorCode
+from core.input_parameters import InputParameters
+
+# Constants
+VALIDATED_FIELDS = {
+    "tympanic_temperature": (TEMPERATURE_LIMITS[TemperatureLimitsType.TYMPANIC],
+                             ErrorCode.TYMPANIC_TEMPERATURE_MISSING, ErrorCode.TYMPANIC_TEMPERATURE_OUT_OF_RANGE),
+    "rectal_temperature": (TEMPERATURE_LIMITS[TemperatureLimitsType.RECTAL],
+                           ErrorCode.RECTAL_TEMPERATURE_MISSING, ErrorCode.RECTAL_TEMPERATURE_OUT_OF_RANGE),
+    "ambient_temperature": (TEMPERATURE_LIMITS[TemperatureLimitsType.AMBIENT],
+                            ErrorCode.AMBIENT_TEMPERATURE_MISSING, ErrorCode.AMBIENT_TEMPERATURE_OUT_OF_RANGE),
+    "body_mass": (BODY_MASS_LIMIT, ErrorCode.BODY_MASS_MISSING, ErrorCode.BODY_MASS_OUT_OF_RANGE),
+}
+"""Limits, missing error and out of range error of each measured input parameter"""
+
+
+class ValidatedParameters(InputParameters):
+    __slots__ = ("field_errors",)
+
+    # Constructor
+    def __init__(self, field_errors, **values):
+        """
+        InputParameters checked once by validate(), whose result is shared by all methods:
+        measured values are normalized (floats, None when absent) and their ErrorCode stored
+
+        Parameters
+        ----------
+        field_errors : dict or iterable of tuples
+            ErrorCode of the invalid fields of VALIDATED_FIELDS, by name. Stored as a tuple of
+            (name, ErrorCode) pairs sorted by name, so that the object stays hashable and
+            compares by value, as any ValueObject
+        values
+            InputParameters members
+        """
+        super().__init__(**values)
+        self.field_errors = tuple(sorted(dict(field_errors).items()))
+
+    @classmethod
+    def _from_values(cls, field_errors: tuple, values: dict):
+        # Faster than the constructor as the write-once checks are skipped, the object being new
+        # (field_errors already being sorted pairs)
+        validated = object.__new__(cls)
+        for name, value in values.items():
+            object.__setattr__(validated, name, value)
+        object.__setattr__(validated, "field_errors", field_errors)
+        return validated
+
+    def error_code(self, fields) -> ErrorCode:
+        """
+        Parameters
+        ----------
+        fields : iterable of str
+            Input parameters read by a method (the ones without limits are ignored)
+
+        Returns
+        -------
+        ErrorCode
+            ErrorCode bitmask of the invalid fields (ErrorCode.NONE if they are all valid)
+        """
+        if not self.field_errors:
+            return ErrorCode.NONE
+        # Combined as integers, the ErrorCode operators being much slower
+        error_code = 0
+        for name, field_error in self.field_errors:
+            if name in fields:
+                error_code |= field_error.value
+        return ErrorCode(error_code)
+
+
+def validate_field(name: str, value: float) -> ErrorCode:
+    """
+    Checks a measured value against its limits (0 being absent, as an empty input)
+
+    Parameters
+    ----------
+    name : str
+        Field of VALIDATED_FIELDS
+    value : float
+
+    Returns
+    -------
+    ErrorCode
+    """
+    limits, missing_error, range_error = VALIDATED_FIELDS[name]
+    if not value:
+        return missing_error
+    if not (limits[0] <= value <= limits[1]):
+        return range_error
+    return ErrorCode.NONE
+
+
+def validate_field_batch(name: str, values: np.ndarray) -> np.ndarray:
+    """
+    Vectorized counterpart of validate_field (NaN being absent)
+
+    Parameters
+    ----------
+    name : str
+        Field of VALIDATED_FIELDS
+    values : np.ndarray
+
+    Returns
+    -------
+    np.ndarray
+        ErrorCode bitmask of each row
+    """
+    limits, missing_error, range_error = VALIDATED_FIELDS[name]
+    return validate_range_batch(values, limits, missing_error, range_error)
+
+
+def validate(input_parameters: InputParameters) -> ValidatedParameters:
+    """
+    Validation stage shared by all methods: each measured field is checked once
+
+    Parameters
+    ----------
+    input_parameters : InputParameters
+        Returned as is if already validated
+
+    Returns
+    -------
+    ValidatedParameters
+    """
+    if isinstance(input_parameters, ValidatedParameters):
+        return input_parameters
+
+    values = {name: getattr(input_parameters, name) for name in InputParameters.__slots__}
+    field_errors = []
+    for name in VALIDATED_FIELDS:
+        value = values[name]
+        values[name] = value = float(value) if value else None
+        field_error = validate_field(name, value)
+        if field_error:
+            field_errors.append((name, field_error))
+    field_errors.sort()
+    return ValidatedParameters._from_values(tuple(field_errors), values)
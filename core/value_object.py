@@ -0,0 +1,41 @@
+# core/value_object.py
+
+
+class ValueObject:
+    """
+    Base of the compact immutable objects (input parameters and results).
+
+    Subclasses list their attributes in __slots__ (no per-instance __dict__). Each attribute
+    can only be assigned once, by the constructor; the objects then compare and hash by value,
+    so they can be used as dictionary or cache keys.
+    """
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Attributes of the class and of its bases, in declaration order
+        cls._fields = tuple(name for klass in reversed(cls.__mro__) for name in klass.__dict__.get("__slots__", ()))
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"{type(self).__name__} is immutable, cannot set '{name}'")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable, cannot delete '{name}'")
+
+    def _values(self) -> tuple:
+        # Attribute values in declaration order
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self):
+        return hash((type(self), self._values()))
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self._values()))
+        return f"{type(self).__name__}({values})"
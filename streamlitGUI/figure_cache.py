@@ -0,0 +1,165 @@
+# streamlitGUI/figure_cache.py
+
+import io
+from typing import Callable, Optional, TYPE_CHECKING
+
+from core.cache import ResultCache
+from core.input_parameters import InputParameters
+from core.output_results import OutputResults
+from core.time_converter import TimeContext
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Constants
+FIGURE_CACHE = ResultCache(max_size=64, ttl=3600)
+"""Encoded figures shared by the user interface and the PDF report of all the sessions of this server process"""
+
+SESSION_FIGURE_BUDGET = 4 * 1024 ** 2
+"""Memory budget (in bytes) of the images kept in each session, the others being read from FIGURE_CACHE"""
+
+
+def figure_key(name: str, time_context: TimeContext, *data) -> tuple:
+    """
+    Content key of a figure: same key, same image.
+
+    Parameters
+    ----------
+    name : str
+        Kind of figure
+    time_context : TimeContext
+        Formatting context of the labels
+    data
+        Hashable values plotted (inputs, results)
+
+    Returns
+    -------
+    tuple
+    """
+    return (name, time_context.reference) + data
+
+
+def encode(figure: Optional['Figure'], image_format: str = "png") -> Optional[bytes]:
+    """
+    Renders a figure to encoded bytes, as st.pyplot and the former report did (tight bounding box,
+    resolution of the figure). Only the bytes are kept, the figure is released.
+
+    Parameters
+    ----------
+    figure : Figure
+        None for a figure that could not be plotted
+    image_format : str
+        Matplotlib output format (png, svg, pdf...)
+
+    Returns
+    -------
+    bytes
+        None if there is no figure
+    """
+    if figure is None:
+        return None
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=image_format, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def render(key: tuple, build_figure: Callable[[], Optional['Figure']], image_format: str = "png") -> Optional[bytes]:
+    """
+    Encoded figure of the key, only plotted and rendered on a miss of the shared cache.
+
+    Parameters
+    ----------
+    key : tuple
+        See figure_key
+    build_figure : callable
+        Returns the Figure to render (or None)
+    image_format : str
+        Matplotlib output format (png, svg, pdf...)
+
+    Returns
+    -------
+    bytes
+        None if there is no figure
+    """
+    return FIGURE_CACHE.get_or_compute((key, image_format), lambda: encode(build_figure(), image_format))
+
+
+def _plot():
+    # Matplotlib is only imported to plot a figure missing from the caches
+    from streamlitGUI import plot
+    return plot
+
+
+def figure_sources(input_parameters: InputParameters, results: OutputResults, time_context: TimeContext) -> dict:
+    """
+    Figures of the results, in display order
+
+    Parameters
+    ----------
+    input_parameters : InputParameters
+    results : OutputResults
+    time_context : TimeContext
+
+    Returns
+    -------
+    dict
+        Name -> (key, function plotting the figure), see render
+    """
+    return {
+        'comparison': (figure_key('comparison', time_context, results),
+                       lambda: _plot().plot_comparative_pmi_results(results, time_context)),
+        'henssge_rectal': (figure_key('henssge_rectal', time_context, input_parameters.ambient_temperature,
+                                      input_parameters.rectal_temperature, input_parameters.body_mass, results.henssge_rectal),
+                           lambda: _plot().plot_temperature_henssge_rectal(input_parameters, results.henssge_rectal, time_context)),
+        'henssge_brain': (figure_key('henssge_brain', time_context, input_parameters.ambient_temperature,
+                                     input_parameters.tympanic_temperature, results.henssge_brain),
+                          lambda: _plot().plot_temperature_henssge_brain(input_parameters, results.henssge_brain, time_context)),
+    }
+
+
+def render_session_images(sources: dict, budget: int = SESSION_FIGURE_BUDGET) -> dict:
+    """
+    Renders the figures and selects the images a session keeps, in display order within its budget
+
+    Parameters
+    ----------
+    sources : dict
+        See figure_sources
+    budget : int
+        Memory budget in bytes
+
+    Returns
+    -------
+    dict
+        Name -> encoded image
+    """
+    images = {}
+    used = 0
+    for name, (key, build_figure) in sources.items():
+        image = render(key, build_figure)
+        if image is not None and used + len(image) <= budget:
+            images[name] = image
+            used += len(image)
+    return images
+
+
+def session_images(session_state) -> dict:
+    """
+    Images of the results of a session: the ones it keeps, the others from FIGURE_CACHE (plotted
+    again on a miss)
+
+    Parameters
+    ----------
+    session_state : st.session_state
+        Holds the input_parameters, results_object, time_context and figure_images of the session
+
+    Returns
+    -------
+    dict
+        Name -> encoded image (None if the figure could not be plotted)
+    """
+    if session_state.get('results_object') is None:
+        return {}
+    sources = figure_sources(session_state.input_parameters, session_state.results_object, session_state.time_context)
+    kept = session_state.get('figure_images', {})
+    return {name: kept.get(name) or render(key, build_figure) for name, (key, build_figure) in sources.items()}
@@ -13,6 +13,8 @@ from reportlab.lib.enums import TA_LEFT
 
 import streamlit as st
 from core import time_converter
+from core.cache import ResultCache
+from streamlitGUI import figure_cache
 
 # --- Custom Paragraph Styles ---
 styles = getSampleStyleSheet()
@@ -51,6 +53,36 @@ style_results_title = ParagraphStyle(
     fontName='Times-Bold',
 )
 
+# --- Report Cache ---
+REPORT_INPUTS = ('input_t_tympanic', 'input_t_rectal', 'input_t_ambient', 'input_M', 'correction_mode', 'input_Cf',
+                 'body_condition', 'environment', 'supporting_base', 'idiomuscular_reaction', 'rigor', 'lividity',
+                 'lividity_disappearance', 'lividity_mobility')
+"""Session state inputs printed in the report"""
+
+_REPORT_CACHE = ResultCache(max_size=32, ttl=3600)
+"""PDF reports shared by the reruns and sessions of this server process, keyed by report_key()"""
+
+
+def report_key() -> tuple:
+    """
+    Key of the report of the current session: the results, their formatting context and the
+    printed inputs, which determine the whole document (figures included).
+    """
+    time_context = st.session_state.get('time_context', time_converter.DEFAULT_TIME_CONTEXT)
+    return ((time_context.reference, st.session_state.get('results_object'))
+            + tuple(st.session_state.get(name) for name in REPORT_INPUTS))
+
+
+def prepare_pdf() -> tuple:
+    """
+    Generates the PDF report of the current session, unless an identical one was already generated.
+
+    Returns:
+        (report_key(), PDF bytes)
+    """
+    key = report_key()
+    return key, _REPORT_CACHE.get_or_compute(key, generate_pdf)
+
 
 def generate_pdf() -> bytes:
     """
@@ -75,9 +107,12 @@ def generate_pdf() -> bytes:
     results_area_x = margin # Results at left
     input_area_x = margin + results_area_width + space_between_cols # Inputs at right
 
+    # Formatting context of the displayed results (the reference widgets may have changed since)
+    time_context = st.session_state.get('time_context', time_converter.DEFAULT_TIME_CONTEXT)
+
     # --- Conditional Main Title ---
     report_title = "Estimation of Post-Mortem Interval"
-    if st.session_state.get('use_reference_datetime', False):
+    if time_context.is_absolute():
         report_title = "Estimation of Time of Death"
     c.setFont("Helvetica-Bold", 16)
     c.drawString(margin, top_y - 0.3*inch, report_title)
@@ -91,9 +126,9 @@ def generate_pdf() -> bytes:
     # ADD "User Input:" TITLE TO THE LIST
     user_inputs_text.append("<u><b>User Input:</b></u>")
 
-    if st.session_state.get('use_reference_datetime', False):
-        ref_date_str = st.session_state.reference_date.strftime("%d/%m/%Y")
-        ref_time_str = st.session_state.reference_time.strftime("%Hh%M")
+    if time_context.is_absolute():
+        ref_date_str = time_context.reference.strftime("%d/%m/%Y")
+        ref_time_str = time_context.reference.strftime("%Hh%M")
         user_inputs_text.append(f"<b>Reference Time:</b> {ref_date_str} - {ref_time_str}")
     else:
         user_inputs_text.append("<b>Reference Time:</b> Not Used")
@@ -251,29 +286,16 @@ def generate_pdf() -> bytes:
         c.drawImage(img_reader, draw_x, draw_y, width=final_width, height=final_height)
 
     # --- Plot ---
-    if hasattr(st.session_state, 'fig_henssge_rectal') and st.session_state.fig_henssge_rectal is not None:
-        img_data_1 = io.BytesIO()
-        st.session_state.fig_henssge_rectal.savefig(img_data_1, format='png', bbox_inches='tight')
-        img_data_1.seek(0)
-        img_1 = ImageReader(img_data_1)
-        draw_image_scaled(img_1, graph1_x, graph1_y_bottom, graph1_width, graph_row_height) 
-        img_data_1.close()
-
-    if hasattr(st.session_state, 'fig_henssge_brain') and st.session_state.fig_henssge_brain is not None:
-        img_data_2 = io.BytesIO()
-        st.session_state.fig_henssge_brain.savefig(img_data_2, format='png', bbox_inches='tight')
-        img_data_2.seek(0)
-        img_2 = ImageReader(img_data_2)
-        draw_image_scaled(img_2, graph2_x, graph1_y_bottom, graph2_width, graph_row_height) 
-        img_data_2.close()
-
-    if hasattr(st.session_state, 'fig_comparison') and st.session_state.fig_comparison is not None:
-        img_data_3 = io.BytesIO()
-        st.session_state.fig_comparison.savefig(img_data_3, format='png', bbox_inches='tight')
-        img_data_3.seek(0)
-        img_3 = ImageReader(img_data_3)
-        draw_image_scaled(img_3, graph3_x, graph3_y_bottom, graph3_width, graph_row_height)
-        img_data_3.close()
+    # Same images as the user interface, rendered once (see figure_cache)
+    graph_areas = {
+        'henssge_rectal': (graph1_x, graph1_y_bottom, graph1_width),
+        'henssge_brain': (graph2_x, graph1_y_bottom, graph2_width),
+        'comparison': (graph3_x, graph3_y_bottom, graph3_width),
+    }
+    for name, image in figure_cache.session_images(st.session_state).items():
+        if image:
+            graph_x, graph_y_bottom, graph_width = graph_areas[name]
+            draw_image_scaled(ImageReader(io.BytesIO(image)), graph_x, graph_y_bottom, graph_width, graph_row_height)
 
     # --- Finalize PDF ---
     c.save()
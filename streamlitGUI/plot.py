@@ -1,5 +1,6 @@
 # streamlitGUI/plot.py
 
+import functools
 import math
 from typing import Optional
 
@@ -13,9 +14,134 @@ from core.constants import STANDARD_BODY_TEMPERATURE
 from core.input_parameters import InputParameters
 from core.output_results import HenssgeRectalResults, HenssgeBrainResults, OutputResults, PostMortemIntervalResults
 from core import time_converter
+from core.time_converter import TimeContext, DEFAULT_TIME_CONTEXT
 
+# Constants
+CURVE_MAX_TIME = 50
+"""Time span of the thermal curves (in hours)"""
 
-def plot_temperature_henssge_rectal(input_parameters: InputParameters, result: HenssgeRectalResults) -> Optional[Figure]:
+CURVE_SAMPLES = 100
+"""Number of points of the thermal curves"""
+
+_CURVE_GRID_SAMPLES = 2000
+"""Number of points of the grid the curve points are picked from"""
+
+_CURVE_MASS_DECIMALS = 3
+"""Decimals the body mass (times the corrective factor) is rounded to in the curve cache keys"""
+
+
+# --- Thermal Curve Utilities ---
+
+def _adaptive_curve(function, max_time: float = CURVE_MAX_TIME, num_samples: int = CURVE_SAMPLES) -> tuple:
+    """
+    Samples a curve densely where it bends and sparsely on its tail.
+
+    The function is evaluated once on a fine grid, then the points are picked so that each
+    interval between them holds the same share of the bending (absolute second difference),
+    half of the points being spread uniformly so that no part of the curve is left empty.
+
+    Parameters
+    ----------
+    function : callable
+        Array function of the time in hours
+    max_time : float
+    num_samples : int
+
+    Returns
+    -------
+    tuple
+        Read-only arrays (time, values)
+    """
+    grid = np.linspace(0, max_time, _CURVE_GRID_SAMPLES)
+    values = function(grid)
+
+    bending = np.zeros_like(grid)
+    bending[1:-1] = np.abs(np.diff(values, 2))
+    density = 0.5 * bending / bending.sum() + 0.5 / len(grid) if bending.any() else np.full(len(grid), 1.0 / len(grid))
+    cumulative = np.cumsum(density)
+    indices = np.unique(np.searchsorted(cumulative, np.linspace(0, cumulative[-1], num_samples), side='left'))
+    indices = np.union1d(indices.clip(0, len(grid) - 1), [0, len(grid) - 1])
+
+    time, values = grid[indices], values[indices]
+    time.flags.writeable = False
+    values.flags.writeable = False
+    return time, values
+
+
+@functools.lru_cache(maxsize=256)
+def _henssge_rectal_curve(cold_ambient: bool, corrected_body_mass: float) -> tuple:
+    """
+    Cached temperature quotient curve of the Henssge rectal method (shared by all the ambient
+    temperatures of one regime)
+
+    Parameters
+    ----------
+    cold_ambient : bool
+        Ambient temperature regime (at most 23°C)
+    corrected_body_mass : float
+        Body mass multiplied by the corrective factor
+
+    Returns
+    -------
+    tuple
+        Read-only arrays (time, temperature quotient)
+    """
+    # Any ambient temperature of the regime gives the same quotient curve
+    ambient_temperature = 23 if cold_ambient else 24
+    return _adaptive_curve(lambda time: henssge_rectal.temperature_decrease(time, ambient_temperature, corrected_body_mass))
+
+
+@functools.lru_cache(maxsize=None)
+def _henssge_brain_curve() -> tuple:
+    """
+    Cached temperature quotient curve of the Henssge brain method
+
+    Returns
+    -------
+    tuple
+        Read-only arrays (time, temperature quotient)
+    """
+    return _adaptive_curve(henssge_brain.temperature_decrease)
+
+
+def henssge_rectal_temperatures(ambient_temperature: float, corrected_body_mass: float) -> tuple:
+    """
+    Rectal temperatures through time according to the Henssge equation
+
+    Parameters
+    ----------
+    ambient_temperature : float
+    corrected_body_mass : float
+        Body mass multiplied by the corrective factor
+
+    Returns
+    -------
+    tuple
+        Arrays (time, temperatures)
+    """
+    time, quotient = _henssge_rectal_curve(ambient_temperature <= 23, round(corrected_body_mass, _CURVE_MASS_DECIMALS))
+    return time, ambient_temperature + (STANDARD_BODY_TEMPERATURE - ambient_temperature) * quotient
+
+
+def henssge_brain_temperatures(ambient_temperature: float) -> tuple:
+    """
+    Tympanic temperatures through time according to the Henssge equation
+
+    Parameters
+    ----------
+    ambient_temperature : float
+
+    Returns
+    -------
+    tuple
+        Arrays (time, temperatures)
+    """
+    time, quotient = _henssge_brain_curve()
+    return time, ambient_temperature + (STANDARD_BODY_TEMPERATURE - ambient_temperature) * quotient
+
+
+def plot_temperature_henssge_rectal(input_parameters: InputParameters, result: HenssgeRectalResults,
+                                    time_context: TimeContext = DEFAULT_TIME_CONTEXT) -> Optional[Figure]:
     """
     Plots the post-mortem thermal decay curve according to the Henssge equation.
 
@@ -30,6 +156,8 @@ def plot_temperature_henssge_rectal(input_parameters: InputParameters, result: H
         input_parameters from user
     result : HenssgeRectalResults
         result from Henssge rectal computation
+    time_context : TimeContext
+        Formatting context of the PMI labels
 
     Returns
     -------
@@ -46,12 +174,8 @@ def plot_temperature_henssge_rectal(input_parameters: InputParameters, result: H
     ax = fig.add_subplot(111)
 
     # Build temperatures through time
-    max_time = 50
-    time = np.linspace(0, max_time, 100)
-    temperatures = [input_parameters.ambient_temperature 
-                    + (STANDARD_BODY_TEMPERATURE - input_parameters.ambient_temperature) 
-                    * henssge_rectal.temperature_decrease(t, input_parameters.ambient_temperature, input_parameters.body_mass * result.corrective_factor) for
-                    t in time]
+    time, temperatures = henssge_rectal_temperatures(input_parameters.ambient_temperature,
+                                                     input_parameters.body_mass * result.corrective_factor)
 
     ax.plot(time, temperatures, label="Thermal evolution")
     ax.axhline(y=input_parameters.rectal_temperature, color='r', linestyle='--', label=f"Current temperature: {input_parameters.rectal_temperature} °C")
@@ -60,8 +184,8 @@ def plot_temperature_henssge_rectal(input_parameters: InputParameters, result: H
     pmi_min = result.pmi_min()
     pmi_max = result.pmi_max()
 
-    scatter_label = time_converter.format_plot_scatter_label(pmi_center)
-    ci_label = time_converter.format_plot_ci_label(pmi_min, pmi_max)
+    scatter_label = time_converter.format_plot_scatter_label(pmi_center, time_context)
+    ci_label = time_converter.format_plot_ci_label(pmi_min, pmi_max, time_context)
 
     ax.scatter(pmi_center, input_parameters.rectal_temperature, color='b', label=scatter_label)
     ax.axvspan(pmi_min, pmi_max, color='green', alpha=0.3, label=ci_label)
@@ -76,7 +200,8 @@ def plot_temperature_henssge_rectal(input_parameters: InputParameters, result: H
     return fig
 
 
-def plot_temperature_henssge_brain(input_parameters: InputParameters, result: HenssgeBrainResults) -> Optional[Figure]:
+def plot_temperature_henssge_brain(input_parameters: InputParameters, result: HenssgeBrainResults,
+                                   time_context: TimeContext = DEFAULT_TIME_CONTEXT) -> Optional[Figure]:
     """
     Plots the post-mortem brain thermal decay curve according to the Henssge equation.
 
@@ -92,6 +217,8 @@ def plot_temperature_henssge_brain(input_parameters: InputParameters, result: He
         input_parameters from user
     result : HenssgeBrainResults
         result from Henssge brain computation
+    time_context : TimeContext
+        Formatting context of the PMI labels
 
     Returns
     -------
@@ -108,12 +235,7 @@ def plot_temperature_henssge_brain(input_parameters: InputParameters, result: He
     ax = fig.add_subplot(111)
 
     # Build temperatures through time
-    max_time = 50
-    time = np.linspace(0, max_time, 100)
-    temperatures = [input_parameters.ambient_temperature
-                    + (STANDARD_BODY_TEMPERATURE - input_parameters.ambient_temperature)
-                    * henssge_brain.temperature_decrease(t) 
-                    for t in time]
+    time, temperatures = henssge_brain_temperatures(input_parameters.ambient_temperature)
 
     ax.plot(time, temperatures, label="Thermal evolution")
     ax.axhline(y=input_parameters.tympanic_temperature, color='r', linestyle='--', label=f"Current temperature : {input_parameters.tympanic_temperature} °C")
@@ -122,8 +244,8 @@ def plot_temperature_henssge_brain(input_parameters: InputParameters, result: He
     pmi_min = result.pmi_min()
     pmi_max = result.pmi_max()
 
-    scatter_label = time_converter.format_plot_scatter_label(pmi_center)
-    ci_label = time_converter.format_plot_ci_label(pmi_min, pmi_max)
+    scatter_label = time_converter.format_plot_scatter_label(pmi_center, time_context)
+    ci_label = time_converter.format_plot_ci_label(pmi_min, pmi_max, time_context)
 
     ax.scatter(pmi_center, input_parameters.tympanic_temperature, color='b', label=scatter_label)
     ax.axvspan(pmi_min, pmi_max, color='green', alpha=0.3, label=ci_label)
@@ -147,17 +269,18 @@ def _inverse_hybrid_scale(x, threshold=20, compression_factor=8):
     """Inverse of the hybrid scale transformation."""
     return np.where(x <= threshold, x, threshold + (x - threshold) * compression_factor)
 
-def _add_mustache_box(ax: plt.Axes, vertical_index: int, left: float, right: float, color: str, center: Optional[float] = None) -> None:
+def _add_mustache_box(ax: plt.Axes, vertical_index: int, left: float, right: float, color: str, center: Optional[float] = None,
+                      time_context: TimeContext = DEFAULT_TIME_CONTEXT) -> None:
     """
     Draws a mustache box with specific text positioning and fixed color.
     Interval values BELOW line, Central estimate value ABOVE line.
     """
     vertical_offset = 0.4 
     plot_center_hour = center if center is not None else (left + right) / 2.0
-    center_label, left_label, right_label = time_converter.format_plot_mustache_labels(left, right, center)
+    center_label, left_label, right_label = time_converter.format_plot_mustache_labels(left, right, center, time_context)
     
     # Determine if the x-axis is inverted
-    is_inverted = time_converter.get_reference_datetime() is not None
+    is_inverted = time_context.is_absolute()
     
     # Text Positioning
     # For mean value, text is below the line
@@ -174,11 +297,12 @@ def _add_mustache_box(ax: plt.Axes, vertical_index: int, left: float, right: flo
     ax.errorbar([plot_center_hour], [vertical_index], xerr=[[plot_center_hour - left], [right - plot_center_hour]],
                 fmt='o', markersize=4, color=color, capsize=4, lw=1.5)
 
-def _add_zone_box(ax: plt.Axes, vertical_index: int, position: float, valid_side: str, color: str) -> None:
+def _add_zone_box(ax: plt.Axes, vertical_index: int, position: float, valid_side: str, color: str,
+                  time_context: TimeContext = DEFAULT_TIME_CONTEXT) -> None:
     """Draws a shaded zone and line for one-sided intervals with a fixed color."""
     x_min_lim, x_max_lim = ax.get_xlim()
     left_shade, right_shade = x_min_lim, x_max_lim
-    text_label, text_horizontal_align = time_converter.format_plot_zone_label(position, valid_side)
+    text_label, text_horizontal_align = time_converter.format_plot_zone_label(position, valid_side, time_context)
     if valid_side == 'upper': right_shade = position # Grey zone on the right side
     elif valid_side == 'lower': left_shade = position # Grey zone on the left side
     else: return
@@ -187,20 +311,21 @@ def _add_zone_box(ax: plt.Axes, vertical_index: int, position: float, valid_side
     ax.text(position, vertical_index, text_label, ha=text_horizontal_align, va='center', fontsize=10, color=color,
             bbox=dict(facecolor='white', alpha=0.7, pad=0.1, boxstyle='round,pad=0.2'))
 
-def _plot_post_mortem_interval_result(ax: plt.Axes, vertical_index: int, result: PostMortemIntervalResults, color: str) -> None:
+def _plot_post_mortem_interval_result(ax: plt.Axes, vertical_index: int, result: PostMortemIntervalResults, color: str,
+                                      time_context: TimeContext = DEFAULT_TIME_CONTEXT) -> None:
     """Determines plot type (mustache/zone) and passes the fixed color along."""
     if result is None or result.min is None or result.max is None: return
     if np.isclose(result.min, 0.0) and result.max != float('inf'):
-        _add_zone_box(ax, vertical_index, position=result.max, valid_side='lower', color=color)
+        _add_zone_box(ax, vertical_index, position=result.max, valid_side='lower', color=color, time_context=time_context)
     elif result.max == float('inf') and not np.isclose(result.min, 0.0):
-         _add_zone_box(ax, vertical_index, position=result.min, valid_side='upper', color=color)
+         _add_zone_box(ax, vertical_index, position=result.min, valid_side='upper', color=color, time_context=time_context)
     elif not np.isclose(result.min, 0.0) and result.max != float('inf'):
-         _add_mustache_box(ax, vertical_index, left=result.min, right=result.max, color=color, center=None) 
+         _add_mustache_box(ax, vertical_index, left=result.min, right=result.max, color=color, center=None, time_context=time_context) 
 
 
 # --- Main Comparative Plot Function ---
 
-def plot_comparative_pmi_results(result: OutputResults) -> Optional[Figure]:
+def plot_comparative_pmi_results(result: OutputResults, time_context: TimeContext = DEFAULT_TIME_CONTEXT) -> Optional[Figure]:
     """
     Plots a comparative graph with FIXED Y-axis, fixed size, and fixed colors.
 
@@ -210,6 +335,7 @@ def plot_comparative_pmi_results(result: OutputResults) -> Optional[Figure]:
 
     Args:
         result: The main OutputResults object containing results from all computations.
+        time_context: Formatting context of the axis and labels (absolute times reverse the X-axis).
 
     Returns:
         A Matplotlib Figure object with the comparative plot. May be empty visually
@@ -250,7 +376,7 @@ def plot_comparative_pmi_results(result: OutputResults) -> Optional[Figure]:
 
     # --- Determine X-axis ---
     # Determine wheter X-axis should be reversed
-    invert_x_axis = time_converter.get_reference_datetime() is not None
+    invert_x_axis = time_context.is_absolute()
     # Determine X-axis limits
     relevant_x_values = []
     # Iterate through result attributes directly to find max X extent needed
@@ -337,9 +463,9 @@ def plot_comparative_pmi_results(result: OutputResults) -> Optional[Figure]:
                 
                 # Plot using appropriate function
                 if item_type == 'sign':
-                    _plot_post_mortem_interval_result(ax, y_index, res_obj, color=item_color)
+                    _plot_post_mortem_interval_result(ax, y_index, res_obj, color=item_color, time_context=time_context)
                 elif plot_min is not None and plot_max is not None:
-                    _add_mustache_box(ax, y_index, left=plot_min, right=plot_max, color=item_color, center=center_value)
+                    _add_mustache_box(ax, y_index, left=plot_min, right=plot_max, color=item_color, center=center_value, time_context=time_context)
                     
         except Exception as e: # Catch any unexpected error during processing/plotting
              print(f"Error processing or plotting item '{label}': {e}")
@@ -348,7 +474,7 @@ def plot_comparative_pmi_results(result: OutputResults) -> Optional[Figure]:
 
     # --- Final Touches ---
     # Set X-axis adaptable Ticks Labels
-    tick_labels = time_converter.generate_plot_x_tick_labels(ticks)
+    tick_labels = time_converter.generate_plot_x_tick_labels(ticks, time_context)
     ax.set_xticklabels(tick_labels, ha='center', fontsize=10)
     
     # Conditionally invert X-axis 
@@ -370,7 +496,7 @@ def plot_comparative_pmi_results(result: OutputResults) -> Optional[Figure]:
         ytick.set_fontsize(11) 
 
     ax.set_ylabel('Method', labelpad=10, fontsize=14) 
-    xlabel = time_converter.format_plot_xlabel()
+    xlabel = time_converter.format_plot_xlabel(time_context)
     ax.set_xlabel(xlabel, fontsize=14)
     ax.set_title('Comparison of Estimated Post-Mortem Intervals', pad=10, fontsize=16)
 
@@ -3,14 +3,17 @@
 import streamlit as st
 from datetime import datetime, date, time
 from core import compute, time_converter
+from core.cache import ResultCache
 from core.constants import (IdiomuscularReactionType, SupportingBase, EnvironmentType, BodyCondition, RigorType, LividityType, 
                             LividityMobilityType, LividityDisappearanceType,TEMPERATURE_LIMITS, TemperatureLimitsType, BODY_MASS_LIMIT)
 from core.input_parameters import InputParameters
-from streamlitGUI import plot
+from streamlitGUI import figure_cache
 from streamlitGUI.help import build_help_section
-from streamlitGUI.pdf_generation import generate_pdf
 from streamlitGUI.tools import convert_decimal_separator
 
+_RESULT_CACHE = ResultCache(max_size=512, ttl=3600)
+"""Results shared by the reruns and sessions of this server process"""
+
 def _build_input_parameters() -> InputParameters:
     """
     Constructs an InputParameters object from the current Streamlit session state.
@@ -81,7 +84,7 @@ def _init_state() -> None:
     - Temperature input fields (empty strings)
     - Body parameters (empty strings or default enumerations)
     - Thanatological signs (default to NOT_SPECIFIED)
-    - Result storage variables (empty string or None for figures)
+    - Result storage variables (empty string, None or no figure images)
     Returns:
         None
     """
@@ -123,12 +126,14 @@ def _init_state() -> None:
         st.session_state.results = ""
     if 'results_object' not in st.session_state:
          st.session_state.results_object = None
-    if 'fig_henssge_rectal' not in st.session_state:
-        st.session_state.fig_henssge_rectal = None
-    if 'fig_henssge_brain' not in st.session_state:
-        st.session_state.fig_henssge_brain = None
-    if 'fig_comparison' not in st.session_state:
-        st.session_state.fig_comparison = None
+    if 'time_context' not in st.session_state:
+        st.session_state.time_context = time_converter.DEFAULT_TIME_CONTEXT
+    if 'input_parameters' not in st.session_state:
+        st.session_state.input_parameters = None
+    if 'figure_images' not in st.session_state:
+        st.session_state.figure_images = {}
+    if 'pdf_report' not in st.session_state:
+        st.session_state.pdf_report = None
     
 def _reset() -> None:
     """
@@ -136,7 +141,7 @@ def _reset() -> None:
     
     This function:
     1. Clears all session state variables to remove user inputs
-    2. Explicitly resets figure objects to None
+    2. Explicitly resets the figure images
     3. Displays a success message to confirm the reset
     4. Forces a page rerun to refresh all UI components
     
@@ -152,9 +157,7 @@ def _reset() -> None:
         del st.session_state[key]
 
     # Reset figures
-    st.session_state.fig_henssge_rectal = None
-    st.session_state.fig_henssge_brain = None
-    st.session_state.fig_comparison = None
+    st.session_state.figure_images = {}
     st.success("The application has been successfully reset.")
 
     # Force page rerun to reset all widgets
@@ -194,21 +197,58 @@ def _on_calculate():
         except Exception as e:
             st.error(f"Error combining date and time: {e}")
 
-    # Set the reference in the time_converter module
-    time_converter.set_reference_datetime(ref_dt)
+    # Formatting context of this session (never shared with other sessions)
+    time_context = time_converter.TimeContext(ref_dt)
+    st.session_state.time_context = time_context
 
     # Inputs
     input_parameters = _build_input_parameters()
 
-    # Results
-    results_obj = compute.run(input_parameters)
+    # Results, only the methods whose inputs changed since the displayed results being computed again
+    # (the figures of the unchanged ones are then found in figure_cache)
+    previous = st.session_state.results_object if st.session_state.input_parameters is not None else None
+    results_obj = compute.run(input_parameters, cache=_RESULT_CACHE, previous=previous,
+                              previous_input_parameters=st.session_state.input_parameters)
     st.session_state.results_object = results_obj
-    st.session_state.results = str(results_obj)
+    st.session_state.results = results_obj.to_string(time_context)
+
+    st.session_state.input_parameters = input_parameters
+
+    # Plots, kept as encoded images only (the figures are released once rendered)
+    sources = figure_cache.figure_sources(input_parameters, results_obj, time_context)
+    st.session_state.figure_images = figure_cache.render_session_images(sources)
+
+def _on_prepare_report():
+    """
+    Generates the PDF report when the Prepare button is clicked (instead of on every rerun).
+
+    The report is stored in the session state with the key of the content it was generated from
+    (see pdf_generation.report_key), so that it is only offered for download while it matches the
+    displayed results. Identical reports are shared by the sessions (see pdf_generation.prepare_pdf).
+
+    Returns:
+    --------
+    None
+        The function updates the session state but returns no value
+    """
+    from streamlitGUI.pdf_generation import prepare_pdf  # Imports reportlab, only needed for the reports
 
-    # Plots
-    st.session_state.fig_henssge_rectal = plot.plot_temperature_henssge_rectal(input_parameters, results_obj.henssge_rectal) 
-    st.session_state.fig_henssge_brain = plot.plot_temperature_henssge_brain(input_parameters, results_obj.henssge_brain)
-    st.session_state.fig_comparison = plot.plot_comparative_pmi_results(results_obj)
+    st.session_state.pdf_report = prepare_pdf()
+
+def _is_pdf_report_current() -> bool:
+    """
+    Checks whether the prepared PDF report still matches the displayed results (see pdf_generation.report_key).
+
+    Returns:
+    --------
+    bool
+        False if no report was prepared, pdf_generation (and reportlab) being only imported with a report
+    """
+    if st.session_state.pdf_report is None:
+        return False
+    from streamlitGUI.pdf_generation import report_key
+
+    return st.session_state.pdf_report[0] == report_key()
 
 def build_main_ui():
     """Builds the main Streamlit user interface."""
@@ -252,31 +292,6 @@ def build_main_ui():
 
         st.subheader("Parameters")
 
-        # Text inputs with session_state keys
-        tympanic_temperature_input = st.text_input(
-            "Tympanic temperature (°C) : ",
-            key="input_t_tympanic",
-            help=f"Enter the tympanic temperature in degrees Celsius. Expected range: {tympanic_min}°C to {tympanic_max}°C."
-        )
-
-        rectal_temperature_input = st.text_input(
-            "Rectal temperature (°C) : ",
-            key="input_t_rectal",
-            help=f"Enter the rectal temperature in degrees Celsius. Expected range: {rectal_min}°C to {rectal_max}°C."
-        )
-
-        ambient_temperature_input = st.text_input(
-            "Ambient temperature (°C) : ",
-            key="input_t_ambient",
-            help=f"Enter the ambient temperature in degrees Celsius. Expected range: {ambient_min}°C to {ambient_max}°C."
-        )
-
-        body_weight_input = st.text_input(
-            "Body weight (kg) : ",
-            key="input_M",
-            help=f"Enter the body weight in kilograms. Expected range: {mass_min} kg to {mass_max} kg."
-        )
-
         # Radio selector for choosing between manual and predefined corrective factor
         correction_mode = st.radio(
             "Corrective factor mode:",
@@ -285,109 +300,137 @@ def build_main_ui():
             help="Choose how the corrective factor (Cf) for cooling calculation is determined: either automatically based on predefined conditions, or by entering a specific value manually."
         )
 
-        # Display different inputs based on the selected mode
-        if st.session_state.correction_mode == "Manual input":
-            # Show only manual input field
-            corrective_factor_input = st.text_input(
-                "Corrective factor (Cf) : ",
-                key="input_Cf",
-                help="Enter the specific corrective factor manually. Typical values range from ~0.35 to ~1.8, but depend heavily on circumstances. Refer to the documentation for more details."
+        # Fields committed together by the Calculate button: editing them does not rerun the script
+        with st.form("parameters_form", border=False):
+            # Text inputs with session_state keys
+            tympanic_temperature_input = st.text_input(
+                "Tympanic temperature (°C) : ",
+                key="input_t_tympanic",
+                help=f"Enter the tympanic temperature in degrees Celsius. Expected range: {tympanic_min}°C to {tympanic_max}°C."
             )
-            
-            # Hide the dropdown lists but keep them in session state with default values
-            st.session_state.body_condition = st.session_state.get('body_condition', BodyCondition.NOT_SPECIFIED)
-            st.session_state.environment = st.session_state.get('environment', EnvironmentType.NOT_SPECIFIED)
-            st.session_state.supporting_base = st.session_state.get('supporting_base', SupportingBase.NOT_SPECIFIED)
-        else:
-            # Show predefined options with dropdown lists
-            # Reset manual input if switching from manual to predefined
-            if 'input_Cf' in st.session_state:
-                st.session_state.input_Cf = ""
-                
-            body_condition_selectbox = st.selectbox(
-                "Body condition :",
-                options=BodyCondition,
-                key="body_condition",
-                help="Select the condition of the body's clothing or covering. Influences heat loss."
+
+            rectal_temperature_input = st.text_input(
+                "Rectal temperature (°C) : ",
+                key="input_t_rectal",
+                help=f"Enter the rectal temperature in degrees Celsius. Expected range: {rectal_min}°C to {rectal_max}°C."
             )
 
-            environment_selectbox = st.selectbox(
-                "Environment :",
-                options=EnvironmentType,
-                key="environment",
-                help="Select the environment where the body was found (air, water ; stable or in motion). Influences heat loss."
+            ambient_temperature_input = st.text_input(
+                "Ambient temperature (°C) : ",
+                key="input_t_ambient",
+                help=f"Enter the ambient temperature in degrees Celsius. Expected range: {ambient_min}°C to {ambient_max}°C."
             )
 
-            supporting_base_selectbox = st.selectbox(
-                "Supporting base :",
-                options=SupportingBase,
-                key="supporting_base",
-                help="Select the surface the body was resting on. Can insulate or accelerate cooling."
+            body_weight_input = st.text_input(
+                "Body weight (kg) : ",
+                key="input_M",
+                help=f"Enter the body weight in kilograms. Expected range: {mass_min} kg to {mass_max} kg."
             )
 
-        # Thanatological signs
-        st.subheader("Thanatological Signs")
-        idiomuscular_reaction_selectbox = st.selectbox(
-            "Idiomuscular Reaction :",
-            options=IdiomuscularReactionType,
-            key="idiomuscular_reaction",
-            help="Select the observed muscle reaction upon mechanical stimulation (e.g., percussion). Helps estimate early PMI."
-        )
+            # Display different inputs based on the selected mode
+            if st.session_state.correction_mode == "Manual input":
+                # Show only manual input field
+                corrective_factor_input = st.text_input(
+                    "Corrective factor (Cf) : ",
+                    key="input_Cf",
+                    help="Enter the specific corrective factor manually. Typical values range from ~0.35 to ~1.8, but depend heavily on circumstances. Refer to the documentation for more details."
+                )
+            
+                # Hide the dropdown lists but keep them in session state with default values
+                st.session_state.body_condition = st.session_state.get('body_condition', BodyCondition.NOT_SPECIFIED)
+                st.session_state.environment = st.session_state.get('environment', EnvironmentType.NOT_SPECIFIED)
+                st.session_state.supporting_base = st.session_state.get('supporting_base', SupportingBase.NOT_SPECIFIED)
+            else:
+                # Show predefined options with dropdown lists
+                # Reset manual input if switching from manual to predefined
+                if 'input_Cf' in st.session_state:
+                    st.session_state.input_Cf = ""
+                
+                body_condition_selectbox = st.selectbox(
+                    "Body condition :",
+                    options=BodyCondition,
+                    key="body_condition",
+                    help="Select the condition of the body's clothing or covering. Influences heat loss."
+                )
+
+                environment_selectbox = st.selectbox(
+                    "Environment :",
+                    options=EnvironmentType,
+                    key="environment",
+                    help="Select the environment where the body was found (air, water ; stable or in motion). Influences heat loss."
+                )
+
+                supporting_base_selectbox = st.selectbox(
+                    "Supporting base :",
+                    options=SupportingBase,
+                    key="supporting_base",
+                    help="Select the surface the body was resting on. Can insulate or accelerate cooling."
+                )
+
+            # Thanatological signs
+            st.subheader("Thanatological Signs")
+            idiomuscular_reaction_selectbox = st.selectbox(
+                "Idiomuscular Reaction :",
+                options=IdiomuscularReactionType,
+                key="idiomuscular_reaction",
+                help="Select the observed muscle reaction upon mechanical stimulation (e.g., percussion). Helps estimate early PMI."
+            )
 
-        rigor_selectbox = st.selectbox(
-            "Type of Rigor :",
-            options=RigorType,
-            key="rigor",
-            help="Select the stage of rigor mortis (body stiffening)."
-        )
+            rigor_selectbox = st.selectbox(
+                "Type of Rigor :",
+                options=RigorType,
+                key="rigor",
+                help="Select the stage of rigor mortis (body stiffening)."
+            )
 
-        lividity_type_selectbox = st.selectbox(
-            "Type of Lividity :",
-            options=LividityType,
-            key="lividity",
-            help="Select the development stage of livor mortis"
-        )
+            lividity_type_selectbox = st.selectbox(
+                "Type of Lividity :",
+                options=LividityType,
+                key="lividity",
+                help="Select the development stage of livor mortis"
+            )
 
-        lividity_mobility_selectbox = st.selectbox(
-            "Lividity Mobility :",
-            options=LividityMobilityType,
-            key="lividity_mobility",
-            help="Select lividity shifting when body position is modified (indicates fixation)."
-        )
+            lividity_mobility_selectbox = st.selectbox(
+                "Lividity Mobility :",
+                options=LividityMobilityType,
+                key="lividity_mobility",
+                help="Select lividity shifting when body position is modified (indicates fixation)."
+            )
 
-        lividity_disappearance_selectbox = st.selectbox(
-            "Disappearance of Lividity :",
-            options=LividityDisappearanceType,
-            key="lividity_disappearance",
-            help="Select disappearance of lividity under pressure (indicates fixation)."
-        )
+            lividity_disappearance_selectbox = st.selectbox(
+                "Disappearance of Lividity :",
+                options=LividityDisappearanceType,
+                key="lividity_disappearance",
+                help="Select disappearance of lividity under pressure (indicates fixation)."
+            )
+
+            st.form_submit_button("Calculate", on_click=_on_calculate)
 
         # --- Action Buttons ---
 
-        st.button("Calculate", on_click=_on_calculate)
-            
         if st.button("Reset"):
             _reset()
 
-        pdf_download = st.download_button(
-            label="Download PDF",
-            data=generate_pdf() if 'clicked' not in st.session_state else None,
-            file_name="results.pdf",
-            mime="application/pdf",
-            key='pdf_button'
-        )
+        # PDF report, generated on demand: outdated once the results or the printed inputs change
+        if _is_pdf_report_current():
+            pdf_download = st.download_button(
+                label="Download PDF",
+                data=st.session_state.pdf_report[1],
+                file_name="results.pdf",
+                mime="application/pdf",
+                key='pdf_button'
+            )
 
-        if pdf_download:
-            st.success("PDF downloaded successfully")
+            if pdf_download:
+                st.success("PDF downloaded successfully")
+        else:
+            st.button("Prepare PDF report", on_click=_on_prepare_report)
 
     # --- Result Area Display ---
     st.header("Results")
     st.write(st.session_state.results)
 
-    # Display graphs
-    if st.session_state.fig_comparison:
-        st.pyplot(st.session_state.fig_comparison)
-    if st.session_state.fig_henssge_rectal:
-        st.pyplot(st.session_state.fig_henssge_rectal)
-    if st.session_state.fig_henssge_brain:
-        st.pyplot(st.session_state.fig_henssge_brain)
+    # Display graphs, rendered once for the screen and the PDF report (see figure_cache)
+    for image in figure_cache.session_images(st.session_state).values():
+        if image:
+            st.image(image, use_container_width=True)
@@ -0,0 +1,72 @@
+# tests/computations/test_common.py
+
+import itertools
+import math
+import unittest
+
+import numpy as np
+
+from core.computations.common import solve_monotonic, solve_monotonic_batch, determine_corrective_factor, determine_corrective_factor_batch
+from core.constants import BodyCondition, EnvironmentType, SupportingBase
+
+data_test = [
+    # --------------------- Increasing function
+    (lambda t: t ** 3, lambda t: 3 * t ** 2, 8.0, 0.0, 10.0, 2.0),
+    # --------------------- Decreasing function
+    (lambda t: np.exp(-t), lambda t: -np.exp(-t), 0.5, 0.0, 10.0, math.log(2.0)),
+    # --------------------- Vanishing derivative at the root (bisection fallback)
+    (lambda t: (t - 1.0) ** 3, lambda t: 3 * (t - 1.0) ** 2, 0.0, -3.0, 2.0, 1.0),
+]
+
+data_test_corrective_factor = [
+    # body_condition, environment, supporting_base, user_corrective_factor, body_mass, expected
+    (BodyCondition.NAKED, EnvironmentType.MOVING_AIR, SupportingBase.WET_LEAVES, None, 80, 1.983),
+    (BodyCondition.HEAVILY, EnvironmentType.STILL_AIR, SupportingBase.MATTRESS, None, 50, 2.111),
+    (None, None, None, None, 80, 1.0),
+    (BodyCondition.WARMLY, EnvironmentType.STILL_WATER, None, 0.9, 120, 0.94),
+]
+
+
+class Test(unittest.TestCase):
+    def test_solve_monotonic(self):
+        for function, derivative, target, lower, upper, expected_root in data_test:
+            result = solve_monotonic(function, derivative, target, lower, upper)
+
+            self.assertTrue(result.converged)
+            self.assertAlmostEqual(expected_root, result.root, delta=1e-6)
+            self.assertAlmostEqual(function(result.root) - target, result.residual)
+            self.assertLessEqual(result.iterations, 100)
+
+    def test_solve_monotonic_without_root(self):
+        with self.assertRaises(ValueError):
+            solve_monotonic(lambda t: np.exp(-t), lambda t: -np.exp(-t), 2.0, 0.0, 10.0)
+
+    def test_solve_monotonic_batch(self):
+        target = np.array([0.5, 0.25, 2.0, np.nan])
+        result = solve_monotonic_batch(lambda t: np.exp(-t), lambda t: -np.exp(-t), target, 0.0, 10.0)
+
+        np.testing.assert_allclose([math.log(2.0), math.log(4.0)], result.root[:2], rtol=1e-12)
+        np.testing.assert_array_equal([True, True, False, False], result.converged)
+        self.assertTrue(np.isnan(result.root[2:]).all())
+
+    def test_determine_corrective_factor(self):
+        for body_condition, environment, supporting_base, user_corrective_factor, body_mass, expected in data_test_corrective_factor:
+            self.assertEqual(expected, determine_corrective_factor(body_condition, environment, supporting_base, user_corrective_factor, body_mass))
+
+    def test_determine_corrective_factor_batch(self):
+        # Every combination, including missing values, gives the scalar result
+        rows = list(itertools.product([None] + list(BodyCondition), [None] + list(EnvironmentType), [None] + list(SupportingBase),
+                                      [None, 0.8, 1.0], [1.0, 70.0, 80.0, 199.0]))
+        expected = [determine_corrective_factor(*row) for row in rows]
+        body_condition, environment, supporting_base, user_corrective_factor, body_mass = zip(*rows)
+
+        results = determine_corrective_factor_batch(body_condition, environment, supporting_base,
+                                                    [np.nan if value is None else value for value in user_corrective_factor], body_mass)
+        np.testing.assert_array_equal(expected, results)
+
+        # Enum codes are accepted as well as members
+        results = determine_corrective_factor_batch([member.value if member else 0 for member in body_condition],
+                                                    [member.value if member else 0 for member in environment],
+                                                    [member.value if member else 0 for member in supporting_base],
+                                                    [np.nan if value is None else value for value in user_corrective_factor], body_mass)
+        np.testing.assert_array_equal(expected, results)
@@ -1,8 +1,10 @@
 # tests/computations/test_hennsge_brain.py
 
 import unittest
+import warnings
 
 import core.computations.henssge_brain
+from core.constants import ErrorCode
 from core.input_parameters import InputParameters
 from core.output_results import HenssgeBrainResults
 
@@ -23,6 +25,21 @@ data_test = [
         post_mortem_interval=5.2608129668058226,
         confidence_interval=1.5
     )),
+    # --------------------- Tympanic temperature close to the standard body temperature
+    (InputParameters(
+        tympanic_temperature=37.199,
+        ambient_temperature=15
+    ), HenssgeBrainResults(
+        post_mortem_interval=0.028221042219659855,
+        confidence_interval=1.5
+    )),
+    # --------------------- No solution (tympanic temperature above standard body temperature)
+    (InputParameters(
+        tympanic_temperature=37.4,
+        ambient_temperature=15
+    ), HenssgeBrainResults(
+        error_message="Any Error"
+    )),
     # --------------------- Error Test
     (InputParameters(
         tympanic_temperature=300,
@@ -44,7 +61,16 @@ class Test(unittest.TestCase):
             if expected_result.error_message:
                 self.assertTrue(results.error_message, "Error expected\n" + str(input_parameters))
             else:
-                self.assertEqual(expected_result.post_mortem_interval, results.post_mortem_interval,
-                                 "Bad PostMortemInterval with following inputs:\n" + str(input_parameters))
+                self.assertAlmostEqual(expected_result.post_mortem_interval, results.post_mortem_interval, delta=1e-9,
+                                       msg="Bad PostMortemInterval with following inputs:\n" + str(input_parameters))
                 self.assertEqual(expected_result.confidence_interval, results.confidence_interval,
                                  "Bad ConfidenceInterval with following inputs:\n" + str(input_parameters))
+
+    def test_compute_inverse_table_without_solution(self):
+        # Q = 0 (tympanic at ambient temperature) must not reach the table lookup
+        input_parameters = InputParameters(tympanic_temperature=20.0, ambient_temperature=20.0)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            results = core.computations.henssge_brain.compute(input_parameters, use_inverse_table=True)
+
+        self.assertEqual(ErrorCode.NO_SOLUTION, results.error_code)
@@ -1,9 +1,12 @@
 # tests/computations/test_hennsge_rectal.py
 
 import unittest
+import warnings
+
+import numpy as np
 
 import core.computations.henssge_rectal
-from core.constants import BodyCondition, EnvironmentType, SupportingBase
+from core.constants import BodyCondition, EnvironmentType, SupportingBase, ErrorCode
 from core.input_parameters import InputParameters
 from core.output_results import HenssgeRectalResults
 
@@ -63,6 +66,22 @@ data_test = [
         thermal_quotient=0.5813953488372092,
         corrective_factor=0.465
     )),
+    # --------------------- No solution (rectal temperature below ambient temperature)
+    (InputParameters(
+        rectal_temperature=10,
+        ambient_temperature=15,
+        body_mass=80
+    ), HenssgeRectalResults(
+        error_message="Any Error"
+    )),
+    # --------------------- No solution (rectal temperature above standard body temperature)
+    (InputParameters(
+        rectal_temperature=37.4,
+        ambient_temperature=15,
+        body_mass=80
+    ), HenssgeRectalResults(
+        error_message="Any Error"
+    )),
     # --------------------- Error Test
     (InputParameters(
         rectal_temperature=300,
@@ -88,11 +107,25 @@ class Test(unittest.TestCase):
             if expected_result.error_message:
                 self.assertTrue(results.error_message, "Error expected\n" + str(input_parameters))
             else:
-                self.assertEqual(expected_result.post_mortem_interval, results.post_mortem_interval,
-                                 "Bad PostMortemInterval with following inputs:\n" + str(input_parameters))
+                self.assertAlmostEqual(expected_result.post_mortem_interval, results.post_mortem_interval, delta=1e-9,
+                                       msg="Bad PostMortemInterval with following inputs:\n" + str(input_parameters))
                 self.assertEqual(expected_result.confidence_interval, results.confidence_interval,
                                  "Bad ConfidenceInterval with following inputs:\n" + str(input_parameters))
                 self.assertEqual(expected_result.thermal_quotient, results.thermal_quotient,
                                  "Bad ThermalQuotient with following inputs:\n" + str(input_parameters))
                 self.assertEqual(expected_result.corrective_factor, results.corrective_factor,
                                  "Bad CorrectiveFactor with following inputs:\n" + str(input_parameters))
+
+    def test_corrected_body_mass_not_positive(self):
+        # No solution, without warning, when the corrective factor makes the corrected body mass negative or NaN
+        # (a factor is not adjusted for a body mass of 70kg)
+        for body_mass, user_corrective_factor in ((70.0, -1.0), (80.0, float("nan"))):
+            input_parameters = InputParameters(rectal_temperature=30, ambient_temperature=15, body_mass=body_mass,
+                                               user_corrective_factor=user_corrective_factor)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                results = core.computations.henssge_rectal.compute(input_parameters)
+                batch = core.computations.henssge_rectal.compute_batch([30.0], [15.0], [body_mass], [user_corrective_factor])
+            self.assertEqual(ErrorCode.NO_SOLUTION, results.error_code, str(input_parameters))
+            self.assertEqual(ErrorCode.NO_SOLUTION, batch.error_code[0], str(input_parameters))
+            self.assertTrue(np.isnan(batch.post_mortem_interval[0]))
@@ -0,0 +1,53 @@
+# tests/computations/test_inverse_table.py
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import core.computations.henssge_brain
+import core.computations.henssge_rectal
+from core.computations.inverse_table import InverseTable, MAX_PMI_ERROR
+
+
+class Test(unittest.TestCase):
+    def test_henssge_rectal(self):
+        rng = np.random.default_rng(0)
+        rectal_temperature = rng.uniform(5.0, 37.5, 10000)
+        ambient_temperature = rng.uniform(-20.0, 37.0, 10000)
+        body_mass = rng.uniform(1.0, 200.0, 10000)
+        corrective_factor = rng.uniform(0.35, 2.5, 10000)
+
+        # Compare table lookups with the exact inversion
+        expected = core.computations.henssge_rectal.compute_batch(rectal_temperature, ambient_temperature, body_mass, corrective_factor)
+        results = core.computations.henssge_rectal.compute_batch(rectal_temperature, ambient_temperature, body_mass, corrective_factor,
+                                                                 use_inverse_table=True)
+
+        np.testing.assert_array_equal(expected.error_code, results.error_code)
+        np.testing.assert_allclose(expected.post_mortem_interval, results.post_mortem_interval, rtol=0.0, atol=MAX_PMI_ERROR)
+
+    def test_henssge_brain(self):
+        rng = np.random.default_rng(0)
+        tympanic_temperature = rng.uniform(5.0, 37.5, 10000)
+        ambient_temperature = rng.uniform(-20.0, 37.0, 10000)
+
+        # Compare table lookups with the exact inversion
+        expected = core.computations.henssge_brain.compute_batch(tympanic_temperature, ambient_temperature)
+        results = core.computations.henssge_brain.compute_batch(tympanic_temperature, ambient_temperature, use_inverse_table=True)
+
+        np.testing.assert_array_equal(expected.error_code, results.error_code)
+        np.testing.assert_allclose(expected.post_mortem_interval, results.post_mortem_interval, rtol=0.0, atol=MAX_PMI_ERROR)
+
+    def test_save_load(self):
+        table = InverseTable.build(lambda v: np.exp(-v), lambda v: -np.exp(-v), 0.0, 10.0, 64)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.npy")
+            table.save(path)
+            loaded = InverseTable.load(path)
+
+            value, error = loaded.lookup(np.array([0.5, 1e-6]))
+            self.assertAlmostEqual(np.log(2.0), value[0], delta=error[0])
+            self.assertTrue(np.isnan(value[1]))
+            del loaded
@@ -0,0 +1,110 @@
+# tests/test_batch.py
+
+import csv
+import io
+import json
+import math
+import unittest
+
+import core.batch
+import core.compute
+from core.constants import BodyCondition, EnvironmentType, SupportingBase
+from core.input_parameters import InputParameters
+
+data_test = [
+    # (CSV row, equivalent input parameters)
+    ('1,"30,5",30,15,80,NAKED,moving air,About 2cm wettish leaves,',
+     InputParameters(tympanic_temperature=30.5, rectal_temperature=30, ambient_temperature=15, body_mass=80, body_condition=BodyCondition.NAKED,
+                     environment=EnvironmentType.MOVING_AIR, supporting_base=SupportingBase.WET_LEAVES)),
+    ('2,33,30,25,80,,,,"0,2"',
+     InputParameters(tympanic_temperature=33, rectal_temperature=30, ambient_temperature=25, body_mass=80, user_corrective_factor=0.2)),
+    ('3,300,,15,500,,,,',
+     InputParameters(tympanic_temperature=300, ambient_temperature=15, body_mass=500)),
+]
+
+header = "id,tympanic_temperature,rectal_temperature,ambient_temperature,body_mass,body_condition,environment,supporting_base,user_corrective_factor"
+
+
+class Test(unittest.TestCase):
+    def test_csv(self):
+        input_stream = io.StringIO("\n".join([header] + [row for row, _ in data_test]) + "\n")
+        output_stream = io.StringIO()
+
+        count = core.batch.run(input_stream, output_stream, "csv", "csv", chunk_size=2)
+        self.assertEqual(len(data_test), count)
+
+        rows = list(csv.DictReader(io.StringIO(output_stream.getvalue())))
+        for row, (_, input_parameters) in zip(rows, data_test):
+            expected = core.compute.run(input_parameters)
+            self.assertEqual("", row["input_error"])
+            if expected.henssge_rectal.error_message:
+                self.assertEqual("", row["henssge_rectal_pmi"])
+                self.assertNotEqual("", row["henssge_rectal_error"])
+            else:
+                self.assertAlmostEqual(expected.henssge_rectal.post_mortem_interval, float(row["henssge_rectal_pmi"]), delta=1e-9)
+                self.assertAlmostEqual(expected.henssge_rectal.corrective_factor, float(row["henssge_rectal_corrective_factor"]), delta=1e-9)
+            if expected.baccino.error_message:
+                self.assertEqual("", row["baccino_global_pmi"])
+            else:
+                self.assertAlmostEqual(expected.baccino.post_mortem_interval_global, float(row["baccino_global_pmi"]), delta=1e-9)
+
+        self.assertEqual("RECTAL_TEMPERATURE_MISSING|BODY_MASS_OUT_OF_RANGE", rows[2]["henssge_rectal_error"])
+
+    def test_jsonl(self):
+        input_stream = io.StringIO('{"id": 7, "tympanic_temperature": 30, "ambient_temperature": "15,0"}\n'
+                                   '{"id": 8, "tympanic_temperature": "warm", "environment": "indoors"}\n')
+        output_stream = io.StringIO()
+        core.batch.run(input_stream, output_stream, "jsonl", "jsonl")
+
+        first, second = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+        expected = core.compute.run(InputParameters(tympanic_temperature=30, ambient_temperature=15))
+        self.assertEqual(7, first["id"])
+        self.assertAlmostEqual(expected.henssge_brain.post_mortem_interval, first["henssge_brain_pmi"], delta=1e-9)
+        self.assertEqual("RECTAL_TEMPERATURE_MISSING|BODY_MASS_MISSING", first["henssge_rectal_error"])
+
+        # Unparsable cells are reported, without results
+        self.assertIn("tympanic_temperature", second["input_error"])
+        self.assertIn("environment", second["input_error"])
+        self.assertIsNone(second["henssge_brain_pmi"])
+        self.assertIsNone(second["henssge_brain_error"])
+
+    def test_jsonl_invalid_records(self):
+        # Invalid lines are reported on their own row without stopping the run
+        input_stream = io.StringIO('not json\n'
+                                   '[1, 2]\n'
+                                   '{"id": 9, "tympanic_temperature": 30, "ambient_temperature": 15}\n')
+        output_stream = io.StringIO()
+        count = core.batch.run(input_stream, output_stream, "jsonl", "jsonl")
+
+        self.assertEqual(3, count)
+        invalid_json, not_object, valid = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+        self.assertIn("Invalid JSON", invalid_json["input_error"])
+        self.assertIn("JSON object", not_object["input_error"])
+        self.assertIsNone(not_object["henssge_brain_pmi"])
+        self.assertIsNone(valid["input_error"])
+        self.assertEqual(9, valid["id"])
+
+    def test_non_numbers(self):
+        # Booleans and non-finite strings are input errors, whether their column takes the fast path
+        # (only plain numbers) or not (with an unparsable cell)
+        for cell in (True, False, "nan", "inf", "-Infinity"):
+            for records in ([{"body_mass": cell}, {"body_mass": 80}], [{"body_mass": cell}, {"body_mass": "heavy"}]):
+                chunk = core.batch.parse_records(records)
+                self.assertIn("body_mass", chunk.input_errors[0], f"{cell!r} in {records}")
+                self.assertTrue(math.isnan(chunk.columns["body_mass"][0]))
+                with self.assertRaises(ValueError):
+                    core.batch.parse_number(cell)
+        self.assertIsNone(core.batch.parse_records([{"body_mass": 80.0}, {"body_mass": None}]).input_errors[1])
+
+    def test_workers(self):
+        text = "\n".join([header] + [row for row, _ in data_test] * 5) + "\n"
+
+        expected = io.StringIO()
+        core.batch.run(io.StringIO(text), expected, "csv", "jsonl")
+
+        # Same output, in the same order, from a process pool
+        results = io.StringIO()
+        count = core.batch.run(io.StringIO(text), results, "csv", "jsonl", chunk_size=2, workers=2)
+
+        self.assertEqual(5 * len(data_test), count)
+        self.assertEqual(expected.getvalue(), results.getvalue())
@@ -0,0 +1,116 @@
+# tests/test_cache.py
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from core import compute
+from core.cache import ResultCache
+from core.computations import henssge_rectal, rigor
+from core.constants import BodyCondition, EnvironmentType, SupportingBase, RigorType
+from core.input_parameters import InputParameters
+
+data_test = [
+    # parameters, equivalent parameters (same key)
+    (InputParameters(rectal_temperature=30.0, ambient_temperature=15.0, body_mass=80.0, body_condition=BodyCondition.NAKED),
+     InputParameters(rectal_temperature=30.0000000001, ambient_temperature=15.0, body_mass=80.0, body_condition=BodyCondition.NAKED,
+                     tympanic_temperature=31.0)),
+    (InputParameters(rectal_temperature=30.0, ambient_temperature=15.0, body_mass=80.0, user_corrective_factor=1.2,
+                     body_condition=BodyCondition.NAKED),
+     InputParameters(rectal_temperature=30.0, ambient_temperature=15.0, body_mass=80.0, user_corrective_factor=1.2,
+                     environment=EnvironmentType.MOVING_AIR, supporting_base=SupportingBase.WET_LEAVES)),
+    (InputParameters(rectal_temperature=30.0, body_mass=80.0),
+     InputParameters(rectal_temperature=30.0, ambient_temperature=0.0, body_mass=80.0)),
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+class Test(unittest.TestCase):
+    def test_normalized_keys(self):
+        cache = ResultCache()
+        for parameters, equivalent in data_test:
+            self.assertEqual(cache.key(henssge_rectal, parameters, False), cache.key(henssge_rectal, equivalent, False))
+            self.assertEqual(cache.compute(henssge_rectal, parameters, False), cache.compute(henssge_rectal, equivalent, False))
+
+        # NaN is out of range, not missing: the cache must not share their results
+        missing = InputParameters(rectal_temperature=30.0, body_mass=80.0)
+        nan = InputParameters(rectal_temperature=30.0, ambient_temperature=float("nan"), body_mass=80.0)
+        self.assertNotEqual(cache.key(henssge_rectal, missing, False), cache.key(henssge_rectal, nan, False))
+        self.assertEqual(henssge_rectal.compute(nan).error_code, cache.compute(henssge_rectal, nan, False).error_code)
+        self.assertEqual(henssge_rectal.compute(missing).error_code, cache.compute(henssge_rectal, missing, False).error_code)
+
+        parameters = data_test[0][0]
+        self.assertNotEqual(cache.key(henssge_rectal, parameters, False), cache.key(henssge_rectal, parameters, True))
+        self.assertNotEqual(cache.key(henssge_rectal, parameters), cache.key(rigor, parameters))
+
+    def test_rounded_inputs(self):
+        # Results are computed from the rounded inputs of their key: the values quoted by an error
+        # do not depend on which equivalent input was computed first
+        cache = ResultCache()
+        first = InputParameters(rectal_temperature=40.0000001, ambient_temperature=15.0, body_mass=80.0)
+        second = InputParameters(rectal_temperature=40.0000004, ambient_temperature=15.0, body_mass=80.0)
+        self.assertIs(cache.compute(henssge_rectal, first, False), cache.compute(henssge_rectal, second, False))
+        self.assertEqual((("rectal_temperature", 40.0),), cache.compute(henssge_rectal, second, False).error_values)
+        self.assertEqual(henssge_rectal.compute(cache.rounded(second)), cache.compute(henssge_rectal, second, False))
+
+    def test_run(self):
+        cache = ResultCache()
+        parameters = InputParameters(tympanic_temperature=30.0, rectal_temperature=30.0, ambient_temperature=15.0, body_mass=80.0,
+                                     rigor_type=RigorType.COMPLETE_RIGIDITY)
+        expected = compute.run(parameters)
+
+        self.assertEqual(expected, compute.run(parameters, cache=cache))
+        self.assertEqual(expected, compute.run(parameters, cache=cache))
+        statistics = cache.statistics()
+        # The signs not specified are returned without a lookup (see compute.compute_methods)
+        self.assertEqual((4, 4, 0, 4), (statistics.hits, statistics.misses, statistics.evictions, statistics.size))
+        self.assertEqual(0.5, statistics.hit_rate)
+
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.statistics().hits)
+
+    def test_eviction(self):
+        clock = FakeClock()
+        cache = ResultCache(max_size=2, ttl=10.0, clock=clock)
+        calls = []
+
+        def value_of(key):
+            return cache.get_or_compute(key, lambda: calls.append(key) or key)
+
+        value_of("a")
+        value_of("b")
+        value_of("a")
+        value_of("c")  # Evicts "b", the least recently used
+        self.assertEqual(["a", "b", "c"], calls)
+        value_of("a")
+        value_of("b")
+        self.assertEqual(["a", "b", "c", "b"], calls)
+
+        clock.time = 11.0  # All entries expired
+        value_of("b")
+        self.assertEqual(["a", "b", "c", "b", "b"], calls)
+        self.assertEqual(3, cache.statistics().evictions)
+
+        with self.assertRaises(ValueError):
+            ResultCache(max_size=0)
+
+    def test_concurrent_access(self):
+        cache = ResultCache(max_size=16)
+        cases = [InputParameters(rectal_temperature=20.0 + (i % 32) / 2, ambient_temperature=15.0, body_mass=80.0) for i in range(400)]
+        expected = [compute.run(parameters) for parameters in cases]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda parameters: compute.run(parameters, cache=cache), cases))
+
+        self.assertEqual(expected, results)
+        statistics = cache.statistics()
+        # Only Henssge rectal has its inputs, the other methods being returned without a lookup
+        self.assertEqual(len(cases), statistics.hits + statistics.misses)
+        self.assertLessEqual(statistics.size, 16)
@@ -0,0 +1,200 @@
+# tests/test_compute.py
+
+import unittest
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+
+import core.compute
+from core.computations import henssge_rectal, henssge_brain, baccino
+from core.constants import BodyCondition, EnvironmentType, SupportingBase, ErrorCode, RigorType
+from core.input_parameters import InputParameters
+
+data_test = [
+    # ---------------------
+    InputParameters(
+        tympanic_temperature=30,
+        rectal_temperature=30,
+        ambient_temperature=15,
+        body_mass=80,
+        body_condition=BodyCondition.NAKED,
+        environment=EnvironmentType.MOVING_AIR,
+        supporting_base=SupportingBase.WET_LEAVES
+    ),
+    # ---------------------
+    InputParameters(
+        tympanic_temperature=33,
+        rectal_temperature=30,
+        ambient_temperature=25,
+        body_mass=80,
+        user_corrective_factor=0.2
+    ),
+    # --------------------- Henssge brain beyond 13.5 hours
+    InputParameters(
+        tympanic_temperature=20,
+        rectal_temperature=20,
+        ambient_temperature=15,
+        body_mass=60,
+        body_condition=BodyCondition.WARMLY,
+        environment=EnvironmentType.STILL_WATER
+    ),
+    # --------------------- Temperatures below ambient (no solution)
+    InputParameters(
+        tympanic_temperature=10,
+        rectal_temperature=10,
+        ambient_temperature=15,
+        body_mass=80
+    ),
+    # --------------------- Missing and out of range values
+    InputParameters(
+        tympanic_temperature=300,
+        body_mass=500
+    ),
+]
+
+
+class Test(unittest.TestCase):
+    def test_compute_batch(self):
+        # Compute all cases at once
+        results = core.compute.compute_batch(
+            tympanic_temperature=[p.tympanic_temperature for p in data_test],
+            rectal_temperature=[p.rectal_temperature for p in data_test],
+            ambient_temperature=[p.ambient_temperature for p in data_test],
+            body_mass=[p.body_mass for p in data_test],
+            body_condition=[p.body_condition for p in data_test],
+            environment=[p.environment for p in data_test],
+            supporting_base=[p.supporting_base for p in data_test],
+            user_corrective_factor=[p.user_corrective_factor for p in data_test]
+        )
+        self.assertEqual(len(data_test), len(results))
+
+        # Compare each row with the scalar computations
+        for i, input_parameters in enumerate(data_test):
+            expected_rectal = henssge_rectal.compute(input_parameters)
+            expected_brain = henssge_brain.compute(input_parameters)
+            expected_baccino = baccino.compute(input_parameters)
+
+            for expected, batch, fields in [
+                (expected_rectal, results.henssge_rectal, ["post_mortem_interval", "confidence_interval", "thermal_quotient", "corrective_factor"]),
+                (expected_brain, results.henssge_brain, ["post_mortem_interval", "confidence_interval"]),
+                (expected_baccino, results.baccino, ["post_mortem_interval_interval", "post_mortem_interval_global",
+                                                     "confidence_interval_interval", "confidence_interval_global"]),
+            ]:
+                self.assertEqual(expected.error_code, batch.error_code[i], "Bad error code\n" + str(input_parameters))
+                if expected.error_message:
+                    for field in fields:
+                        self.assertTrue(np.isnan(getattr(batch, field)[i]), f"NaN {field} expected\n" + str(input_parameters))
+                else:
+                    self.assertEqual(ErrorCode.NONE, batch.error_code[i], "No error expected\n" + str(input_parameters))
+                    for field in fields:
+                        self.assertAlmostEqual(getattr(expected, field), getattr(batch, field)[i], delta=1e-9,
+                                               msg=f"Bad {field} with following inputs:\n" + str(input_parameters))
+
+    def test_compute_batch_error_codes(self):
+        results = core.compute.compute_batch(
+            tympanic_temperature=[300, 30],
+            rectal_temperature=[np.nan, 37.4],
+            ambient_temperature=15,
+            body_mass=[500, 80]
+        )
+
+        self.assertEqual(ErrorCode.RECTAL_TEMPERATURE_MISSING | ErrorCode.BODY_MASS_OUT_OF_RANGE, results.henssge_rectal.error_code[0])
+        self.assertEqual(ErrorCode.NO_SOLUTION, results.henssge_rectal.error_code[1])
+        self.assertEqual(ErrorCode.TYMPANIC_TEMPERATURE_OUT_OF_RANGE, results.henssge_brain.error_code[0])
+        self.assertEqual(ErrorCode.NONE, results.baccino.error_code[1])
+
+    def test_run_concurrently(self):
+        rng = np.random.default_rng(0)
+        cases = [
+            InputParameters(
+                tympanic_temperature=float(rng.uniform(20.0, 37.5)),
+                rectal_temperature=float(rng.uniform(20.0, 37.5)),
+                ambient_temperature=float(rng.uniform(-20.0, 37.0)),
+                body_mass=float(rng.uniform(1.0, 200.0)),
+                body_condition=rng.choice(list(BodyCondition)),
+                environment=rng.choice(list(EnvironmentType)),
+                supporting_base=rng.choice(list(SupportingBase))
+            )
+            for _ in range(500)
+        ]
+        warning_filters = list(warnings.filters)
+
+        # Same results from a thread pool as sequentially, without touching the warning filters
+        expected = [core.compute.run(input_parameters) for input_parameters in cases]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(core.compute.run, cases))
+
+        self.assertEqual(expected, results)
+        self.assertEqual(warning_filters, warnings.filters)
+
+    def test_value_objects(self):
+        # Inputs and results are immutable and compare and hash by value
+        input_parameters = data_test[0]
+        same_parameters = InputParameters(**{name: getattr(input_parameters, name) for name in InputParameters.__slots__})
+        self.assertEqual(input_parameters, same_parameters)
+        self.assertEqual(hash(input_parameters), hash(same_parameters))
+        self.assertNotEqual(input_parameters, data_test[1])
+
+        results = core.compute.run(input_parameters)
+        self.assertEqual(results, core.compute.run(same_parameters))
+        self.assertEqual({input_parameters: results}[same_parameters], results)
+
+        with self.assertRaises(AttributeError):
+            input_parameters.body_mass = 70.0
+        with self.assertRaises(AttributeError):
+            results.henssge_rectal = None
+        self.assertFalse(hasattr(results, "__dict__"))
+
+    def test_error_messages(self):
+        # Errors are carried as codes (and quoted values), messages being rendered on display
+        results = core.compute.run(InputParameters(tympanic_temperature=10.0, rectal_temperature=40.0, ambient_temperature=20.0))
+
+        self.assertEqual(ErrorCode.RECTAL_TEMPERATURE_OUT_OF_RANGE | ErrorCode.BODY_MASS_MISSING, results.henssge_rectal.error_code)
+        self.assertEqual((("rectal_temperature", 40.0),), results.henssge_rectal.error_values)
+        self.assertIn("The rectal temperature (40.0°C) is not valid", results.henssge_rectal.error_message)
+        self.assertIn("The body mass is absent", results.henssge_rectal.error_message)
+
+        self.assertEqual(ErrorCode.NO_SOLUTION, results.henssge_brain.error_code)
+        self.assertEqual("No solution: the thermal quotient (Q = -0.58) must be between 0 and 1.", results.henssge_brain.error_message)
+        self.assertEqual(ErrorCode.TYMPANIC_BELOW_AMBIENT, results.baccino.error_code)
+
+        # Messages in the order of the checks (ambient before rectal), and a thermal quotient outside ]0, 1]
+        # reported as no solution (it used to be a convergence error)
+        results = core.compute.run(InputParameters(rectal_temperature=40.0, body_mass=500.0))
+        self.assertEqual(["The ambient temperature is absent and must be between -20.0°C and 37.0°C.",
+                          "The rectal temperature (40.0°C) is not valid and must be between 0.0°C and 37.5°C.",
+                          "The body mass (500.0kg) is not valid and must be between 1.0kg and 200.0kg."],
+                         results.henssge_rectal.error_message.splitlines())
+        results = core.compute.run(InputParameters(rectal_temperature=10.0, ambient_temperature=20.0, body_mass=80.0))
+        self.assertEqual("No solution: the thermal quotient (Q = -0.58) must be between 0 and 1.", results.henssge_rectal.error_message)
+
+    def test_filter_batch_errors(self):
+        results = core.compute.compute_batch(
+            tympanic_temperature=[30.0, 10.0, 300.0],
+            ambient_temperature=20.0
+        )
+
+        np.testing.assert_array_equal([False, True, True], results.henssge_brain.has_error())
+        np.testing.assert_array_equal([False, True, False], results.henssge_brain.has_error(ErrorCode.NO_SOLUTION))
+        selected = results.henssge_brain[results.henssge_brain.has_error(ErrorCode.TYMPANIC_TEMPERATURE_OUT_OF_RANGE)]
+        self.assertEqual(1, len(selected))
+        self.assertEqual(ErrorCode.TYMPANIC_TEMPERATURE_OUT_OF_RANGE.describe(), selected[0].error_message)
+
+    def test_incremental_run(self):
+        # Only the methods reading a changed input are computed again
+        previous_input_parameters = data_test[0]
+        previous = core.compute.run(previous_input_parameters)
+        input_parameters = InputParameters(**{name: getattr(previous_input_parameters, name) for name in InputParameters.__slots__
+                                              if name != "rigor_type"}, rigor_type=RigorType.COMPLETE_RIGIDITY)
+        self.assertEqual(("rigor",), core.compute.changed_methods(input_parameters, previous_input_parameters))
+
+        with mock.patch.object(henssge_rectal, "compute", wraps=henssge_rectal.compute) as compute_rectal:
+            results = core.compute.run(input_parameters, previous=previous, previous_input_parameters=previous_input_parameters)
+        compute_rectal.assert_not_called()
+        self.assertEqual(core.compute.run(input_parameters), results)
+        self.assertIs(previous.henssge_rectal, results.henssge_rectal)
+
+        with self.assertRaises(ValueError):
+            core.compute.run(input_parameters, previous=previous)
@@ -0,0 +1,70 @@
+# tests/test_import_time.py
+
+import os
+import subprocess
+import sys
+import unittest
+
+# Constants
+IMPORT_BUDGET_VARIABLE = "EASYPMI_IMPORT_BUDGET"
+"""Environment variable enabling test_core_budget: time budget (in seconds) of the core modules imported by core.compute"""
+
+data_test = [
+    # imported module, modules it must not import
+    ("core.compute", ("scipy", "matplotlib", "reportlab", "streamlit", "core.computations.henssge_rectal",
+                      "core.computations.henssge_brain", "core.computations.baccino")),
+    ("core.batch", ("scipy", "matplotlib", "reportlab", "streamlit")),
+    ("streamlitGUI.run", ("scipy", "matplotlib", "reportlab", "streamlitGUI.plot", "streamlitGUI.pdf_generation")),
+]
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_modules(module: str) -> set:
+    """
+    Imports a module in a new interpreter
+
+    Returns
+    -------
+    set
+        Names of the modules in sys.modules afterwards
+    """
+    script = f"import sys\nimport {module}\nprint('\\n'.join(sys.modules))"
+    return set(subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True, cwd=_ROOT).stdout.split())
+
+
+def import_times(module: str) -> dict:
+    """
+    Imports a module in a new interpreter with -X importtime
+
+    Returns
+    -------
+    dict
+        Self import time (in seconds) of each module imported
+    """
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True,
+                            check=True, cwd=_ROOT).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and not line.endswith("imported package"):
+            self_time, _, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(self_time) / 1e6
+    return times
+
+
+class Test(unittest.TestCase):
+    def test_heavy_dependencies(self):
+        # Heavy dependencies are only imported on first use
+        for module, excluded in data_test:
+            imported = imported_modules(module)
+            self.assertIn(module, imported)
+            for name in excluded:
+                self.assertNotIn(name, imported, f"{module} imports {name}")
+
+    @unittest.skipUnless(os.environ.get(IMPORT_BUDGET_VARIABLE), f"timing check enabled by {IMPORT_BUDGET_VARIABLE}")
+    def test_core_budget(self):
+        # Opt-in, wall-clock times depending on the machine and its load
+        budget = float(os.environ[IMPORT_BUDGET_VARIABLE])
+        imported = import_times("core.compute")
+        core_time = sum(time for name, time in imported.items() if name == "core" or name.startswith("core."))
+        self.assertLess(core_time, budget, f"core modules imported in {core_time:.3f} s")
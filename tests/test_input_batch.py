@@ -0,0 +1,73 @@
+# tests/test_input_batch.py
+
+import unittest
+
+import numpy as np
+
+from core import compute
+from core.constants import BodyCondition, EnvironmentType, SupportingBase, RigorType, ErrorCode
+from core.input_batch import InputBatch
+from core.input_parameters import InputParameters
+from core.output_batch import ResultBatch, SIGNS
+
+data_test = [
+    InputParameters(tympanic_temperature=30.0, rectal_temperature=30.0, ambient_temperature=15.0, body_mass=80.0,
+                    body_condition=BodyCondition.NAKED, environment=EnvironmentType.MOVING_AIR,
+                    supporting_base=SupportingBase.WET_LEAVES, rigor_type=list(RigorType)[1]),
+    InputParameters(tympanic_temperature=20.0, rectal_temperature=25.0, ambient_temperature=18.0, body_mass=60.0,
+                    user_corrective_factor=1.2),
+    InputParameters(tympanic_temperature=300.0, body_mass=500.0),
+    InputParameters(tympanic_temperature=40.0, ambient_temperature=20.0),
+]
+
+
+class Test(unittest.TestCase):
+    def test_round_trip(self):
+        batch = InputBatch.from_input_parameters(data_test)
+        self.assertEqual(len(data_test), len(batch))
+        for expected, parameters in zip(data_test, batch.to_input_parameters()):
+            self.assertEqual(str(expected), str(parameters))
+            self.assertEqual(expected.rigor_type, parameters.rigor_type)
+
+    def test_slicing_and_concatenation(self):
+        batch = InputBatch.from_input_parameters(data_test)
+        concatenated = InputBatch.concatenate([batch[:2], batch[2:]])
+        for name in InputBatch.columns():
+            np.testing.assert_array_equal(getattr(batch, name), getattr(concatenated, name), err_msg=name)
+        self.assertEqual(str(data_test[1]), str(batch[1]))
+        self.assertEqual(2, len(batch[np.array([True, False, True, False])]))
+
+    def test_broadcasting(self):
+        batch = InputBatch(tympanic_temperature=[30.0, 31.0, 32.0], body_condition=BodyCondition.NAKED, ambient_temperature=15.0)
+        self.assertEqual(3, len(batch))
+        np.testing.assert_array_equal([BodyCondition.NAKED.value] * 3, batch.body_condition)
+        self.assertTrue(np.isnan(batch.body_mass).all())
+        self.assertEqual(5, len(InputBatch(5)))
+        with self.assertRaises(ValueError):
+            InputBatch(temperature=[30.0])
+
+    def test_results_conversion(self):
+        # Batch results are interchangeable with the scalar results of compute.run
+        results = compute.run_batch(InputBatch.from_input_parameters(data_test))
+        for i, parameters in enumerate(data_test):
+            expected = compute.run(parameters)
+            for name in ("henssge_rectal", "henssge_brain", "baccino"):
+                self.assertEqual(getattr(expected, name).error_code, getattr(results, name).error_code[i], f"{name} case {i}")
+                if not getattr(expected, name).error_code:
+                    self.assertEqual(str(getattr(expected, name)), str(getattr(results[i], name)), f"{name} case {i}")
+            for name in SIGNS:
+                self.assertEqual(getattr(expected, name), getattr(results[i], name), f"{name} case {i}")
+
+        converted = ResultBatch.from_results(results.to_results())
+        for name in ("henssge_rectal", "henssge_brain", "baccino"):
+            np.testing.assert_array_equal(getattr(results, name).error_code, getattr(converted, name).error_code)
+        np.testing.assert_allclose(results.baccino.post_mortem_interval_global, converted.baccino.post_mortem_interval_global)
+        self.assertEqual([result.rigor for result in results.to_results()], [result.rigor for result in converted.to_results()])
+
+        concatenated = ResultBatch.concatenate([results[:1], results[1:]])
+        np.testing.assert_array_equal(results.henssge_rectal.post_mortem_interval, concatenated.henssge_rectal.post_mortem_interval)
+
+    def test_error_code_describe(self):
+        self.assertIsNone(ErrorCode.NONE.describe())
+        message = (ErrorCode.AMBIENT_TEMPERATURE_MISSING | ErrorCode.BODY_MASS_OUT_OF_RANGE).describe()
+        self.assertEqual(2, len(message.splitlines()))
@@ -0,0 +1,69 @@
+# tests/test_monte_carlo.py
+
+import unittest
+
+import numpy as np
+
+import core.compute
+import core.monte_carlo
+from core.constants import BodyCondition, EnvironmentType
+from core.input_parameters import InputParameters
+from core.monte_carlo import Normal, Uniform
+
+input_parameters = InputParameters(
+    tympanic_temperature=30,
+    rectal_temperature=30,
+    ambient_temperature=15,
+    body_mass=80,
+    body_condition=BodyCondition.LIGHTLY,
+    environment=EnvironmentType.STILL_AIR
+)
+
+uncertainties = {
+    "tympanic_temperature": Normal(30, 0.3),
+    "rectal_temperature": Normal(30, 0.3),
+    "ambient_temperature": Uniform(13, 17),
+    "body_mass": Normal(80, 5),
+}
+
+
+class Test(unittest.TestCase):
+    def test_without_uncertainty(self):
+        # All samples give the deterministic PMI
+        expected = core.compute.run(input_parameters)
+        results = core.monte_carlo.run(input_parameters, samples=100, use_inverse_table=False)
+
+        self.assertEqual(1.0, results.henssge_rectal.valid_fraction)
+        for percentile in results.henssge_rectal.percentiles.values():
+            self.assertAlmostEqual(expected.henssge_rectal.post_mortem_interval, percentile, delta=1e-9)
+        for percentile in results.baccino_global.percentiles.values():
+            self.assertAlmostEqual(expected.baccino.post_mortem_interval_global, percentile, delta=1e-9)
+
+    def test_uncertainties(self):
+        results = core.monte_carlo.run(input_parameters, uncertainties, samples=20000, seed=0)
+        expected = core.compute.run(input_parameters)
+
+        for distribution, post_mortem_interval in [
+            (results.henssge_rectal, expected.henssge_rectal.post_mortem_interval),
+            (results.henssge_brain, expected.henssge_brain.post_mortem_interval),
+            (results.baccino_interval, expected.baccino.post_mortem_interval_interval),
+        ]:
+            lower, median, upper = distribution.percentiles.values()
+            self.assertLess(lower, post_mortem_interval)
+            self.assertGreater(upper, post_mortem_interval)
+            self.assertAlmostEqual(post_mortem_interval, median, delta=0.1 * post_mortem_interval)
+
+            counts, edges = distribution.histogram
+            self.assertEqual(20000, counts.sum())
+            self.assertEqual(len(counts) + 1, len(edges))
+
+    def test_seed(self):
+        first = core.monte_carlo.run(input_parameters, uncertainties, samples=1000, seed=42)
+        second = core.monte_carlo.run(input_parameters, uncertainties, samples=1000, seed=42)
+
+        self.assertEqual(first.henssge_rectal.percentiles, second.henssge_rectal.percentiles)
+        np.testing.assert_array_equal(first.henssge_brain.histogram[0], second.henssge_brain.histogram[0])
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            core.monte_carlo.run(input_parameters, {"rigor_type": Normal(0, 1)})
@@ -0,0 +1,65 @@
+# tests/test_plot.py
+
+import unittest
+
+import numpy as np
+
+from core import compute
+from core.computations import henssge_rectal, henssge_brain
+from core.constants import STANDARD_BODY_TEMPERATURE
+from core.input_parameters import InputParameters
+from core.time_converter import TimeContext
+from streamlitGUI import figure_cache, plot
+
+data_test = [
+    # ambient temperature, body mass times corrective factor
+    (15.0, 80.0),
+    (25.0, 55.5),
+    (-5.0, 120.0),
+]
+
+
+class Test(unittest.TestCase):
+    def test_thermal_curves(self):
+        for ambient_temperature, corrected_body_mass in data_test:
+            time, temperatures = plot.henssge_rectal_temperatures(ambient_temperature, corrected_body_mass)
+            expected = ambient_temperature + (STANDARD_BODY_TEMPERATURE - ambient_temperature) \
+                * henssge_rectal.temperature_decrease(time, ambient_temperature, corrected_body_mass)
+            np.testing.assert_allclose(expected, temperatures)
+            self.assertEqual((0, plot.CURVE_MAX_TIME), (time[0], time[-1]))
+            self.assertLessEqual(len(time), plot.CURVE_SAMPLES + 2)
+
+            time, temperatures = plot.henssge_brain_temperatures(ambient_temperature)
+            expected = ambient_temperature + (STANDARD_BODY_TEMPERATURE - ambient_temperature) * henssge_brain.temperature_decrease(time)
+            np.testing.assert_allclose(expected, temperatures)
+
+    def test_curve_cache(self):
+        # Curves are shared by the ambient temperatures of a regime
+        plot._henssge_rectal_curve.cache_clear()
+        plot.henssge_rectal_temperatures(15.0, 80.0)
+        plot.henssge_rectal_temperatures(18.0, 80.0)
+        plot.henssge_rectal_temperatures(18.0, 80.0000001)
+        plot.henssge_rectal_temperatures(25.0, 80.0)
+        info = plot._henssge_rectal_curve.cache_info()
+        self.assertEqual((2, 2), (info.hits, info.misses))
+
+        # The adaptive sampling is denser where the curve bends than on its tail
+        time, _ = plot.henssge_rectal_temperatures(15.0, 80.0)
+        self.assertLess(np.diff(time)[:10].mean(), np.diff(time)[-10:].mean())
+
+    def test_figure_cache(self):
+        input_parameters = InputParameters(tympanic_temperature=30.0, rectal_temperature=30.0, ambient_temperature=15.0, body_mass=80.0)
+        results = compute.run(input_parameters)
+        sources = figure_cache.figure_sources(input_parameters, results, TimeContext())
+        self.assertEqual(["comparison", "henssge_rectal", "henssge_brain"], list(sources))
+
+        # Rendered once, then shared; the session keeps the images within its budget, in display order
+        figure_cache.FIGURE_CACHE.clear()
+        images = figure_cache.render_session_images(sources)
+        self.assertEqual(list(sources), list(images))
+        self.assertTrue(all(image.startswith(b"\x89PNG") for image in images.values()))
+        self.assertIs(images["henssge_brain"], figure_cache.render(*sources["henssge_brain"]))
+        self.assertEqual(1, figure_cache.FIGURE_CACHE.statistics().hits)
+
+        budget = len(images["comparison"]) + len(images["henssge_brain"])
+        self.assertEqual(["comparison", "henssge_brain"], list(figure_cache.render_session_images(sources, budget)))
@@ -0,0 +1,106 @@
+# tests/test_registry.py
+
+import importlib
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+import core.compute
+from core import registry
+from core.constants import RigorType
+from core.input_parameters import InputParameters
+from core.output_results import PostMortemIntervalResults
+
+data_test = [
+    # input parameters, methods computed from their module
+    (InputParameters(tympanic_temperature=30.0, rectal_temperature=30.0, ambient_temperature=15.0, body_mass=80.0,
+                     rigor_type=RigorType.COMPLETE_RIGIDITY),
+     ("henssge_rectal", "henssge_brain", "baccino", "rigor")),
+    (InputParameters(tympanic_temperature=30.0, ambient_temperature=15.0),
+     ("henssge_brain", "baccino")),
+    (InputParameters(tympanic_temperature=300.0, body_mass=500.0),
+     ()),
+]
+
+
+class Test(unittest.TestCase):
+    def test_built_in_methods(self):
+        # The registry describes its modules without importing them, from the same spec
+        for name in registry.METHODS:
+            method = registry.get(name)
+            module = importlib.import_module(method.module_name)
+            self.assertEqual(module.INPUTS, method.inputs, name)
+            self.assertIn(name, registry.select(method.groups))
+        with self.assertRaises(ValueError):
+            registry.get("thermal")
+
+    def test_select(self):
+        self.assertEqual(("henssge_rectal", "henssge_brain", "baccino"), registry.select(registry.THERMAL))
+        self.assertEqual(("baccino", "rigor"), registry.select(["rigor", "baccino"]))
+        with self.assertRaises(ValueError):
+            registry.select("thermal_only")
+
+        input_parameters = data_test[0][0]
+        results = core.compute.run(input_parameters, methods=registry.THERMAL)
+        expected = core.compute.run(input_parameters)
+        self.assertEqual(expected.henssge_rectal, results.henssge_rectal)
+        self.assertEqual(expected.baccino, results.baccino)
+        self.assertIsNone(results.rigor)
+
+    def test_absent_inputs(self):
+        # Methods are only computed by their module when their inputs are present and valid,
+        # with the same results as the modules
+        for input_parameters, computed in data_test:
+            patches = [mock.patch.object(method.module, "compute", wraps=method.module.compute)
+                       for method in registry.METHODS.values()]
+            computes = {name: patch.start() for name, patch in zip(registry.METHODS, patches)}
+            try:
+                results = core.compute.compute_methods(input_parameters)
+            finally:
+                for patch in patches:
+                    patch.stop()
+            self.assertEqual(computed, tuple(name for name, compute in computes.items() if compute.called))
+            for name, method in registry.METHODS.items():
+                self.assertEqual(method.module.compute(input_parameters, *(False for _ in method.options)), results[name], name)
+
+    def test_register_method(self):
+        @registry.register_method("test_sign", ("rigor_type",), ("tests",),
+                                  absent_result=lambda input_parameters: PostMortemIntervalResults("Test", error_message="Not Specified"))
+        def _test_sign():
+            return "tests.computations.missing_module"
+
+        @registry.register_method("test_rigor", ("rigor_type",), ("tests",))
+        def _test_rigor():
+            return "core.computations.rigor"
+
+        try:
+            results = core.compute.compute_methods(InputParameters(), "tests")
+            self.assertEqual(PostMortemIntervalResults("Test", error_message="Not Specified"), results["test_sign"])
+            self.assertFalse(registry.METHODS["test_sign"].loaded)
+
+            # Registered methods reach the results of run, besides the built-in ones
+            input_parameters = data_test[0][0]
+            results = core.compute.run(input_parameters)
+            self.assertEqual(results.rigor, results.get("test_rigor"))
+            self.assertEqual(("test_sign", "test_rigor"), tuple(name for name, _ in results.other_results))
+            self.assertIn("Test", results.to_string())
+            self.assertIsNone(core.compute.run(input_parameters, methods="thermal").get("test_rigor"))
+            incremental = core.compute.run(input_parameters, previous=results, previous_input_parameters=input_parameters)
+            self.assertIs(results.get("test_rigor"), incremental.get("test_rigor"))
+        finally:
+            del registry.METHODS["test_sign"]
+            del registry.METHODS["test_rigor"]
+
+    def test_lazy_import(self):
+        # Importing compute imports no method, a thermal run only the cooling ones
+        script = ("import sys\n"
+                  "from core import compute, registry\n"
+                  "from core.input_parameters import InputParameters\n"
+                  "print(sorted(name for name, method in registry.METHODS.items() if method.loaded))\n"
+                  "compute.run(InputParameters(tympanic_temperature=30.0, ambient_temperature=15.0), methods='thermal')\n"
+                  "print(sorted(name for name, method in registry.METHODS.items() if method.loaded))\n")
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        self.assertEqual("[]\n['baccino', 'henssge_brain']\n", output)
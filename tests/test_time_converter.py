@@ -0,0 +1,79 @@
+# tests/test_time_converter.py
+
+import itertools
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from core import time_converter
+from core.tools import format_time, format_time_batch
+from core.time_converter import TimeContext
+from core.output_results import HenssgeRectalResults
+
+data_test = [
+    # reference, pmi_min, pmi_max, pmi_center, expected
+    (None, 4.0, 8.0, 6.0, "Estimated PMI 6h00 [4h00 - 8h00]"),
+    (datetime(2025, 1, 2, 12, 0), 4.0, 8.0, 6.0, "Estimated PMI 02/01/2025 - 06h00 [02/01/2025 - 04h00 | 02/01/2025 - 08h00]"),
+    (datetime(2025, 1, 2, 3, 0), 4.0, 8.0, 6.0, "Estimated PMI 01/01/2025 - 21h00 [01/01/2025 - 19h00 | 01/01/2025 - 23h00]"),
+]
+
+
+class Test(unittest.TestCase):
+    def test_format_pmi_range_string(self):
+        for reference, pmi_min, pmi_max, pmi_center, expected in data_test:
+            result = time_converter.format_pmi_range_string(pmi_min, pmi_max, pmi_center, context=TimeContext(reference))
+            self.assertEqual(expected, result, f"Bad string with reference {reference}")
+
+    def test_concurrent_contexts(self):
+        # Each caller formats with its own reference, whatever the other threads use
+        result = HenssgeRectalResults(post_mortem_interval=6.0, confidence_interval=2.0, thermal_quotient=0.5, corrective_factor=1.0)
+        cases = [data_test[i % len(data_test)] for i in range(300)]
+
+        def format_result(case):
+            return result.to_string(TimeContext(case[0]))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(format_result, cases))
+
+        for case, string in zip(cases, results):
+            self.assertEqual(format_result(case), string)
+            self.assertEqual(case[0] is not None, "Estimated ToD" in string)
+
+        self.assertEqual(str(result), result.to_string(TimeContext()))
+
+    def test_absolute_dt_batch(self):
+        # The batch conversion and formatting give the strings of the scalar functions
+        pmi_hours = np.array([4.0, 6.25, float("nan"), float("inf"), -float("inf"), 0.0, -3.5, 1.0000001, 1e12, 17e6, -6e7])
+        references = np.array([datetime(2025, 1, 2, 12, 0), datetime(2024, 2, 29, 0, 30)] * 5 + [datetime(2025, 1, 2, 3, 0)],
+                              dtype="datetime64[s]")
+        dts = time_converter.calculate_absolute_dt_batch(pmi_hours, references)
+        self.assertEqual(np.dtype("datetime64[s]"), dts.dtype)
+        for pmi, reference, formatted in zip(pmi_hours, references, time_converter.format_absolute_datetime_batch(dts)):
+            expected = time_converter.calculate_absolute_dt(pmi, TimeContext(reference.item()))
+            self.assertEqual(time_converter.format_absolute_datetime(expected), formatted, f"PMI {pmi} from {reference}")
+
+        self.assertTrue(np.isnat(time_converter.calculate_absolute_dt_batch(pmi_hours)).all())
+
+    def test_plot_x_tick_labels(self):
+        context = TimeContext(datetime(2025, 1, 2, 3, 0))
+        labels = time_converter.generate_plot_x_tick_labels([-1.0, 0.0, 2.0, 4.0, float("nan"), 6.0], context)
+        self.assertEqual(["", "03h00\n02/01/2025", "01h00", "23h00\n01/01/2025", "", "21h00"], labels)
+        self.assertEqual(["0h00", "2h30"], time_converter.generate_plot_x_tick_labels(np.array([0.0, 2.5])))
+        self.assertEqual([], time_converter.generate_plot_x_tick_labels([], context))
+
+    def test_format_batch(self):
+        # The vectorized formatters give the strings of the scalar ones, NaN and infinite values included
+        values = [0.0, 0.016666666666666666, 2.5, 4.0, 1234.99, float("nan"), float("inf"), -float("inf"), -1.5, 1e30]
+        self.assertEqual([format_time(value) for value in values], list(format_time_batch(values)))
+
+        pmi_min, pmi_max, pmi_center = map(np.array, zip(*itertools.product(values, repeat=3)))
+        for reference, prefix in itertools.product((None, datetime(2025, 1, 2, 3, 0)), ("Estimated PMI", "")):
+            context = TimeContext(reference)
+            for center in (pmi_center, None):
+                results = time_converter.format_pmi_range_string_batch(pmi_min, pmi_max, center, prefix, context)
+                for i, result in enumerate(results):
+                    expected = time_converter.format_pmi_range_string(pmi_min[i], pmi_max[i], None if center is None else center[i],
+                                                                      prefix, context)
+                    self.assertEqual(expected, result, f"Case {i} with reference {reference}")
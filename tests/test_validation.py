@@ -0,0 +1,59 @@
+# tests/test_validation.py
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core import compute, validation
+from core.computations import henssge_rectal, henssge_brain, baccino
+from core.constants import ErrorCode
+from core.input_parameters import InputParameters
+
+data_test = [
+    # input parameters, expected error code of (henssge_rectal, henssge_brain, baccino)
+    (InputParameters(tympanic_temperature=30.0, rectal_temperature=30.0, ambient_temperature=15.0, body_mass=80.0),
+     (ErrorCode.NONE, ErrorCode.NONE, ErrorCode.NONE)),
+    (InputParameters(tympanic_temperature=300.0, rectal_temperature=30, body_mass=500.0),
+     (ErrorCode.AMBIENT_TEMPERATURE_MISSING | ErrorCode.BODY_MASS_OUT_OF_RANGE,
+      ErrorCode.TYMPANIC_TEMPERATURE_OUT_OF_RANGE | ErrorCode.AMBIENT_TEMPERATURE_MISSING,
+      ErrorCode.TYMPANIC_TEMPERATURE_OUT_OF_RANGE | ErrorCode.AMBIENT_TEMPERATURE_MISSING)),
+    (InputParameters(rectal_temperature=float("nan"), ambient_temperature=0.0, body_mass=80.0),
+     (ErrorCode.RECTAL_TEMPERATURE_OUT_OF_RANGE | ErrorCode.AMBIENT_TEMPERATURE_MISSING,
+      ErrorCode.TYMPANIC_TEMPERATURE_MISSING | ErrorCode.AMBIENT_TEMPERATURE_MISSING,
+      ErrorCode.TYMPANIC_TEMPERATURE_MISSING | ErrorCode.AMBIENT_TEMPERATURE_MISSING)),
+]
+
+
+class Test(unittest.TestCase):
+    def test_error_codes(self):
+        for input_parameters, expected in data_test:
+            validated = validation.validate(input_parameters)
+            self.assertIs(validated, validation.validate(validated))
+            for method, error_code in zip((henssge_rectal, henssge_brain, baccino), expected):
+                self.assertEqual(error_code, validated.error_code(method.INPUTS), f"{method.__name__} {input_parameters}")
+                self.assertEqual(error_code, method.compute(input_parameters).error_code)
+
+    def test_validated_once(self):
+        input_parameters = data_test[0][0]
+        with mock.patch.object(validation, "validate_field", wraps=validation.validate_field) as validate_field:
+            compute.run(input_parameters)
+        self.assertEqual(len(validation.VALIDATED_FIELDS), validate_field.call_count)
+
+    def test_batch_parity(self):
+        # The scalar and vectorized validations agree on the limits (NaN being absent in batches)
+        for name, (limits, _, _) in validation.VALIDATED_FIELDS.items():
+            values = np.array([limits[0] - 1, limits[0], (limits[0] + limits[1]) / 2, limits[1], limits[1] + 1, 0.0])
+            expected = [validation.validate_field(name, value) for value in values]
+            np.testing.assert_array_equal(expected, validation.validate_field_batch(name, values), err_msg=name)
+
+    def test_value_object(self):
+        # Validated parameters hash and compare by value, field errors included
+        for input_parameters, _ in data_test:
+            validated = validation.validate(input_parameters)
+            same = validation.validate(InputParameters(**{name: getattr(input_parameters, name) for name in InputParameters.__slots__}))
+            self.assertEqual(validated, same)
+            self.assertEqual(hash(validated), hash(same))
+            self.assertEqual(validated, validation.ValidatedParameters(
+                dict(validated.field_errors), **{name: getattr(validated, name) for name in InputParameters.__slots__}))
+        self.assertNotEqual(validation.validate(data_test[0][0]), validation.validate(data_test[1][0]))